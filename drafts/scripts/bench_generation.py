@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""Benchmark the generation engine against the local fake Gemini server.
+
+Starts fake_gemini_server in this process, then runs each scenario in a
+fresh spawned process through the real run_jobs() path: rate limiter,
+response cache, job manifest and image save. Each scenario reports
+images/minute, p50/p95/p99 end-to-end latency per job, peak RSS of the
+scenario process and, with --workers, of its queue workers, and bytes
+written, so concurrency, caching and save-path changes compare by number.
+
+    python bench_generation.py --jobs 40 --concurrency 1 4 8
+    python bench_generation.py --cache warm --latency-median 0.5 --payload-kb 3000
+    python bench_generation.py --hedge off on --latency-sigma 0.8 --error-429 0.05
+    python bench_generation.py --workers 1 2 --keys 1 2 4 --rpm 60 --key-rpm 60
+
+--startup instead times cold starts of talk.py: every command's --help,
+then real runs that need no API (STARTUP_RUNS). Each is measured against
+a bare interpreter started just before it, and the run exits non-zero
+when a local command adds more than STARTUP_BUDGET_MS. Dry runs of the
+API commands are shown but not budgeted.
+
+    python bench_generation.py --startup --runs 9
+"""
+
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fake_gemini_server import add_fake_arguments, fake_from_args, start_server
+from paths import SCRIPTS_DIR
+from talk import API_COMMANDS, COMMANDS, STARTUP_BUDGET_MS
+
+DEFAULT_JOBS = 40
+DEFAULT_STARTUP_RUNS = 7
+
+# Real runs timed by --startup besides each command's --help; none calls the API
+STARTUP_RUNS = (
+    ("derive", "preload"),
+    ("report",),
+    ("generate", "technical", "--dry-run"),
+    ("generate", "mockups", "--dry-run"),
+)
+CACHE_MODES = ("off", "cold", "warm")
+HEDGE_MODES = ("off", "on")
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def bench_jobs(count: int, output_dir: str, model: str) -> list:
+    """Distinct jobs shaped like the generators' slide jobs."""
+    return [
+        {
+            "name": f"bench-{i:03d}",
+            "prompt": f"Benchmark slide {i}: a bold comic-book illustration of an AI assistant, variant {i}.",
+            "output_path": os.path.join(output_dir, f"bench-{i:03d}.jpg"),
+            "model": model,
+            "aspect_ratio": "16:9",
+            "image_size": "2K",
+        }
+        for i in range(count)
+    ]
+
+
+def run_scenario(scenario: dict) -> dict:
+    """Run one scenario through run_jobs() and measure it. Runs in a spawned process."""
+    # Imported here so the spawned process's RSS is all engine, not server
+    from gemini_engine import make_client, run_jobs
+    from job_manifest import JobManifest
+    from resilience import DEFAULT_BREAKER_COOLDOWN, DEFAULT_BREAKER_THRESHOLD, DEFAULT_MAX_ATTEMPTS, Resilience
+    from response_cache import DEFAULT_MAX_BYTES, ResponseCache
+
+    work_dir = scenario["work_dir"]
+    os.environ.setdefault("GEMINI_API_KEY", "fake")
+    os.environ["GEMINI_BASE_URL"] = scenario["base_url"]
+    os.environ["GEMINI_API_KEYS"] = ",".join(f"fake-key-{i}" for i in range(scenario["keys"]))
+    client = make_client(scenario["base_url"])
+    cache_dir = None if scenario["cache"] == "off" else os.path.join(work_dir, "cache")
+    cache = ResponseCache(cache_dir) if cache_dir else None
+
+    def run(output_dir):
+        jobs = bench_jobs(scenario["jobs"], output_dir, scenario["model"])
+        started = time.monotonic()
+        if scenario["workers"]:
+            results = run_jobs(jobs, queue={
+                "path": os.path.join(work_dir, "queue.db"),
+                "workers": scenario["workers"],
+                "settings": {
+                    "concurrency": scenario["concurrency"], "rpm": scenario["rpm"], "burst": scenario["burst"],
+                    "attempts": DEFAULT_MAX_ATTEMPTS, "hedge": scenario["hedge"],
+                    "breaker_threshold": DEFAULT_BREAKER_THRESHOLD, "breaker_cooldown": DEFAULT_BREAKER_COOLDOWN,
+                    "cache_dir": cache_dir, "cache_max_bytes": DEFAULT_MAX_BYTES,
+                },
+            })
+        else:
+            results = run_jobs(
+                jobs,
+                client=client,
+                concurrency=scenario["concurrency"],
+                rate_per_minute=scenario["rpm"],
+                burst=scenario["burst"],
+                cache=cache,
+                manifest=JobManifest(os.path.join(work_dir, "manifest.json"), restart=True),
+                resilience=Resilience(scenario["concurrency"], hedge=scenario["hedge"], seed=0),
+            )
+        return results, time.monotonic() - started
+
+    if scenario["cache"] == "warm":
+        # Fill the cache first; only the second pass is measured
+        run(os.path.join(work_dir, "prime"))
+
+    output_dir = os.path.join(work_dir, "out")
+    results, wall = run(output_dir)
+
+    ok = [r for r in results if r["ok"]]
+    latencies = [r["elapsed"] for r in ok]
+    written = sum(e.stat().st_size for e in os.scandir(output_dir)) if os.path.isdir(output_dir) else 0
+
+    return {
+        "images": len(ok),
+        "failed": len(results) - len(ok),
+        "cached": sum(1 for r in results if r.get("cached")),
+        "requests": sum(1 for r in results if not r.get("cached")),
+        "wall_s": wall,
+        "images_per_min": len(ok) / wall * 60 if wall else 0.0,
+        "p50_s": percentile(latencies, 50),
+        "p95_s": percentile(latencies, 95),
+        "p99_s": percentile(latencies, 99),
+        # ru_maxrss is in kilobytes on Linux. For children it is the largest
+        # queue worker; the workers ran side by side, so count it once each
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "workers_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024 * scenario["workers"],
+        "bytes_written": written,
+    }
+
+
+def print_table(rows: list):
+    header = (f"{'scenario':<22}{'img/min':>9}{'p50 s':>8}{'p95 s':>8}{'p99 s':>8}"
+              f"{'RSS MB':>8}{'wkr MB':>8}{'MB out':>8}{'fail':>6}{'req':>6}")
+    print(f"\n{'='*len(header)}")
+    print(header)
+    print(f"{'='*len(header)}")
+    for row in rows:
+        print(f"{row['scenario']:<22}{row['images_per_min']:>9.1f}{row['p50_s']:>8.2f}{row['p95_s']:>8.2f}"
+              f"{row['p99_s']:>8.2f}{row['peak_rss_mb']:>8.0f}{row['workers_rss_mb']:>8.0f}"
+              f"{row['bytes_written'] / 1024 ** 2:>8.1f}"
+              f"{row['failed']:>6}{row['requests']:>6}")
+
+
+def startup_commands() -> list:
+    """talk.py command lines to time: every command's --help, then real local runs."""
+    commands = []
+    for name, (target, _) in COMMANDS.items():
+        if isinstance(target, dict):
+            commands += [[name, sub, "--help"] for sub in target]
+        else:
+            commands.append([name, "--help"])
+    return commands + [list(argv) for argv in STARTUP_RUNS]
+
+
+def time_run(argv: list) -> float:
+    """Wall time of a fresh interpreter running argv, in milliseconds."""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, *argv], cwd=SCRIPTS_DIR, stdout=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def time_startup(argv: list, runs: int) -> tuple:
+    """Median wall time of talk.py argv, and its overheads over a bare interpreter, in ms.
+
+    Each run is paired with a bare `python -c pass` right before it, so
+    load on the machine shifts both and cancels out of the overhead.
+    """
+    times = []
+    overheads = []
+    for _ in range(runs):
+        bare = time_run(["-c", "pass"])
+        times.append(time_run(["talk.py", *argv]))
+        overheads.append(times[-1] - bare)
+    return statistics.median(times), overheads
+
+
+def bench_startup(runs: int) -> bool:
+    """Time talk.py cold starts. Returns True when every local command is within the budget."""
+    header = f"{'command':<38}{'median ms':>11}{'over bare':>11}{'max over':>10}"
+    print(f"{'='*len(header)}")
+    print(f"Cold start, {runs} runs each; local commands may add {STARTUP_BUDGET_MS} ms to a bare interpreter")
+    print(header)
+    print(f"{'='*len(header)}")
+
+    within = True
+    for argv in startup_commands():
+        median, overheads = time_startup(argv, runs)
+        overhead = statistics.median(overheads)
+        if argv[0] in API_COMMANDS:
+            flag = "  (API)"
+        elif overhead > STARTUP_BUDGET_MS:
+            flag = "  OVER"
+            within = False
+        else:
+            flag = ""
+        print(f"{' '.join(argv):<38}{median:>11.0f}{overhead:>11.0f}{max(overheads):>10.0f}{flag}")
+    return within
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help=f"jobs per scenario (default: {DEFAULT_JOBS})")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4],
+                        help="concurrency levels to compare (default: 4)")
+    parser.add_argument("--cache", choices=CACHE_MODES, nargs="+", default=["off"],
+                        help="response cache modes to compare (default: off)")
+    parser.add_argument("--hedge", choices=HEDGE_MODES, nargs="+", default=["off"],
+                        help="compare with and without hedged requests (default: off)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0],
+                        help="work queue processes to compare; 0 runs in-process (default: 0)")
+    parser.add_argument("--keys", type=int, nargs="+", default=[1],
+                        help="fake API keys to spread queued jobs over (default: 1)")
+    parser.add_argument("--rpm", type=float, default=100000,
+                        help="engine rate limit, per key with --workers (default: effectively none)")
+    parser.add_argument("--burst", type=int, default=1000)
+    parser.add_argument("--model", default="gemini-3-pro-image-preview")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    parser.add_argument("--keep", action="store_true", help="keep each scenario's output directory")
+    parser.add_argument("--startup", action="store_true",
+                        help="time talk.py cold starts instead of running scenarios")
+    parser.add_argument("--runs", type=int, default=DEFAULT_STARTUP_RUNS,
+                        help=f"cold starts per command with --startup (default: {DEFAULT_STARTUP_RUNS})")
+    add_fake_arguments(parser)
+    parser.set_defaults(latency_median=1.0)
+    args = parser.parse_args()
+
+    if args.startup:
+        sys.exit(0 if bench_startup(args.runs) else 1)
+
+    fake = fake_from_args(args)
+    server, base_url = start_server(fake)
+    print(f"Fake Gemini on {base_url}: median {args.latency_median}s ({args.latency_distribution}), "
+          f"{args.payload_kb} KB images, 429 {args.error_429:.0%}, 500 {args.error_500:.0%}"
+          + (f", {args.key_rpm:g} rpm per key" if args.key_rpm else ""))
+
+    spawn = multiprocessing.get_context("spawn")
+    rows = []
+    for hedge, cache_mode, keys, workers, concurrency in itertools.product(
+        args.hedge, args.cache, args.keys, args.workers, args.concurrency
+    ):
+        if not workers and keys != args.keys[0]:
+            continue  # in-process runs use one key
+        name = f"c{concurrency} cache={cache_mode}" + (" hedge" if hedge == "on" else "")
+        if workers:
+            name += f" w{workers} k{keys}"
+        work_dir = tempfile.mkdtemp(prefix="bench-gen-")
+        scenario = {
+            "base_url": base_url, "work_dir": work_dir, "jobs": args.jobs, "model": args.model,
+            "concurrency": concurrency, "rpm": args.rpm, "burst": args.burst, "cache": cache_mode,
+            "hedge": hedge == "on", "keys": keys, "workers": workers,
+        }
+        print(f"\nRunning {name}...")
+        # Not a Pool: its daemonic workers could not start queue worker processes
+        with ProcessPoolExecutor(1, mp_context=spawn) as pool:
+            row = pool.submit(run_scenario, scenario).result()
+        row.update(scenario=name, concurrency=concurrency, cache=cache_mode, hedge=hedge, keys=keys, workers=workers)
+        rows.append(row)
+        if args.keep:
+            print(f"  output kept in {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    server.shutdown()
+    print_table(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "results": rows}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
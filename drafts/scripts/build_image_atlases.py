@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""Pack image thumbnails into texture atlases and review contact sheets.
+
+Canvas atlases: every local image referenced from react-flow-app/src/data
+(slide heroes, landmarks, local resource icons) is downsized to at most
+--sprite-size pixels per side and shelf-packed into a few WebP atlases
+under react-flow-app/public/assets/atlases. The sprite coordinates are
+written to react-flow-app/src/data/imageAtlases.json, keyed by the original
+image URL, so a zoomed-out canvas draws every thumbnail from a handful of
+atlas files instead of requesting each image.
+
+Atlas filenames carry a hash of the sources and settings; when neither
+changed since the last build the atlases are left alone.
+
+Contact sheets: with --contact-sheet, each folder (drafts/mockups, a round
+under drafts/approved, ...) is packed into labelled JPEG sheets in source
+order, plus an index.html whose sheet areas link to the full-size files.
+Sheets go to drafts/.cache/contact_sheets unless --output says otherwise.
+
+    python build_image_atlases.py
+    python build_image_atlases.py --contact-sheet ../mockups ../approved/billboard-round3
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import time
+
+from build_image_placeholders import find_image_urls
+from image_io import file_digest, save_pil_image
+from paths import APP_DATA_DIR, CACHE_DIR, PUBLIC_DIR, public_path, public_url, repo_relative
+
+ATLAS_DIR = os.path.join(PUBLIC_DIR, "assets", "atlases")
+DEFAULT_MANIFEST_PATH = os.path.join(APP_DATA_DIR, "imageAtlases.json")
+CONTACT_SHEETS_DIR = os.path.join(CACHE_DIR, "contact_sheets")
+
+SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+# Longest sprite side; covers the inline thumbnails (200px CSS) up to ~0.6
+# zoom at 2x and the 500px landmarks at overview zoom
+DEFAULT_SPRITE_SIZE = 256
+ATLAS_SIZE = 2048
+# Gap between sprites, so filtering at fractional scales does not bleed
+PADDING = 2
+ATLAS_PARAMS = {"format": "WEBP", "quality": 80, "method": 6}
+
+# Contact sheet cells: thumbnail box and the filename strip beneath it
+CELL_WIDTH = 360
+CELL_HEIGHT = 240
+LABEL_HEIGHT = 22
+SHEET_SIZE = (1920, 1920)
+SHEET_PARAMS = {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True}
+SHEET_BACKGROUND = (24, 24, 27)
+LABEL_COLOR = (212, 212, 216)
+
+MANIFEST_VERSION = 1
+
+
+def fit_size(width: int, height: int, box_width: int, box_height: int) -> tuple:
+    """Largest size with the same aspect ratio inside the box, never upscaled."""
+    scale = min(1.0, box_width / width, box_height / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def pack_shelves(sizes: list, page_width: int, page_height: int, padding: int = 0,
+                 keep_order: bool = False) -> list:
+    """Place (width, height) boxes on as few pages as possible, in shelves.
+
+    Returns one (page, x, y) per size, in input order. By default boxes are
+    placed tallest first and each goes on the first shelf with room, which
+    keeps shelves level and pages full. With keep_order the boxes flow
+    left to right, top to bottom, in the order given.
+    """
+    order = list(range(len(sizes)))
+    if not keep_order:
+        order.sort(key=lambda i: (-sizes[i][1], -sizes[i][0]))
+
+    placements = [None] * len(sizes)
+    # Per page: [used height, shelves]; per shelf: [y, height, used width]
+    pages = []
+    for i in order:
+        width, height = sizes[i][0] + padding, sizes[i][1] + padding
+        if width > page_width or height > page_height:
+            raise ValueError(f"{sizes[i][0]}x{sizes[i][1]} does not fit a {page_width}x{page_height} page")
+
+        spot = None
+        candidates = pages[-1:] if keep_order else pages
+        for page_index, page in enumerate(candidates, start=len(pages) - len(candidates)):
+            shelves = page[1][-1:] if keep_order else page[1]
+            for shelf in shelves:
+                if shelf[1] >= height and shelf[2] + width <= page_width:
+                    spot = page_index, shelf
+                    break
+            if spot:
+                break
+            if page[0] + height <= page_height:
+                shelf = [page[0], height, 0]
+                page[1].append(shelf)
+                page[0] += height
+                spot = page_index, shelf
+                break
+        if not spot:
+            shelf = [0, height, 0]
+            pages.append([height, [shelf]])
+            spot = len(pages) - 1, shelf
+
+        page_index, shelf = spot
+        placements[i] = (page_index, shelf[2], shelf[0])
+        shelf[2] += width
+    return placements
+
+
+def page_extents(sizes: list, placements: list) -> dict:
+    """Used (width, height) of each page, so pages can be cropped to their contents."""
+    extents = {}
+    for (width, height), (page, x, y) in zip(sizes, placements):
+        used = extents.get(page, (0, 0))
+        extents[page] = (max(used[0], x + width), max(used[1], y + height))
+    return extents
+
+
+def load_thumbnail(path: str, box_width: int, box_height: int):
+    """Decode an image at reduced size. Runs in a worker process."""
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as img:
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        # JPEG decodes at 1/2..1/8 scale in draft mode, skipping most of the IDCT
+        img.draft("RGB", (box_width * 2, box_height * 2))
+        img = ImageOps.exif_transpose(img).convert("RGBA" if has_alpha else "RGB")
+        size = fit_size(img.width, img.height, box_width, box_height)
+        return img.resize(size, Image.LANCZOS) if size != img.size else img
+
+
+def load_thumbnails(paths: list, box_width: int, box_height: int, workers: int = None) -> list:
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(load_thumbnail, paths, [box_width] * len(paths), [box_height] * len(paths)))
+
+
+def atlas_key(digests: dict, sprite_size: int) -> str:
+    """Hash of the sources and settings an atlas set is built from."""
+    payload = json.dumps(
+        {
+            "sources": digests,
+            "sprite_size": sprite_size,
+            "atlas_size": ATLAS_SIZE,
+            "padding": PADDING,
+            "params": ATLAS_PARAMS,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def load_manifest(path: str) -> dict:
+    """Load an existing manifest, or an empty one."""
+    empty = {"version": MANIFEST_VERSION, "key": None, "atlases": [], "sprites": {}}
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    return manifest if manifest.get("version") == MANIFEST_VERSION else empty
+
+
+def save_manifest(manifest: dict, path: str):
+    """Write the manifest atomically, with stable key order for clean diffs."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def build_atlases(
+    manifest_path: str = DEFAULT_MANIFEST_PATH,
+    output_dir: str = ATLAS_DIR,
+    sprite_size: int = DEFAULT_SPRITE_SIZE,
+    workers: int = None,
+    force: bool = False,
+) -> dict:
+    """Pack every referenced image into atlases and rewrite the manifest. Returns a summary."""
+    from PIL import Image
+
+    started = time.monotonic()
+    urls = []
+    missing = []
+    for url in find_image_urls():
+        (urls if os.path.exists(public_path(url)) else missing).append(url)
+
+    digests = {url: file_digest(public_path(url)) for url in urls}
+    key = atlas_key(digests, sprite_size)
+    previous = load_manifest(manifest_path)
+    summary = {
+        "images": len(urls),
+        "missing": missing,
+        "source_bytes": sum(os.path.getsize(public_path(url)) for url in urls),
+    }
+    current = previous["key"] == key and all(
+        os.path.exists(public_path(atlas["url"])) for atlas in previous["atlases"]
+    )
+    if current and not force:
+        return dict(summary, manifest=previous, built=False, elapsed=time.monotonic() - started)
+
+    thumbs = load_thumbnails([public_path(url) for url in urls], sprite_size, sprite_size, workers)
+    sizes = [thumb.size for thumb in thumbs]
+    placements = pack_shelves(sizes, ATLAS_SIZE, ATLAS_SIZE, PADDING)
+
+    atlases = []
+    for page, (width, height) in sorted(page_extents(sizes, placements).items()):
+        sheet = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        for thumb, (thumb_page, x, y) in zip(thumbs, placements):
+            if thumb_page == page:
+                sheet.paste(thumb, (x, y))
+        path = os.path.join(output_dir, f"atlas-{key}-{page}.webp")
+        params = dict(ATLAS_PARAMS)
+        save_pil_image(sheet, path, params.pop("format"), **params)
+        atlases.append({"url": public_url(path), "width": width, "height": height,
+                        "bytes": os.path.getsize(path)})
+
+    sprites = {
+        url: {"atlas": page, "x": x, "y": y, "width": width, "height": height}
+        for url, (width, height), (page, x, y) in zip(urls, sizes, placements)
+    }
+    manifest = {"version": MANIFEST_VERSION, "key": key, "atlases": atlases, "sprites": sprites}
+    save_manifest(manifest, manifest_path)
+
+    # Atlases from earlier builds are no longer referenced
+    kept = {os.path.basename(public_path(atlas["url"])) for atlas in atlases}
+    for filename in os.listdir(output_dir):
+        if filename.startswith("atlas-") and filename not in kept:
+            os.remove(os.path.join(output_dir, filename))
+
+    return dict(summary, manifest=manifest, built=True, elapsed=time.monotonic() - started)
+
+
+def find_folder_images(folder: str) -> list:
+    """Images directly inside folder, sorted by filename."""
+    return [
+        os.path.join(folder, filename)
+        for filename in sorted(os.listdir(folder))
+        if filename.lower().endswith(SOURCE_EXTENSIONS) and not filename.startswith(".")
+    ]
+
+
+def _label(text: str, font, width: int) -> str:
+    """Text shortened with an ellipsis to fit width pixels."""
+    if font.getlength(text) <= width:
+        return text
+    while text and font.getlength(text + "…") > width:
+        text = text[:-1]
+    return text + "…"
+
+
+def build_contact_sheets(folder: str, output_dir: str, workers: int = None) -> dict:
+    """Write labelled contact sheets and an index.html for one folder. Returns a summary."""
+    from PIL import Image, ImageDraw, ImageFont
+
+    started = time.monotonic()
+    paths = find_folder_images(folder)
+    if not paths:
+        raise ValueError(f"no images in {folder}")
+
+    thumbs = load_thumbnails(paths, CELL_WIDTH, CELL_HEIGHT, workers)
+    cells = [(CELL_WIDTH, CELL_HEIGHT + LABEL_HEIGHT)] * len(paths)
+    placements = pack_shelves(cells, *SHEET_SIZE, padding=PADDING * 4, keep_order=True)
+    font = ImageFont.load_default(size=13)
+
+    os.makedirs(output_dir, exist_ok=True)
+    sheets = []
+    areas = {}
+    for page, (width, height) in sorted(page_extents(cells, placements).items()):
+        sheet = Image.new("RGB", (width, height), SHEET_BACKGROUND)
+        draw = ImageDraw.Draw(sheet)
+        for path, thumb, (thumb_page, x, y) in zip(paths, thumbs, placements):
+            if thumb_page != page:
+                continue
+            # Centre the thumbnail in its cell; alpha composites onto the background
+            left = x + (CELL_WIDTH - thumb.width) // 2
+            top = y + (CELL_HEIGHT - thumb.height) // 2
+            sheet.paste(thumb, (left, top), thumb if thumb.mode == "RGBA" else None)
+            name = os.path.basename(path)
+            draw.text((x + 4, y + CELL_HEIGHT + 4), _label(name, font, CELL_WIDTH - 8), fill=LABEL_COLOR, font=font)
+            areas.setdefault(page, []).append((path, (x, y, x + CELL_WIDTH, y + CELL_HEIGHT + LABEL_HEIGHT)))
+        sheet_path = os.path.join(output_dir, f"sheet-{page + 1}.jpg")
+        params = dict(SHEET_PARAMS)
+        save_pil_image(sheet, sheet_path, params.pop("format"), **params)
+        sheets.append(sheet_path)
+
+    index_path = os.path.join(output_dir, "index.html")
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(render_index(folder, output_dir, sheets, areas))
+
+    return {
+        "images": len(paths),
+        "sheets": sheets,
+        "index": index_path,
+        "source_bytes": sum(os.path.getsize(path) for path in paths),
+        "sheet_bytes": sum(os.path.getsize(path) for path in sheets),
+        "elapsed": time.monotonic() - started,
+    }
+
+
+def render_index(folder: str, output_dir: str, sheets: list, areas: dict) -> str:
+    """Review page showing the sheets, with each cell linking to its full-size file."""
+    title = html.escape(repo_relative(folder))
+    lines = [
+        "<!doctype html>",
+        '<meta charset="utf-8">',
+        f"<title>{title}</title>",
+        "<style>body{background:#18181b;color:#d4d4d8;font:14px system-ui;margin:16px}"
+        "img{display:block;margin:0 0 16px;max-width:none}</style>",
+        f"<h1>{title}</h1>",
+    ]
+    for page, sheet in enumerate(sheets):
+        lines.append(f'<img src="{html.escape(os.path.basename(sheet))}" usemap="#sheet-{page + 1}" alt="">')
+        lines.append(f'<map name="sheet-{page + 1}">')
+        for path, box in areas[page]:
+            href = html.escape(os.path.relpath(path, output_dir).replace(os.sep, "/"))
+            name = html.escape(os.path.basename(path))
+            coords = ",".join(map(str, box))
+            lines.append(f'  <area shape="rect" coords="{coords}" href="{href}" title="{name}" alt="{name}">')
+        lines.append("</map>")
+    return "\n".join(lines) + "\n"
+
+
+def sheet_dir(folder: str, output_root: str) -> str:
+    """Output directory for a folder's sheets, named after its repository path."""
+    return os.path.join(output_root, repo_relative(folder).replace("/", "_").strip("._") or "root")
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--contact-sheet", nargs="+", metavar="DIR",
+        help="make contact sheets for these folders instead of the canvas atlases",
+    )
+    parser.add_argument(
+        "--output", default=CONTACT_SHEETS_DIR,
+        help="where contact sheets go, one subfolder per DIR (default: drafts/.cache/contact_sheets)",
+    )
+    parser.add_argument(
+        "--sprite-size", type=int, default=DEFAULT_SPRITE_SIZE,
+        help=f"longest side of an atlas sprite in pixels (default: {DEFAULT_SPRITE_SIZE})",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="decoder processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="rebuild the atlases even if no source changed",
+    )
+    parser.add_argument(
+        "--manifest", default=DEFAULT_MANIFEST_PATH,
+        help="manifest to write (default: react-flow-app/src/data/imageAtlases.json)",
+    )
+    args = parser.parse_args()
+
+    if args.contact_sheet:
+        for folder in args.contact_sheet:
+            summary = build_contact_sheets(folder, sheet_dir(folder, args.output), args.workers)
+            print(f"{repo_relative(folder)}: {summary['images']} images on {len(summary['sheets'])} sheets, "
+                  f"{_mb(summary['sheet_bytes'])} instead of {_mb(summary['source_bytes'])} "
+                  f"in {summary['elapsed']:.2f}s")
+            print(f"  {repo_relative(summary['index'])}")
+        return
+
+    summary = build_atlases(args.manifest, sprite_size=args.sprite_size, workers=args.workers, force=args.force)
+    atlases = summary["manifest"]["atlases"]
+    print("=" * 60)
+    print(f"{'Built' if summary['built'] else 'Unchanged'}: {len(atlases)} atlases for {summary['images']} images "
+          f"in {summary['elapsed']:.2f}s")
+    print(f"Atlas bytes: {_mb(sum(atlas['bytes'] for atlas in atlases))} "
+          f"(sources: {_mb(summary['source_bytes'])})")
+    for atlas in atlases:
+        print(f"  {atlas['url']}  {atlas['width']}x{atlas['height']}")
+    print(f"Manifest: {repo_relative(args.manifest)}")
+    if summary["missing"]:
+        print("\nReferenced but missing:")
+        for url in summary["missing"]:
+            print(f"  - {url}")
+
+
+if __name__ == "__main__":
+    main()
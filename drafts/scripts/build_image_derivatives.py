@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""Build responsive WebP/AVIF derivatives of the app's images.
+
+Every JPEG/PNG under react-flow-app/public/assets/images is encoded at a few
+widths plus a tiny thumbnail, into react-flow-app/public/assets/derivatives.
+Encodes run across a process pool, and a source is only re-encoded when its
+content hash (or the encode settings) changed since the last build.
+
+The result is written to react-flow-app/src/data/imageDerivatives.json,
+keyed by the original image URL, so the canvas nodes can pick the smallest
+file that covers their on-screen width at the current zoom level.
+Derivatives that the manifest no longer references are deleted at the end
+of a run, unless --keep-orphans is given.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+
+from image_io import file_digest, save_pil_image
+from paths import APP_DATA_DIR, PUBLIC_DIR, PUBLIC_IMAGES_DIR, public_path, public_url
+
+DERIVATIVES_DIR = os.path.join(PUBLIC_DIR, "assets", "derivatives")
+DEFAULT_MANIFEST_PATH = os.path.join(APP_DATA_DIR, "imageDerivatives.json")
+
+SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+# Widths cover the zoomed-out thumbnails (~200px), the inline cards and the
+# full-slide overlay (~1100px) at 1x and 2x device pixel ratios
+DEFAULT_WIDTHS = (320, 640, 1280, 1920)
+THUMBNAIL_WIDTH = 32
+
+FORMATS = {
+    "avif": {"format": "AVIF", "quality": 50, "speed": 6},
+    "webp": {"format": "WEBP", "quality": 78, "method": 6},
+}
+THUMBNAIL_PARAMS = {"format": "WEBP", "quality": 40, "method": 6}
+
+MANIFEST_VERSION = 1
+
+
+def avif_supported() -> bool:
+    """True when Pillow can encode AVIF (Pillow >= 11.3 or pillow-avif-plugin)."""
+    from PIL import Image
+
+    try:
+        import pillow_avif  # noqa: F401  registers the AVIF plugin
+    except ImportError:
+        pass
+    Image.init()
+    return "AVIF" in Image.SAVE
+
+
+def find_sources(images_dir: str = PUBLIC_IMAGES_DIR) -> list:
+    """All source images under images_dir, sorted by path."""
+    sources = []
+    for dirpath, dirnames, filenames in os.walk(images_dir):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for filename in sorted(filenames):
+            if filename.lower().endswith(SOURCE_EXTENSIONS):
+                sources.append(os.path.join(dirpath, filename))
+    return sources
+
+
+def settings_key(widths, formats) -> str:
+    """Short hash of the encode settings; changing them invalidates every derivative."""
+    payload = json.dumps(
+        {
+            "widths": list(widths),
+            "thumbnail": THUMBNAIL_WIDTH,
+            "formats": {name: FORMATS[name] for name in formats},
+            "thumbnail_params": THUMBNAIL_PARAMS,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def derivative_dir(source_path: str, images_dir: str, output_dir: str) -> str:
+    """Output directory for one source, mirroring its path under images_dir."""
+    relative = os.path.relpath(source_path, images_dir)
+    return os.path.join(output_dir, os.path.splitext(relative)[0])
+
+
+def target_widths(source_width: int, widths) -> list:
+    """Requested widths narrower than the source, plus the source width itself.
+
+    Images are never upscaled; the largest derivative is the source size.
+    """
+    chosen = [w for w in sorted(widths) if w < source_width]
+    if not chosen or chosen[-1] < source_width <= max(widths):
+        chosen.append(source_width)
+    return chosen
+
+
+def build_derivatives(source_path: str, out_dir: str, widths, formats) -> dict:
+    """Encode one source into every width and format. Runs in a worker process."""
+    from PIL import Image, ImageOps
+
+    with Image.open(source_path) as img:
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha else "RGB")
+        source_width, source_height = img.size
+
+        entry = {
+            "width": source_width,
+            "height": source_height,
+            "formats": {name: [] for name in formats},
+        }
+
+        for width in target_widths(source_width, widths):
+            height = round(source_height * width / source_width)
+            resized = img if width == source_width else img.resize((width, height), Image.LANCZOS)
+            for name in formats:
+                params = dict(FORMATS[name])
+                path = os.path.join(out_dir, f"w{width}.{name}")
+                save_pil_image(resized, path, params.pop("format"), **params)
+                entry["formats"][name].append(
+                    {"width": width, "url": public_url(path), "bytes": os.path.getsize(path)}
+                )
+
+        thumb_height = max(1, round(source_height * THUMBNAIL_WIDTH / source_width))
+        thumb = img.resize((THUMBNAIL_WIDTH, thumb_height), Image.LANCZOS)
+        params = dict(THUMBNAIL_PARAMS)
+        thumb_path = os.path.join(out_dir, "thumb.webp")
+        save_pil_image(thumb, thumb_path, params.pop("format"), **params)
+        entry["thumb"] = public_url(thumb_path)
+
+    return entry
+
+
+def entry_is_current(entry: dict, digest: str, settings: str) -> bool:
+    """True when a manifest entry was built from this source and settings, and its files exist."""
+    if not entry or entry.get("hash") != digest or entry.get("settings") != settings:
+        return False
+    return all(url and os.path.exists(public_path(url)) for url in entry_urls(entry))
+
+
+def entry_urls(entry: dict) -> list:
+    """URLs of every file a manifest entry points at."""
+    return [entry.get("thumb")] + [
+        variant["url"] for variants in entry.get("formats", {}).values() for variant in variants
+    ]
+
+
+def prune_orphans(output_dir: str, images: dict, keep_dirs=()) -> tuple:
+    """Delete files under output_dir that no manifest entry references.
+
+    Directories in `keep_dirs` (sources that failed to encode this run) are
+    left alone. Returns (files removed, bytes freed).
+    """
+    referenced = {
+        os.path.normpath(public_path(url)) for entry in images.values() for url in entry_urls(entry) if url
+    }
+    keep_dirs = [os.path.normpath(d) + os.sep for d in keep_dirs]
+    removed = freed = 0
+    for dirpath, _, filenames in os.walk(output_dir, topdown=False):
+        for filename in filenames:
+            path = os.path.normpath(os.path.join(dirpath, filename))
+            if path in referenced or any(path.startswith(d) for d in keep_dirs):
+                continue
+            freed += os.path.getsize(path)
+            os.remove(path)
+            removed += 1
+        if dirpath != output_dir and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return removed, freed
+
+
+def load_manifest(path: str) -> dict:
+    """Load an existing manifest, or an empty one."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"version": MANIFEST_VERSION, "images": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "images": {}}
+    return manifest
+
+
+def save_manifest(manifest: dict, path: str):
+    """Write the manifest atomically, with stable key order for clean diffs."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def build_all(
+    images_dir: str = PUBLIC_IMAGES_DIR,
+    output_dir: str = DERIVATIVES_DIR,
+    manifest_path: str = DEFAULT_MANIFEST_PATH,
+    widths=DEFAULT_WIDTHS,
+    formats=None,
+    workers: int = None,
+    force: bool = False,
+    prune: bool = True,
+) -> dict:
+    """Bring every derivative up to date and rewrite the manifest. Returns a summary.
+
+    With `prune`, derivatives the new manifest does not reference (removed
+    sources, dropped widths or formats) are deleted afterwards.
+    """
+    if formats is None:
+        formats = [name for name in FORMATS if name != "avif" or avif_supported()]
+    settings = settings_key(widths, formats)
+    previous = load_manifest(manifest_path)["images"]
+    images = {}
+    todo = []
+
+    for source_path in find_sources(images_dir):
+        url = public_url(source_path)
+        digest = file_digest(source_path)
+        entry = previous.get(url)
+        if not force and entry_is_current(entry, digest, settings):
+            images[url] = entry
+        else:
+            todo.append((url, source_path, digest))
+
+    unchanged = len(images)
+    print(f"{unchanged} up to date, {len(todo)} to encode ({', '.join(formats)})")
+    started = time.monotonic()
+    failed = []
+
+    # Imported here: the process pool machinery would slow every --help
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                build_derivatives,
+                source_path,
+                derivative_dir(source_path, images_dir, output_dir),
+                widths,
+                formats,
+            ): (url, source_path, digest)
+            for url, source_path, digest in todo
+        }
+        for future in as_completed(futures):
+            url, source_path, digest = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                failed.append((url, source_path))
+                print(f"  ✗ {url}: {e}")
+                continue
+            entry.update(hash=digest, settings=settings)
+            images[url] = entry
+            print(f"  ✓ {url}")
+
+    save_manifest({"version": MANIFEST_VERSION, "images": images}, manifest_path)
+    pruned = freed = 0
+    if prune:
+        keep_dirs = [derivative_dir(source_path, images_dir, output_dir) for _, source_path in failed]
+        pruned, freed = prune_orphans(output_dir, images, keep_dirs)
+    return {
+        "encoded": len(todo) - len(failed),
+        "skipped": unchanged,
+        "failed": [url for url, _ in failed],
+        "pruned": pruned,
+        "pruned_bytes": freed,
+        "elapsed": time.monotonic() - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--widths", type=int, nargs="+", default=list(DEFAULT_WIDTHS),
+        help=f"derivative widths in pixels (default: {' '.join(map(str, DEFAULT_WIDTHS))})",
+    )
+    parser.add_argument(
+        "--formats", nargs="+", choices=sorted(FORMATS),
+        help="formats to encode (default: webp, plus avif when Pillow supports it)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="encoder processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="re-encode every source even if its hash is unchanged",
+    )
+    parser.add_argument(
+        "--keep-orphans", action="store_true",
+        help="keep derivatives that the manifest no longer references",
+    )
+    parser.add_argument(
+        "--manifest", default=DEFAULT_MANIFEST_PATH,
+        help="manifest to write (default: react-flow-app/src/data/imageDerivatives.json)",
+    )
+    args = parser.parse_args()
+
+    summary = build_all(
+        manifest_path=args.manifest,
+        widths=args.widths,
+        formats=args.formats,
+        workers=args.workers,
+        force=args.force,
+        prune=not args.keep_orphans,
+    )
+
+    print(f"\n{'='*60}")
+    print("DERIVATIVES COMPLETE")
+    print(f"{'='*60}")
+    print(f"Encoded: {summary['encoded']}, unchanged: {summary['skipped']} "
+          f"in {summary['elapsed']:.1f}s")
+    if summary["pruned"]:
+        print(f"Pruned: {summary['pruned']} orphaned files ({summary['pruned_bytes'] / 1024 ** 2:.1f} MB)")
+    if summary["failed"]:
+        print("\nFailed:")
+        for url in summary["failed"]:
+            print(f"  - {url}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""Bake blurhash placeholders and intrinsic sizes for the app's images.
+
+Every local image referenced from react-flow-app/src/data (slide
+backgroundImage, landmark and resource images) gets its width, height, a
+blurhash and an average colour, written to the generated module
+react-flow-app/src/data/imagePlaceholders.ts keyed by image URL. Nodes use
+it to reserve layout and paint a blurred preview before the real file loads.
+
+JPEGs are decoded at reduced scale (draft mode) and the blurhash DCT runs in
+NumPy over a small downsampled copy. Results are cached by file hash in
+drafts/.cache/placeholders.json, so a rerun over ~100 unchanged assets only
+stats the files.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import time
+from typing import TYPE_CHECKING
+
+from image_io import file_digest
+from paths import APP_DATA_DIR, CACHE_DIR, public_path, repo_relative
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_OUTPUT_PATH = os.path.join(APP_DATA_DIR, "imagePlaceholders.ts")
+DEFAULT_CACHE_PATH = os.path.join(CACHE_DIR, "placeholders.json")
+
+# Local image URLs as they appear in the data modules
+IMAGE_URL_PATTERN = re.compile(r"""["'](/assets/images/[^"']+\.(?:jpe?g|png|webp))["']""", re.I)
+
+# Generated manifests in the data directory; they mention images without using them
+GENERATED_MODULES = ("imagePlaceholders.ts", "imageDerivatives.json", "imageAtlases.json")
+
+# Blurhash components (x, y); 4x3 suits the 16:9 slide images
+COMPONENTS = (4, 3)
+
+# Pixels per side the blurhash is computed over
+SAMPLE_SIZE = 32
+
+BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+# Bump when the entry format or algorithm changes, to invalidate the cache
+CACHE_VERSION = 1
+
+
+def encode_base83(value: int, length: int) -> str:
+    return "".join(
+        BASE83[(value // 83 ** (length - i - 1)) % 83] for i in range(length)
+    )
+
+
+def srgb_to_linear(values: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    v = values / 255.0
+    return np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(value: float) -> int:
+    v = min(max(value, 0.0), 1.0)
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(pixels: "np.ndarray", components=COMPONENTS) -> str:
+    """Encode an (h, w, 3) uint8 RGB array as a blurhash string."""
+    import numpy as np
+
+    nx, ny = components
+    height, width = pixels.shape[:2]
+    linear = srgb_to_linear(pixels.astype(np.float64))
+
+    # Cosine bases per axis; factors[j, i] is the (i, j) component's colour
+    basis_x = np.cos(np.pi * np.arange(nx)[:, None] * np.arange(width)[None, :] / width)
+    basis_y = np.cos(np.pi * np.arange(ny)[:, None] * np.arange(height)[None, :] / height)
+    factors = np.einsum("jy,ix,yxc->jic", basis_y, basis_x, linear) / (width * height)
+    # The DC term is a plain average; every AC term is scaled by 2
+    normalisation = np.full((ny, nx, 1), 2.0)
+    normalisation[0, 0] = 1.0
+    factors *= normalisation
+
+    dc = factors[0, 0]
+    ac = factors.reshape(-1, 3)[1:]
+
+    result = encode_base83((nx - 1) + (ny - 1) * 9, 1)
+    if len(ac):
+        actual_max = float(np.abs(ac).max())
+        quantised_max = int(max(0, min(82, math.floor(actual_max * 166 - 0.5))))
+        max_value = (quantised_max + 1) / 166
+    else:
+        quantised_max, max_value = 0, 1.0
+    result += encode_base83(quantised_max, 1)
+
+    r, g, b = (linear_to_srgb(c) for c in dc)
+    result += encode_base83((r << 16) + (g << 8) + b, 4)
+
+    scaled = ac / max_value
+    quantised = np.clip(
+        np.floor(np.sign(scaled) * np.sqrt(np.abs(scaled)) * 9 + 9.5), 0, 18
+    ).astype(int)
+    for qr, qg, qb in quantised:
+        result += encode_base83(qr * 19 * 19 + qg * 19 + qb, 2)
+    return result
+
+
+def _hex_color(rgb) -> str:
+    return "#" + "".join(f"{int(round(c)):02x}" for c in rgb)
+
+
+def sample_pixels(img) -> "np.ndarray":
+    """Area-average an RGB image down to at most SAMPLE_SIZE pixels per side."""
+    import numpy as np
+
+    pixels = np.asarray(img, dtype=np.float64)
+    height, width = pixels.shape[:2]
+    step = max(1, math.ceil(max(width, height) / SAMPLE_SIZE))
+    h, w = (height // step) * step, (width // step) * step
+    blocks = pixels[:h, :w].reshape(h // step, step, w // step, step, -1)
+    return blocks.mean(axis=(1, 3)).round().astype(np.uint8)
+
+
+def compute_placeholder(path: str) -> dict:
+    """Width, height, blurhash and average colour for one image file."""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        width, height = img.size
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        # JPEG decodes at 1/2..1/8 scale in draft mode, skipping most of the IDCT
+        img.draft("RGB", (SAMPLE_SIZE * 4, SAMPLE_SIZE * 4))
+        img = img.convert("RGBA" if has_alpha else "RGB")
+        img.thumbnail((SAMPLE_SIZE * 4, SAMPLE_SIZE * 4), Image.BILINEAR)
+        pixels = sample_pixels(img)
+
+    entry = {"width": width, "height": height}
+    if has_alpha:
+        # A rectangle behind a cut-out landmark looks worse than nothing
+        return entry
+    entry["blurhash"] = blurhash(pixels[..., :3])
+    entry["color"] = _hex_color(pixels[..., :3].reshape(-1, 3).mean(axis=0))
+    return entry
+
+
+def find_image_urls(data_dir: str = APP_DATA_DIR) -> list:
+    """Local image URLs referenced from the app's data modules, sorted."""
+    urls = set()
+    for filename in sorted(os.listdir(data_dir)):
+        if not filename.endswith((".ts", ".tsx", ".json")) or filename in GENERATED_MODULES:
+            continue
+        with open(os.path.join(data_dir, filename), encoding="utf-8") as f:
+            urls.update(IMAGE_URL_PATTERN.findall(f.read()))
+    return sorted(urls)
+
+
+class PlaceholderCache:
+    """Placeholders keyed by file hash, with (size, mtime) to skip rehashing."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self.files = {}
+        self.entries = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.files, self.entries = data["files"], data["entries"]
+        except (OSError, ValueError):
+            pass
+
+    def digest(self, path: str) -> str:
+        """File hash, reused while the file's size and mtime are unchanged."""
+        stat = os.stat(path)
+        known = self.files.get(path)
+        if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime_ns:
+            return known["hash"]
+        digest = file_digest(path)
+        self.files[path] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": digest}
+        return digest
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "files": self.files, "entries": self.entries}, f)
+        os.replace(tmp_path, self.path)
+
+
+def render_module(placeholders: dict) -> str:
+    """TypeScript source for the generated placeholder module."""
+    lines = [
+        f"// Generated by {repo_relative(__file__)} - do not edit.",
+        "// Rerun the script after adding or changing images.",
+        "",
+        'import type { ImagePlaceholder } from "../utils/imagePlaceholders";',
+        "",
+        "export const IMAGE_PLACEHOLDERS: Record<string, ImagePlaceholder> = {",
+    ]
+    for url, entry in sorted(placeholders.items()):
+        fields = [f"width: {entry['width']}", f"height: {entry['height']}"]
+        if "blurhash" in entry:
+            fields.append(f"blurhash: {json.dumps(entry['blurhash'])}")
+            fields.append(f"color: {json.dumps(entry['color'])}")
+        lines.append(f"  {json.dumps(url)}: {{ {', '.join(fields)} }},")
+    lines.append("};")
+    return "\n".join(lines) + "\n"
+
+
+def build_placeholders(output_path: str = DEFAULT_OUTPUT_PATH, cache_path: str = DEFAULT_CACHE_PATH) -> dict:
+    """Compute placeholders for every referenced image and write the module."""
+    cache = PlaceholderCache(cache_path)
+    placeholders = {}
+    missing = []
+    computed = 0
+
+    for url in find_image_urls():
+        path = public_path(url)
+        if not os.path.exists(path):
+            missing.append(url)
+            continue
+        digest = cache.digest(path)
+        if digest not in cache.entries:
+            cache.entries[digest] = compute_placeholder(path)
+            computed += 1
+        placeholders[url] = cache.entries[digest]
+
+    source = render_module(placeholders)
+    try:
+        with open(output_path, encoding="utf-8") as f:
+            unchanged = f.read() == source
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(source)
+
+    cache.save()
+    return {"images": len(placeholders), "computed": computed, "missing": missing, "written": not unchanged}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--output", default=DEFAULT_OUTPUT_PATH,
+        help="module to write (default: react-flow-app/src/data/imagePlaceholders.ts)",
+    )
+    parser.add_argument(
+        "--cache", default=DEFAULT_CACHE_PATH,
+        help="placeholder cache (default: drafts/.cache/placeholders.json)",
+    )
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    summary = build_placeholders(args.output, args.cache)
+
+    print(f"{summary['images']} images, {summary['computed']} computed "
+          f"in {time.monotonic() - started:.2f}s")
+    print(f"{'Wrote' if summary['written'] else 'Unchanged'}: {repo_relative(args.output)}")
+    if summary["missing"]:
+        print("\nReferenced but missing:")
+        for url in summary["missing"]:
+            print(f"  - {url}")
+
+
+if __name__ == "__main__":
+    main()
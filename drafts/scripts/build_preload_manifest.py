@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Build the app's navigation-ordered asset preload manifest.
+
+Slides, resources and sections come from react-flow-app/src/data/slides.ts
+and the section connections from src/utils/navigationGraph.ts, so Next
+follows the same track the presenter's arrow keys do. For every slide the
+manifest lists the slide's own images and the ids of the next --ahead
+slides along its track. The app preloads that window whenever the active
+slide changes, so a transition lands on an image that is already cached.
+
+Each local image is weighed by the bytes the full-slide view will actually
+fetch: the derivative from imageDerivatives.json that covers the overlay
+width at 2x, or the original file when there are none. Images heavier than
+the per-slide --budget are flagged, and the report lists them with the
+window weight per slide. Remote images are listed unweighed.
+
+The canvas atlases from imageAtlases.json go first, as the overview set:
+the zoomed-out canvas needs only those.
+
+    python build_preload_manifest.py
+    python build_preload_manifest.py --ahead 2 --budget 300
+"""
+
+import argparse
+import json
+import os
+
+from paths import APP_DATA_DIR, APP_DIR, public_path, repo_relative
+from slide_sources import SLIDES_TS, parse_array, parse_object, read_source
+
+NAVIGATION_TS = os.path.join(APP_DIR, "src", "utils", "navigationGraph.ts")
+DERIVATIVES_PATH = os.path.join(APP_DATA_DIR, "imageDerivatives.json")
+ATLASES_PATH = os.path.join(APP_DATA_DIR, "imageAtlases.json")
+DEFAULT_MANIFEST_PATH = os.path.join(APP_DATA_DIR, "preloadManifest.json")
+
+DEFAULT_AHEAD = 3
+DEFAULT_BUDGET_KB = 400
+
+# FULL_SLIDE_IMAGE_WIDTH in MetroStopNode, at the 2x pixel ratio cap of targetPixelWidth()
+VIEW_WIDTH = 1100
+PIXEL_RATIO = 2
+
+MANIFEST_VERSION = 1
+
+
+def next_links(sections: list, slides: list, connections: dict) -> dict:
+    """Next slide id for each slide, as buildNavigationGraph() links them.
+
+    Within a section Next is the following slide; the last slide of a
+    section goes to the first slide of its section's primary successor.
+    Only sections listed in `sections` take part.
+    """
+    by_section = {}
+    for slide in slides:
+        by_section.setdefault(slide["sectionId"], []).append(slide["id"])
+
+    links = {}
+    for section in sections:
+        ids = by_section.get(section["id"], [])
+        for i, slide_id in enumerate(ids):
+            if i < len(ids) - 1:
+                links[slide_id] = ids[i + 1]
+                continue
+            following = connections.get(section["id"], {}).get("next", [])
+            first = by_section.get(following[0], []) if following else []
+            links[slide_id] = first[0] if first else None
+    return links
+
+
+def ahead_of(slide_id: str, links: dict, count: int) -> list:
+    """Up to `count` slide ids following slide_id."""
+    ahead = []
+    current = links.get(slide_id)
+    while current and len(ahead) < count and current not in ahead and current != slide_id:
+        ahead.append(current)
+        current = links.get(current)
+    return ahead
+
+
+def slide_images(slide: dict, resources: list) -> list:
+    """Image URLs a slide shows: its background, then subnode and resource images."""
+    urls = [slide.get("backgroundImage")]
+    urls += [subnode.get("image") for subnode in slide.get("subnodes", ())]
+    urls += [resource.get("image") for resource in resources if resource["slideId"] == slide["id"]]
+    return list(dict.fromkeys(url for url in urls if url))
+
+
+def fetched_bytes(url: str, derivatives: dict, target_width: int):
+    """Bytes the full-slide view fetches for a local image, or None for remote ones.
+
+    With derivatives, each format's variant is picked the way pickVariant()
+    does and the heaviest counts, since the browser's format is not known.
+    """
+    if not url.startswith("/"):
+        return None
+    entry = derivatives.get(url)
+    if not entry:
+        path = public_path(url)
+        return os.path.getsize(path) if os.path.exists(path) else None
+
+    weights = []
+    for variants in entry["formats"].values():
+        if not variants:
+            continue
+        covering = [v for v in variants if v["width"] >= target_width]
+        chosen = min(covering, key=lambda v: v["width"]) if covering else max(variants, key=lambda v: v["width"])
+        weights.append(chosen.get("bytes", 0))
+    return max(weights, default=None)
+
+
+def _load_json(path: str, key: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get(key) or {}
+    except (OSError, ValueError):
+        return {}
+
+
+def build_manifest(ahead: int = DEFAULT_AHEAD, budget: int = DEFAULT_BUDGET_KB * 1024) -> dict:
+    """The preload manifest for the current slides, images and derivatives."""
+    source = read_source(SLIDES_TS)
+    sections = parse_array(source, "sections")
+    slides = parse_array(source, "slides")
+    resources = parse_array(source, "resources")
+    links = next_links(sections, slides, parse_object(read_source(NAVIGATION_TS), "sectionConnections"))
+    derivatives = _load_json(DERIVATIVES_PATH, "images")
+    atlases = _load_json(ATLASES_PATH, "atlases") or []
+
+    entries = {}
+    for slide in slides:
+        assets = []
+        for url in slide_images(slide, resources):
+            size = fetched_bytes(url, derivatives, VIEW_WIDTH * PIXEL_RATIO)
+            asset = {"url": url, "bytes": size}
+            if size is not None and size > budget:
+                asset["overBudget"] = True
+            assets.append(asset)
+        entries[slide["id"]] = {
+            "next": ahead_of(slide["id"], links, ahead),
+            "bytes": sum(asset["bytes"] or 0 for asset in assets),
+            "assets": assets,
+        }
+    for entry in entries.values():
+        entry["overBudget"] = entry["bytes"] > budget
+        entry["windowBytes"] = entry["bytes"] + sum(entries[slide_id]["bytes"] for slide_id in entry["next"])
+
+    return {
+        "version": MANIFEST_VERSION,
+        "ahead": ahead,
+        "budget": budget,
+        "viewWidth": VIEW_WIDTH,
+        "overview": [atlas["url"] for atlas in atlases],
+        "slides": entries,
+    }
+
+
+def save_manifest(manifest: dict, path: str) -> bool:
+    """Write the manifest if it changed. Returns True when written."""
+    text = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    try:
+        with open(path, encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _kb(size: int) -> str:
+    return f"{size / 1024:,.0f} KB"
+
+
+def print_report(manifest: dict, derivatives: dict):
+    budget = manifest["budget"]
+    print("=" * 60)
+    print(f"Preload windows: current slide + next {manifest['ahead']}, budget {_kb(budget)} per slide")
+    print("=" * 60)
+    for slide_id, entry in manifest["slides"].items():
+        flag = "  OVER" if entry["overBudget"] else ""
+        following = " -> ".join(entry["next"]) or "(end)"
+        print(f"  {slide_id:<10} {_kb(entry['bytes']):>9}  window {_kb(entry['windowBytes']):>9}{flag}  next: {following}")
+
+    heavy = [
+        asset for entry in manifest["slides"].values() for asset in entry["assets"] if asset.get("overBudget")
+    ]
+    if heavy:
+        print(f"\n{len(heavy)} images over the {_kb(budget)} budget:")
+        for asset in heavy:
+            hint = "" if asset["url"] in derivatives else " (no derivatives; run build_image_derivatives.py)"
+            print(f"  - {asset['url']}  {_kb(asset['bytes'])}{hint}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--ahead", type=int, default=DEFAULT_AHEAD,
+        help=f"slides to preload past the current one (default: {DEFAULT_AHEAD})",
+    )
+    parser.add_argument(
+        "--budget", type=int, default=DEFAULT_BUDGET_KB,
+        help=f"bytes one slide may fetch on a transition, in KB (default: {DEFAULT_BUDGET_KB})",
+    )
+    parser.add_argument(
+        "--manifest", default=DEFAULT_MANIFEST_PATH,
+        help="manifest to write (default: react-flow-app/src/data/preloadManifest.json)",
+    )
+    args = parser.parse_args()
+
+    manifest = build_manifest(args.ahead, args.budget * 1024)
+    written = save_manifest(manifest, args.manifest)
+    print_report(manifest, _load_json(DERIVATIVES_PATH, "images"))
+    print(f"\n{'Wrote' if written else 'Unchanged'}: {repo_relative(args.manifest)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Gemini generateContent endpoint.
+
+Answers POST /v1beta/models/{model}:generateContent with the same JSON shape
+as the real API (a text part plus an inlineData image part), after a
+configurable delay, and fails a configurable share of requests with 429 or
+500. Point a client at it with GEMINI_BASE_URL=http://127.0.0.1:PORT so the
+generators and bench_generation.py can be measured without spending quota.
+
+    python fake_gemini_server.py --port 8765 --latency-median 8 --error-429 0.05
+"""
+
+import argparse
+import base64
+import io
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROUTE = re.compile(r"^/v1(?:beta|alpha)?/models/(?P<model>[^/:]+):generateContent$")
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+# Distinct images to answer with, so pHash-based acceptance sees different pictures
+IMAGE_VARIANTS = 16
+IMAGE_SIZE = (512, 288)
+
+ERROR_STATUSES = {
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+}
+
+
+class FakeGemini:
+    """Response generator and counters shared by all request handlers."""
+
+    def __init__(
+        self,
+        latency_median: float = 5.0,
+        latency_sigma: float = 0.4,
+        latency_distribution: str = "lognormal",
+        error_429: float = 0.0,
+        error_500: float = 0.0,
+        payload_kb: int = 1500,
+        payload_jitter: float = 0.3,
+        retry_delay: float = None,
+        key_rpm: float = None,
+        seed: int = None,
+    ):
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.latency_distribution = latency_distribution
+        self.error_429 = error_429
+        self.error_500 = error_500
+        self.payload_kb = payload_kb
+        self.payload_jitter = payload_jitter
+        self.retry_delay = retry_delay
+        self.key_rpm = key_rpm
+        self._key_requests = {}
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "images": 0, "bytes": 0, "429": 0, "500": 0, "keys": {}}
+
+        # Real JPEGs, encoded once and padded per response with a block of
+        # noise; random bytes do not compress, so sizes on the wire match
+        max_bytes = int(payload_kb * 1024 * (1 + payload_jitter)) + 1
+        self._noise = os.urandom(max_bytes)
+        images = random.Random(seed)
+        self._images = [encode_image(images) for _ in range(IMAGE_VARIANTS)]
+
+    def latency(self) -> float:
+        """Seconds to wait before answering, drawn from the configured distribution."""
+        with self.lock:
+            if self.latency_distribution == "fixed":
+                return self.latency_median
+            if self.latency_distribution == "uniform":
+                spread = self.latency_median * self.latency_sigma
+                return max(0.0, self.random.uniform(self.latency_median - spread, self.latency_median + spread))
+            return self.random.lognormvariate(math.log(max(self.latency_median, 1e-6)), self.latency_sigma)
+
+    def over_quota(self, key: str) -> bool:
+        """Count a request against its API key; True if the key is over key_rpm this minute."""
+        now = time.monotonic()
+        with self.lock:
+            self.stats["keys"][key] = self.stats["keys"].get(key, 0) + 1
+            if not self.key_rpm:
+                return False
+            recent = [t for t in self._key_requests.get(key, ()) if now - t < 60]
+            over = len(recent) >= self.key_rpm
+            if not over:
+                recent.append(now)
+            self._key_requests[key] = recent
+            return over
+
+    def pick_error(self):
+        """429, 500 or None, at the configured rates."""
+        with self.lock:
+            roll = self.random.random()
+        if roll < self.error_429:
+            return 429
+        if roll < self.error_429 + self.error_500:
+            return 500
+        return None
+
+    def image_bytes(self) -> bytes:
+        """A decodable JPEG of roughly payload_kb, or its bare size if that is larger."""
+        with self.lock:
+            scale = 1 + self.random.uniform(-self.payload_jitter, self.payload_jitter)
+            image = self.random.choice(self._images)
+        return pad_jpeg(image, int(self.payload_kb * 1024 * scale) - len(image), self._noise)
+
+    def response_body(self, model: str, request: dict) -> tuple:
+        """A generateContent response with a text part and one inline image.
+
+        Returns (body, image size in bytes).
+        """
+        data = self.image_bytes()
+        prompt = ""
+        for content in request.get("contents", []):
+            for part in content.get("parts", []):
+                prompt = prompt or part.get("text", "")
+        return {
+            "candidates": [{
+                "content": {
+                    "role": "model",
+                    "parts": [
+                        {"text": f"Here is the image for: {prompt[:40]}"},
+                        {"inlineData": {"mimeType": "image/jpeg", "data": base64.b64encode(data).decode("ascii")}},
+                    ],
+                },
+                "finishReason": "STOP",
+                "index": 0,
+            }],
+            "usageMetadata": {"promptTokenCount": len(prompt.split()), "candidatesTokenCount": 1290},
+            "modelVersion": model,
+        }, len(data)
+
+    def count(self, **increments):
+        with self.lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+
+def encode_image(rng: random.Random) -> bytes:
+    """A smooth random colour field, encoded as a JPEG."""
+    from PIL import Image
+
+    grid = Image.frombytes("RGB", (16, 9), bytes(rng.randrange(256) for _ in range(16 * 9 * 3)))
+    buffer = io.BytesIO()
+    grid.resize(IMAGE_SIZE, Image.BICUBIC).save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def pad_jpeg(data: bytes, extra: int, noise: bytes) -> bytes:
+    """Grow a JPEG by about `extra` bytes with APP15 segments, which decoders skip."""
+    segments = []
+    offset = 0
+    while extra > 4:
+        # A segment's length field counts itself and holds at most 65535
+        chunk = min(extra - 4, 65533)
+        segments.append(b"\xff\xef" + (chunk + 2).to_bytes(2, "big") + noise[offset:offset + chunk])
+        offset += chunk
+        extra -= chunk + 4
+    return data[:2] + b"".join(segments) + data[2:]
+
+
+def make_handler(fake: FakeGemini):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, body: dict):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                with fake.lock:
+                    self._send_json(200, dict(fake.stats))
+            else:
+                self._send_json(404, {"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}})
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            match = ROUTE.match(self.path.split("?", 1)[0])
+            if not match:
+                self._send_json(404, {"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}})
+                return
+
+            fake.count(requests=1)
+            time.sleep(fake.latency())
+
+            error = 429 if fake.over_quota(self.headers.get("x-goog-api-key", "")) else fake.pick_error()
+            if error:
+                fake.count(**{str(error): 1})
+                body = {"error": {
+                    "code": error,
+                    "message": "Fake server: injected error",
+                    "status": ERROR_STATUSES[error],
+                }}
+                if error == 429 and fake.retry_delay is not None:
+                    # The real API says how long to back off in a RetryInfo detail
+                    body["error"]["details"] = [{
+                        "@type": "type.googleapis.com/google.rpc.RetryInfo",
+                        "retryDelay": f"{fake.retry_delay:g}s",
+                    }]
+                self._send_json(error, body)
+                return
+
+            body, image_size = fake.response_body(match.group("model"), request)
+            fake.count(images=1, bytes=image_size)
+            self._send_json(200, body)
+
+    return Handler
+
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up mid-response (e.g. a benchmark process exiting) are expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def start_server(fake: FakeGemini, host: str = "127.0.0.1", port: int = 0):
+    """Serve in a background thread. Returns (server, base_url)."""
+    server = FakeServer((host, port), make_handler(fake))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_fake_arguments(parser):
+    """Add the fake server's behaviour options to an argparse parser."""
+    parser.add_argument("--latency-median", type=float, default=5.0, help="median response time in seconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.4,
+                        help="lognormal sigma, or relative spread for uniform")
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--error-429", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--error-500", type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument("--payload-kb", type=int, default=1500, help="mean image size in KB")
+    parser.add_argument("--payload-jitter", type=float, default=0.3, help="relative spread of image sizes")
+    parser.add_argument("--retry-delay", type=float, default=None,
+                        help="retryDelay hint, in seconds, to send with each 429")
+    parser.add_argument("--key-rpm", type=float, default=None,
+                        help="answer 429 once an API key exceeds this many requests per minute")
+    parser.add_argument("--seed", type=int, default=None, help="seed for latencies and errors")
+
+
+def fake_from_args(args) -> FakeGemini:
+    return FakeGemini(
+        latency_median=args.latency_median,
+        latency_sigma=args.latency_sigma,
+        latency_distribution=args.latency_distribution,
+        error_429=args.error_429,
+        error_500=args.error_500,
+        payload_kb=args.payload_kb,
+        payload_jitter=args.payload_jitter,
+        retry_delay=args.retry_delay,
+        key_rpm=args.key_rpm,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_fake_arguments(parser)
+    args = parser.parse_args()
+
+    server, url = start_server(fake_from_args(args), args.host, args.port)
+    print(f"Fake Gemini listening on {url}")
+    print(f"  export GEMINI_BASE_URL={url} GEMINI_API_KEY=fake")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
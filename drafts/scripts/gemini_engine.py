@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""Shared async generation engine for the Gemini image scripts.
+
+Each generator describes its work as a list of jobs (plain dicts) and hands
+them to run_jobs(), which sends them through the async Gemini client with
+bounded concurrency and a token-bucket rate limiter. Responses are looked up
+in a ResponseCache first, so unchanged prompts cost no API call, and progress
+is checkpointed to a JobManifest so an interrupted run can resume. Failed
+calls are retried with backoff under an adaptive concurrency limit and a
+circuit breaker (see resilience.py). Every job is timed by phase through a
+RequestTrace (see telemetry.py).
+
+A job looks like:
+
+    {
+        "name": "slide-16-entering-technical-track",
+        "prompt": "...",
+        "output_path": "/path/to/slide-16-entering-technical-track.jpg",
+        "model": "gemini-3-pro-image-preview",   # optional
+        "aspect_ratio": "16:9",                  # optional
+        "image_size": "2K",                      # optional
+        "seed": 1,                               # optional
+    }
+"""
+
+import asyncio
+import os
+import time
+from typing import TYPE_CHECKING
+
+from image_io import is_image_part, save_image_part
+from job_manifest import DONE, FAILED, IN_FLIGHT, JobManifest, default_manifest_path
+from resilience import DEFAULT_BREAKER_COOLDOWN, DEFAULT_BREAKER_THRESHOLD, DEFAULT_MAX_ATTEMPTS, Resilience
+from response_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ResponseCache, cache_key
+from telemetry import RequestTrace, Telemetry, default_trace_path, print_report
+
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
+
+DEFAULT_MODEL = "gemini-3-pro-image-preview"
+DEFAULT_ASPECT_RATIO = "16:9"
+
+# Number of requests allowed in flight at once
+DEFAULT_CONCURRENCY = 4
+
+# Requests per minute, and how many may be sent back-to-back
+DEFAULT_RATE_PER_MINUTE = 20
+DEFAULT_BURST = 4
+
+
+class TokenBucket:
+    """Async token bucket: refills `rate` tokens per second up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available, then take it."""
+        # Waiters queue on the lock, so tokens are handed out in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def make_client(base_url: str = None, api_key: str = None) -> "genai.Client":
+    """Create a Gemini client from GEMINI_API_KEY, or the given key.
+
+    GEMINI_BASE_URL (or `base_url`) points it at another endpoint, such as
+    fake_gemini_server.py. The SDK is imported here rather than at module
+    load, so scripts that never call the API do not pay for it.
+    """
+    from google import genai
+    from google.genai import types
+
+    base_url = base_url or os.environ.get("GEMINI_BASE_URL")
+    return genai.Client(
+        api_key=api_key or os.environ["GEMINI_API_KEY"],
+        http_options=types.HttpOptions(base_url=base_url) if base_url else None,
+    )
+
+
+def build_config(job: dict) -> "types.GenerateContentConfig":
+    """Build the GenerateContentConfig for a job."""
+    from google.genai import types
+
+    image_config = {"aspect_ratio": job.get("aspect_ratio", DEFAULT_ASPECT_RATIO)}
+    if job.get("image_size"):
+        image_config["image_size"] = job["image_size"]
+
+    return types.GenerateContentConfig(
+        response_modalities=['TEXT', 'IMAGE'],
+        image_config=types.ImageConfig(**image_config),
+        seed=job.get("seed"),
+    )
+
+
+def response_parts(response) -> list:
+    """Flatten a response into plain part dicts ("text", or "mime_type" and "data").
+
+    Image bytes are kept exactly as returned; nothing is decoded.
+    """
+    parts = []
+    for part in response.parts or []:
+        if part.inline_data:
+            parts.append({"mime_type": part.inline_data.mime_type, "data": part.inline_data.data})
+        elif part.text:
+            parts.append({"text": part.text})
+    return parts
+
+
+def should_refresh(job: dict, refresh) -> bool:
+    """`refresh` is False, True (every job) or a collection of job names."""
+    if refresh is True:
+        return True
+    return bool(refresh) and job["name"] in refresh
+
+
+async def generate_job(
+    client: "genai.Client",
+    job: dict,
+    bucket: TokenBucket,
+    cache: ResponseCache = None,
+    refresh=False,
+    manifest: JobManifest = None,
+    telemetry: Telemetry = None,
+    resilience: Resilience = None,
+) -> dict:
+    """Generate a single job and save its image. Returns a result dict.
+
+    The API call goes through `resilience` for retries, hedging and circuit
+    breaking, if given. The result's "trace" holds the job's telemetry record.
+    """
+    name = job["name"]
+    model = job.get("model", DEFAULT_MODEL)
+    config = build_config(job)
+    key = cache_key(model, job["prompt"], config)
+    trace = RequestTrace(name, model)
+    result = {
+        "name": name, "ok": False, "output_path": None, "text": [],
+        "error": None, "cached": False, "skipped": False,
+    }
+
+    if manifest and not should_refresh(job, refresh) and not manifest.needs_run(name, key):
+        result.update(ok=True, skipped=True, output_path=job["output_path"], elapsed=0.0)
+        result["trace"] = trace.finish("skipped")
+        if telemetry:
+            telemetry.add(result["trace"])
+        return result
+
+    started = time.monotonic()
+
+    try:
+        parts = None
+        if cache and not should_refresh(job, refresh):
+            with trace.phase("cache"):
+                parts = cache.get(key)
+            result["cached"] = parts is not None
+
+        if parts is None:
+            async def send():
+                trace.record["attempts"] += 1
+                return await client.aio.models.generate_content(
+                    model=model,
+                    contents=[job["prompt"]],
+                    config=config,
+                )
+
+            if manifest:
+                manifest.mark(name, IN_FLIGHT, key=key)
+            print(f"Generating {name}...")
+            if resilience:
+                response = await resilience.call(send, trace, bucket.acquire)
+            else:
+                with trace.phase("rate_wait"):
+                    await bucket.acquire()
+                with trace.phase("request"):
+                    response = await send()
+            with trace.phase("parse"):
+                parts = response_parts(response)
+            trace.record["response_bytes"] = sum(len(p["data"]) for p in parts if "data" in p)
+            if cache and any(is_image_part(part) for part in parts):
+                with trace.phase("cache"):
+                    cache.put(key, parts, model=model)
+
+        for part in parts:
+            if is_image_part(part):
+                with trace.phase("save"):
+                    result["output_path"] = save_image_part(part, job["output_path"])
+                result["ok"] = True
+                label = "Cached" if result["cached"] else "Saved"
+                print(f"  ✓ {label}: {result['output_path']}")
+                break
+            else:
+                result["text"].append(part["text"])
+                print(f"  Text response: {part['text'][:100]}...")
+
+        if not result["ok"]:
+            result["error"] = "no image in response"
+            print(f"  ✗ No image generated for {name}")
+
+    except Exception as e:
+        result["error"] = str(e)
+        print(f"  ✗ Error generating {name}: {e}")
+
+    if manifest:
+        if result["ok"]:
+            manifest.mark(name, DONE, key=key, output_path=result["output_path"], error=None)
+        else:
+            manifest.mark(name, FAILED, key=key, error=result["error"])
+
+    result["elapsed"] = time.monotonic() - started
+    outcome = "failed" if not result["ok"] else "cached" if result["cached"] else "ok"
+    result["trace"] = trace.finish(outcome, error=result["error"])
+    if telemetry:
+        telemetry.add(result["trace"])
+    return result
+
+
+async def run_jobs_async(
+    jobs,
+    client: "genai.Client" = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate_per_minute: float = DEFAULT_RATE_PER_MINUTE,
+    burst: int = DEFAULT_BURST,
+    cache: ResponseCache = None,
+    refresh=False,
+    manifest: JobManifest = None,
+    telemetry: Telemetry = None,
+    resilience: Resilience = None,
+) -> list:
+    """Run jobs with at most `concurrency` in flight. Results are in completion order.
+
+    Pass a ResponseCache to serve unchanged prompts from disk; `refresh`
+    (True, or a collection of job names) skips the lookup and re-rolls.
+    Pass a JobManifest to skip items finished by an earlier run and to
+    checkpoint each completion. Pass a Telemetry to write each job's trace
+    as it finishes; the caller closes it, so one Telemetry can span several
+    runs. API calls are retried and adaptively limited by `resilience`,
+    which defaults to a Resilience with `concurrency` as its ceiling.
+    """
+    client = client or make_client()
+    resilience = resilience or Resilience(concurrency)
+    bucket = TokenBucket(rate_per_minute / 60, burst)
+    pending = iter(jobs)
+    results = []
+
+    async def worker():
+        # Workers share one iterator, so each job is taken exactly once
+        for job in pending:
+            results.append(await generate_job(client, job, bucket, cache, refresh, manifest, telemetry, resilience))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
+
+
+def run_jobs(jobs, queue: dict = None, **kwargs) -> list:
+    """Synchronous wrapper around run_jobs_async().
+
+    With `queue` (see engine_options), the jobs are instead drained through
+    a shared work queue by worker processes; see work_queue.py.
+    """
+    if queue:
+        from work_queue import run_queued
+        return run_queued(list(jobs), telemetry=kwargs.get("telemetry"), **queue)
+    return asyncio.run(run_jobs_async(jobs, **kwargs))
+
+
+def add_engine_arguments(parser, run_name: str):
+    """Add the engine's command-line options to an argparse parser.
+
+    `run_name` names the default job manifest for the calling script.
+    """
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help=f"requests in flight at once (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--rpm", type=float, default=DEFAULT_RATE_PER_MINUTE,
+        help=f"requests per minute (default: {DEFAULT_RATE_PER_MINUTE})",
+    )
+    parser.add_argument(
+        "--burst", type=int, default=DEFAULT_BURST,
+        help=f"requests that may be sent back-to-back (default: {DEFAULT_BURST})",
+    )
+    parser.add_argument(
+        "--refresh", nargs="*", metavar="NAME",
+        help="ignore cached responses and re-roll; give names to re-roll only those",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="neither read nor write the response cache",
+    )
+    parser.add_argument(
+        "--cache-dir", default=DEFAULT_CACHE_DIR,
+        help="response cache directory (default: drafts/.cache/responses)",
+    )
+    parser.add_argument(
+        "--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // 1024 ** 2,
+        help="evict least recently used responses beyond this size",
+    )
+    parser.add_argument(
+        "--manifest",
+        help=f"job manifest to resume from (default: drafts/.cache/runs/{run_name}.json; "
+             "not used with --queue, which records progress itself)",
+    )
+    parser.add_argument(
+        "--restart", action="store_true",
+        help="ignore earlier progress (the manifest, or jobs done in the --queue) and run every item again",
+    )
+    parser.add_argument(
+        "--trace", default=default_trace_path(run_name),
+        help=f"append per-request timings here (default: drafts/.cache/runs/{run_name}.trace.jsonl)",
+    )
+    parser.add_argument(
+        "--metrics", metavar="PATH",
+        help="write run metrics in Prometheus text format",
+    )
+    parser.add_argument(
+        "--attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+        help=f"tries per request before giving up on 429s, 5xx and timeouts (default: {DEFAULT_MAX_ATTEMPTS})",
+    )
+    parser.add_argument(
+        "--hedge", action="store_true",
+        help="send a duplicate request when one outlives the p95 latency (costs extra quota)",
+    )
+    parser.add_argument(
+        "--breaker-threshold", type=int, default=DEFAULT_BREAKER_THRESHOLD,
+        help=f"consecutive server errors that pause all requests (default: {DEFAULT_BREAKER_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--breaker-cooldown", type=float, default=DEFAULT_BREAKER_COOLDOWN,
+        help=f"seconds to pause before probing again (default: {DEFAULT_BREAKER_COOLDOWN:.0f})",
+    )
+    parser.add_argument(
+        "--queue", metavar="PATH",
+        help="drain jobs through this shared SQLite work queue with worker processes, "
+             "spreading them over the keys in GEMINI_API_KEYS (--rpm is then per key)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=2,
+        help="worker processes to start with --queue; 0 waits for workers started elsewhere (default: 2)",
+    )
+    parser.set_defaults(run_name=run_name)
+
+
+def queue_settings(args) -> dict:
+    """Picklable engine settings for work queue worker processes."""
+    refresh = args.refresh == [] or sorted(args.refresh or ())
+    return {
+        "concurrency": args.concurrency,
+        "rpm": args.rpm,
+        "burst": args.burst,
+        "attempts": args.attempts,
+        "hedge": args.hedge,
+        "breaker_threshold": args.breaker_threshold,
+        "breaker_cooldown": args.breaker_cooldown,
+        "cache_dir": None if args.no_cache else args.cache_dir,
+        "cache_max_bytes": args.cache_max_mb * 1024 ** 2,
+        "refresh": refresh,
+    }
+
+
+def engine_options(args) -> dict:
+    """Map parsed engine arguments to run_jobs() keyword arguments."""
+    if args.queue:
+        if args.manifest:
+            raise SystemExit("error: --manifest does not apply with --queue; the queue records which jobs are done")
+        return {
+            "queue": {
+                "path": args.queue, "workers": args.workers, "settings": queue_settings(args),
+                "restart": args.restart,
+            },
+            "telemetry": Telemetry(args.trace, args.metrics),
+        }
+    return {
+        "concurrency": args.concurrency,
+        "rate_per_minute": args.rpm,
+        "burst": args.burst,
+        "cache": None if args.no_cache else ResponseCache(args.cache_dir, args.cache_max_mb * 1024 ** 2),
+        # --refresh alone re-rolls everything; --refresh NAME... only those jobs
+        "refresh": args.refresh == [] or set(args.refresh or ()),
+        "manifest": JobManifest(args.manifest or default_manifest_path(args.run_name), restart=args.restart),
+        "telemetry": Telemetry(args.trace, args.metrics),
+        "resilience": Resilience(
+            args.concurrency,
+            max_attempts=args.attempts,
+            hedge=args.hedge,
+            breaker_threshold=args.breaker_threshold,
+            breaker_cooldown=args.breaker_cooldown,
+        ),
+    }
+
+
+def print_plan(jobs: list):
+    """Print what a run would generate, for --dry-run. Needs neither the SDK nor a key."""
+    from paths import repo_relative
+
+    print(f"{len(jobs)} images would be generated:")
+    for job in jobs:
+        print(f"  {job['name']}: {len(job['prompt'])}-character prompt -> {repo_relative(job['output_path'])}")
+
+
+def print_summary(results: list, total: int):
+    """Print the end-of-run summary shared by all generators."""
+    failed = [r["name"] for r in results if not r["ok"]]
+    skipped = sum(1 for r in results if r.get("skipped"))
+
+    print(f"\n{'='*60}")
+    print("GENERATION COMPLETE")
+    print(f"{'='*60}")
+    print(f"Successfully generated: {total - len(failed)}/{total} images")
+    if skipped:
+        print(f"Already done in an earlier run: {skipped}")
+
+    if failed:
+        print(f"\nFailed:")
+        for name in failed:
+            print(f"  - {name}")
+    else:
+        print("\nAll images generated successfully!")
+
+    print_report([r["trace"] for r in results if "trace" in r])
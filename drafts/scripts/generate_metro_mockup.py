@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """Generate a realistic Metro Network mockup with actual slide content"""
 
+import argparse
 import os
-from google import genai
-from google.genai import types
 
-client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
+from gemini_engine import add_engine_arguments, engine_options, print_plan, print_summary, run_jobs
+from paths import MOCKUPS_DIR
 
 prompt = """Create a UI screenshot of a presentation canvas designed as a modern metro transit map for a presentation called "Using AI as a Native Skill".
 
@@ -77,27 +77,34 @@ VISUAL STYLE:
 
 Make it look like a real, polished transit map UI - clean, organized, information-dense but readable. The blue and orange lines should run somewhat parallel showing the non-technical and technical tracks as alternative paths to mastery."""
 
-print("Generating realistic Metro Network mockup with actual slide content...")
-
-response = client.models.generate_content(
-    model="gemini-3-pro-image-preview",
-    contents=[prompt],
-    config=types.GenerateContentConfig(
-        response_modalities=['TEXT', 'IMAGE'],
-        image_config=types.ImageConfig(
-            aspect_ratio="16:9",
-            image_size="2K"
-        ),
-    ),
-)
-
-for part in response.parts:
-    if part.inline_data:
-        img = part.as_image()
-        output_path = "/Users/craigdossantos/Coding/ai-talk-slides/UI-plans/metro-network-realistic.jpg"
-        img.save(output_path)
-        print(f"Saved: {output_path}")
-    elif part.text:
-        print(f"Text: {part.text[:200]}...")
-
-print("Done!")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--output-dir", default=MOCKUPS_DIR,
+        help="where the mockup goes (default: drafts/mockups)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="show the job without generating it")
+    add_engine_arguments(parser, "metro_mockup")
+    args = parser.parse_args()
+
+    job = {
+        "name": "metro-network-realistic",
+        "prompt": prompt,
+        "output_path": os.path.join(args.output_dir, "metro-network-realistic.jpg"),
+        "aspect_ratio": "16:9",
+        "image_size": "2K",
+    }
+    if args.dry_run:
+        print_plan([job])
+        return
+
+    print("Generating realistic Metro Network mockup with actual slide content...")
+    options = engine_options(args)
+    with options["telemetry"]:
+        results = run_jobs([job], **options)
+    print_summary(results, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """Generate 10 UI design mockups using Gemini API"""
 
+import argparse
 import os
-from google import genai
-from google.genai import types
 
-client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
+from gemini_engine import add_engine_arguments, engine_options, print_plan, print_summary, run_jobs
+from paths import MOCKUPS_DIR
 
 prompts = [
     {
@@ -50,48 +50,64 @@ prompts = [
     }
 ]
 
-def generate_image(name, prompt):
-    """Generate a single image and save it"""
-    print(f"Generating {name}...")
-    try:
-        response = client.models.generate_content(
-            model="gemini-3-pro-image-preview",
-            contents=[prompt],
-            config=types.GenerateContentConfig(
-                response_modalities=['TEXT', 'IMAGE'],
-                image_config=types.ImageConfig(
-                    aspect_ratio="16:9",
-                    image_size="2K"
-                ),
-            ),
-        )
+def build_job(item: dict, output_dir: str = MOCKUPS_DIR) -> dict:
+    """Describe a mockup as a generation job."""
+    return {
+        "name": item["name"],
+        "prompt": item["prompt"],
+        # Save as JPG (Gemini returns JPEG)
+        "output_path": os.path.join(output_dir, f"{item['name']}.jpg"),
+        "aspect_ratio": "16:9",
+        "image_size": "2K",
+    }
 
-        for part in response.parts:
-            if part.inline_data:
-                img = part.as_image()
-                # Save as JPG (Gemini returns JPEG)
-                output_path = f"/Users/craigdossantos/Coding/ai-talk-slides/UI-plans/{name}.jpg"
-                img.save(output_path)
-                print(f"  Saved: {output_path}")
-                return True
-            elif part.text:
-                print(f"  Text response: {part.text[:100]}...")
 
-        print(f"  Warning: No image in response for {name}")
-        return False
-    except Exception as e:
-        print(f"  Error generating {name}: {e}")
-        return False
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--want", type=int,
+        help="stop once this many distinct mockups exist, instead of generating all 10",
+    )
+    parser.add_argument(
+        "--output-dir", default=MOCKUPS_DIR,
+        help="where the mockups go (default: drafts/mockups)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="list the mockups without generating them")
+    add_engine_arguments(parser, "mockups")
+    args = parser.parse_args()
+
+    jobs = [build_job(item, args.output_dir) for item in prompts]
+    if args.dry_run:
+        print_plan(jobs)
+        return
 
-if __name__ == "__main__":
     print("Starting mockup generation...")
     print("=" * 50)
 
-    success_count = 0
-    for item in prompts:
-        if generate_image(item["name"], item["prompt"]):
-            success_count += 1
-        print()
+    os.makedirs(args.output_dir, exist_ok=True)
+    options = engine_options(args)
+    if not args.want:
+        with options["telemetry"]:
+            results = run_jobs(jobs, **options)
+        print_summary(results, len(prompts))
+        return
 
-    print("=" * 50)
-    print(f"Generation complete: {success_count}/{len(prompts)} images created")
+    # Prompts are already in priority order; waves stop once enough are usable
+    from image_index import DEFAULT_DISTANCE
+    from variation_sweep import near_duplicate_filter, run_sweep
+
+    accept, _ = near_duplicate_filter(DEFAULT_DISTANCE)
+    # One trace file and metrics dump for all waves
+    with options["telemetry"]:
+        history = run_sweep(
+            ({"group": "mockups", "job": job} for job in jobs),
+            lambda batch: run_jobs(batch, **options),
+            accept, want=args.want, budget=len(jobs), wave=args.concurrency,
+        )
+    print_summary([result for _, result, _ in history], len(history))
+    print(f"Kept {sum(ok for _, _, ok in history)} of {len(history)} generated; "
+          f"{len(jobs) - len(history)} mockups never requested")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,11 @@
 #!/usr/bin/env python3
 """Generate 4 title slide image options using Gemini API (Nano Banana)"""
 
+import argparse
 import os
-from google import genai
-from google.genai import types
 
-client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
-
-# Output directory
-output_dir = "/Users/craigdossantos/conductor/workspaces/conductor-playground/hangzhou/assets/images"
-os.makedirs(output_dir, exist_ok=True)
+from gemini_engine import add_engine_arguments, engine_options, print_plan, print_summary, run_jobs
+from paths import DRAFT_IMAGES_DIR
 
 prompts = [
     # Option 1: User's direction - comparative scene
@@ -31,27 +27,38 @@ prompts = [
     Style: Clean modern illustration, dark background, hands rendered realistically, holographic elements in cyan and magenta, elegant and powerful, minimal but impactful.""",
 ]
 
-for i, prompt in enumerate(prompts, 1):
-    print(f"Generating image {i}/4...")
-    response = client.models.generate_content(
-        model="gemini-3-pro-image-preview",
-        contents=[prompt],
-        config=types.GenerateContentConfig(
-            response_modalities=['TEXT', 'IMAGE'],
-            image_config=types.ImageConfig(
-                aspect_ratio="16:9",
-                image_size="2K"
-            ),
-        ),
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--output-dir", default=DRAFT_IMAGES_DIR,
+        help="where the title images go (default: drafts/images)",
     )
+    parser.add_argument("--dry-run", action="store_true", help="list the images without generating them")
+    add_engine_arguments(parser, "title_images")
+    args = parser.parse_args()
+
+    jobs = [
+        {
+            "name": f"title_option_{i}",
+            "prompt": prompt,
+            "output_path": os.path.join(args.output_dir, f"title_option_{i}.jpg"),
+            "aspect_ratio": "16:9",
+            "image_size": "2K",
+        }
+        for i, prompt in enumerate(prompts, 1)
+    ]
+    if args.dry_run:
+        print_plan(jobs)
+        return
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    print(f"Generating {len(jobs)} title images...")
+    options = engine_options(args)
+    with options["telemetry"]:
+        results = run_jobs(jobs, **options)
+    print_summary(results, len(jobs))
 
-    for part in response.parts:
-        if part.inline_data:
-            img = part.as_image()
-            output_path = f"{output_dir}/title_option_{i}.jpg"
-            img.save(output_path)
-            print(f"  Saved: {output_path}")
-        elif part.text:
-            print(f"  Model said: {part.text[:100]}...")
 
-print("\nDone! All 4 images generated.")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""Perceptual-hash index of every image in the repo, for finding duplicates.
+
+Images under drafts/images, drafts/approved, drafts/mockups and
+react-flow-app/public/assets/images are hashed in a process pool (SHA-256,
+64-bit dHash and 64-bit DCT pHash) and kept in drafts/.cache/image_index.json,
+so a rerun only hashes new or changed files. Near-duplicate queries go
+through a BK-tree over the pHashes instead of comparing every pair.
+
+    python image_index.py                 # update the index, report duplicates
+    python image_index.py --distance 6    # looser near-duplicate threshold
+    python image_index.py --query some.jpg
+"""
+
+import argparse
+import functools
+import json
+import os
+import time
+from typing import TYPE_CHECKING
+
+from image_io import file_digest
+from paths import CACHE_DIR, DRAFTS_DIR, PUBLIC_DIR, PUBLIC_IMAGES_DIR, repo_relative
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_INDEX_PATH = os.path.join(CACHE_DIR, "image_index.json")
+
+IMAGE_FOLDERS = (
+    os.path.join(DRAFTS_DIR, "images"),
+    os.path.join(DRAFTS_DIR, "approved"),
+    os.path.join(DRAFTS_DIR, "mockups"),
+    PUBLIC_IMAGES_DIR,
+)
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+# Hamming distance (of 64 bits) at which two pHashes count as the same picture
+DEFAULT_DISTANCE = 4
+
+INDEX_VERSION = 1
+
+HASH_SIZE = 8
+PHASH_SAMPLE = 32
+
+
+@functools.lru_cache(maxsize=None)
+def _dct_matrix(n: int) -> "np.ndarray":
+    """Orthonormal DCT-II basis; dct(x) == matrix @ x."""
+    import numpy as np
+
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+def _bits_to_int(bits: "np.ndarray") -> int:
+    return int("".join("1" if b else "0" for b in bits.ravel()), 2)
+
+
+def perceptual_hashes(path: str) -> dict:
+    """SHA-256, dHash and pHash for one file. Runs in a worker process."""
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(path) as img:
+        width, height = img.size
+        # JPEG decodes at reduced scale; the hashes only need a few pixels
+        img.draft("L", (PHASH_SAMPLE * 2, PHASH_SAMPLE * 2))
+        gray = img.convert("L")
+        dsample = np.asarray(gray.resize((HASH_SIZE + 1, HASH_SIZE), Image.BILINEAR), dtype=np.float64)
+        psample = np.asarray(gray.resize((PHASH_SAMPLE, PHASH_SAMPLE), Image.BILINEAR), dtype=np.float64)
+
+    # dHash: is each pixel brighter than its right-hand neighbour
+    dhash = _bits_to_int(dsample[:, 1:] > dsample[:, :-1])
+
+    # pHash: low-frequency DCT coefficients against their median (DC excluded)
+    dct = _dct_matrix(PHASH_SAMPLE)
+    low = (dct @ psample @ dct.T)[:HASH_SIZE, :HASH_SIZE]
+    phash = _bits_to_int(low > np.median(low.ravel()[1:]))
+
+    return {
+        "sha256": file_digest(path),
+        "dhash": f"{dhash:016x}",
+        "phash": f"{phash:016x}",
+        "width": width,
+        "height": height,
+    }
+
+
+def _hashes_or_error(path: str) -> tuple:
+    """perceptual_hashes() for a pool worker: (hashes, None), or (None, error) if unreadable."""
+    try:
+        return perceptual_hashes(path), None
+    except OSError as e:  # includes PIL's UnidentifiedImageError and truncated files
+        return None, str(e)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class BKTree:
+    """Burkhard-Keller tree over 64-bit hashes under Hamming distance.
+
+    Each node keeps children keyed by their distance to it; the triangle
+    inequality limits a radius-k search to children within [d - k, d + k].
+    """
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value: int, item):
+        if self.root is None:
+            self.root = (value, [item], {})
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, [item], {})
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> list:
+        """(distance, item) pairs within `radius` of value."""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node_value, items, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= radius:
+                found.extend((distance, item) for item in items)
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+def find_images(folders=IMAGE_FOLDERS) -> list:
+    """Image files under the given folders, sorted."""
+    found = []
+    for folder in folders:
+        for dirpath, dirnames, filenames in os.walk(folder):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            found.extend(
+                os.path.join(dirpath, f) for f in sorted(filenames) if f.lower().endswith(IMAGE_EXTENSIONS)
+            )
+    return found
+
+
+class ImageIndex:
+    """Persistent hashes for every indexed image, keyed by repo-relative path."""
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        self.images = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.images = data["images"]
+        except (OSError, ValueError):
+            pass
+
+    def update(self, files, workers: int = None) -> int:
+        """Hash new or changed files in parallel and drop deleted ones. Returns the number hashed.
+
+        Unreadable files are reported and left out of the index, so the next
+        update tries them again.
+        """
+        current = {}
+        todo = []
+        for path in files:
+            key = repo_relative(path)
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                print(f"  Skipping {key}: {e}")
+                continue
+            entry = self.images.get(key)
+            if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+                current[key] = entry
+            else:
+                todo.append((key, path, stat))
+
+        if todo:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                hashes = pool.map(_hashes_or_error, [path for _, path, _ in todo], chunksize=4)
+                for (key, _, stat), (entry, error) in zip(todo, hashes):
+                    if error:
+                        print(f"  Skipping unreadable image {key}: {error}")
+                        continue
+                    entry.update(size=stat.st_size, mtime=stat.st_mtime_ns)
+                    current[key] = entry
+
+        self.images = current
+        return sum(key in current for key, _, _ in todo)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "images": self.images}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def tree(self) -> BKTree:
+        tree = BKTree()
+        for key, entry in self.images.items():
+            tree.add(int(entry["phash"], 16), key)
+        return tree
+
+    def near(self, phash: str, distance: int = DEFAULT_DISTANCE, tree: BKTree = None) -> list:
+        """Indexed images within `distance` of a pHash, closest first."""
+        tree = tree or self.tree()
+        return sorted(tree.search(int(phash, 16), distance))
+
+    def groups(self, distance: int = DEFAULT_DISTANCE) -> list:
+        """Clusters of two or more images linked by pHash distance <= `distance`.
+
+        Pairs whose dHash disagrees by more than twice the threshold are not
+        linked, which keeps unrelated images with similar layouts apart.
+        """
+        tree = self.tree()
+        parent = {key: key for key in self.images}
+
+        def find(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for key, entry in self.images.items():
+            dhash = int(entry["dhash"], 16)
+            for _, other in tree.search(int(entry["phash"], 16), distance):
+                if other != key and hamming(dhash, int(self.images[other]["dhash"], 16)) <= 2 * distance:
+                    parent[find(other)] = find(key)
+
+        clusters = {}
+        for key in self.images:
+            clusters.setdefault(find(key), []).append(key)
+        return sorted(
+            (sorted(members) for members in clusters.values() if len(members) > 1),
+            key=lambda members: -sum(self.images[m]["size"] for m in members),
+        )
+
+
+def is_deployed(key: str) -> bool:
+    """True for files shipped with the app (everything under react-flow-app/public)."""
+    return key.startswith(repo_relative(PUBLIC_DIR) + "/")
+
+
+def savings(index: ImageIndex, group: list) -> dict:
+    """Bytes reclaimable by keeping one file per group, overall and in the deploy."""
+    exact = {}
+    for key in group:
+        exact.setdefault(index.images[key]["sha256"], []).append(key)
+    sizes = [index.images[key]["size"] for key in group]
+    deployed = [index.images[key]["size"] for key in group if is_deployed(key)]
+    return {
+        "repo": sum(sizes) - max(sizes),
+        "deploy": sum(deployed) - max(deployed) if deployed else 0,
+        "exact_copies": sum(len(keys) - 1 for keys in exact.values()),
+    }
+
+
+def report(index: ImageIndex, distance: int):
+    """Print duplicate groups and the bytes they cost."""
+    groups = index.groups(distance)
+    total_repo = total_deploy = 0
+
+    for group in groups:
+        saved = savings(index, group)
+        total_repo += saved["repo"]
+        total_deploy += saved["deploy"]
+        label = f"{saved['exact_copies']} exact" if saved["exact_copies"] else "near"
+        print(f"\n{len(group)} images ({label}), {saved['repo'] / 1024 ** 2:.1f} MB redundant:")
+        for key in group:
+            entry = index.images[key]
+            marker = "*" if is_deployed(key) else " "
+            print(f"  {marker} {entry['size'] / 1024 ** 2:5.1f} MB  {key}")
+
+    print(f"\n{'='*60}")
+    print("DUPLICATE REPORT")
+    print(f"{'='*60}")
+    print(f"Indexed images: {len(index.images)}")
+    print(f"Duplicate groups (pHash distance <= {distance}): {len(groups)}")
+    print(f"Reclaimable in repo: {total_repo / 1024 ** 2:.1f} MB")
+    print(f"Reclaimable in deploy (* = under react-flow-app/public): {total_deploy / 1024 ** 2:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--distance", type=int, default=DEFAULT_DISTANCE,
+        help=f"max pHash Hamming distance for near-duplicates (default: {DEFAULT_DISTANCE})",
+    )
+    parser.add_argument("--query", metavar="IMAGE", help="list indexed images near this one")
+    parser.add_argument("--workers", type=int, default=None, help="hashing processes (default: one per CPU)")
+    parser.add_argument(
+        "--index", default=DEFAULT_INDEX_PATH,
+        help="index file (default: drafts/.cache/image_index.json)",
+    )
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    index = ImageIndex(args.index)
+    hashed = index.update(find_images(), args.workers)
+    index.save()
+    print(f"Indexed {len(index.images)} images ({hashed} hashed) in {time.monotonic() - started:.1f}s")
+
+    if args.query:
+        phash = perceptual_hashes(args.query)["phash"]
+        for distance, key in index.near(phash, args.distance):
+            print(f"  {distance:2d}  {key}")
+    else:
+        report(index, args.distance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Image file helpers shared by the generators and asset stages.
+
+Images returned by Gemini are written to disk exactly as received: the
+inline bytes (or a cached copy) are streamed into a temp file next to the
+destination and renamed into place, so nothing is decoded or re-encoded and
+readers never see a half-written file. PIL is only imported by load_pixels(),
+for stages that actually need pixels.
+"""
+
+import hashlib
+import mimetypes
+import os
+import shutil
+import tempfile
+
+CHUNK_SIZE = 1024 * 1024
+
+EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/avif": ".avif",
+}
+
+
+def extension_for_mime(mime_type: str) -> str:
+    """File extension for a MIME type, e.g. ".jpg" for image/jpeg."""
+    return EXTENSIONS.get(mime_type) or mimetypes.guess_extension(mime_type or "") or ".bin"
+
+
+def output_path_for(output_path: str, mime_type: str) -> str:
+    """Add the MIME type's extension when output_path has none."""
+    if os.path.splitext(output_path)[1]:
+        return output_path
+    return output_path + extension_for_mime(mime_type)
+
+
+def _atomic_write(output_path: str, write):
+    """Call write(file) on a temp file beside output_path, then rename it into place."""
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=".tmp-", suffix=os.path.splitext(output_path)[1]
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def save_image_bytes(data: bytes, output_path: str, mime_type: str = None) -> str:
+    """Stream encoded image bytes to output_path atomically. Returns the final path."""
+    output_path = output_path_for(output_path, mime_type)
+    view = memoryview(data)
+
+    def write(f):
+        for offset in range(0, len(view), CHUNK_SIZE):
+            f.write(view[offset:offset + CHUNK_SIZE])
+
+    _atomic_write(output_path, write)
+    return output_path
+
+
+def copy_image_file(source_path: str, output_path: str, mime_type: str = None) -> str:
+    """Stream an existing image file to output_path atomically. Returns the final path."""
+    output_path = output_path_for(output_path, mime_type)
+
+    def write(f):
+        with open(source_path, "rb") as src:
+            shutil.copyfileobj(src, f, CHUNK_SIZE)
+
+    _atomic_write(output_path, write)
+    return output_path
+
+
+def save_image_part(part: dict, output_path: str) -> str:
+    """Save a response part holding either inline "data" or a cached file "path"."""
+    if "path" in part:
+        return copy_image_file(part["path"], output_path, part.get("mime_type"))
+    return save_image_bytes(part["data"], output_path, part.get("mime_type"))
+
+
+def is_image_part(part: dict) -> bool:
+    """True for image parts, False for text parts."""
+    return "mime_type" in part
+
+
+def save_pil_image(img, output_path: str, format: str, **params):
+    """Encode a PIL image to output_path atomically."""
+    _atomic_write(output_path, lambda f: img.save(f, format=format, **params))
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_pixels(path: str):
+    """Decode an image with PIL, for stages that need pixels rather than bytes."""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img.load()
+        return img
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Repository locations shared by the generator and asset scripts."""
+
+import os
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DRAFTS_DIR = os.path.dirname(SCRIPTS_DIR)
+REPO_ROOT = os.path.dirname(DRAFTS_DIR)
+
+# Local state: response cache, run manifests, hash caches
+CACHE_DIR = os.path.join(DRAFTS_DIR, ".cache")
+
+# Where the draft generators write; DRAFTS_OUTPUT_ROOT moves them elsewhere
+OUTPUT_ROOT = os.environ.get("DRAFTS_OUTPUT_ROOT") or DRAFTS_DIR
+MOCKUPS_DIR = os.path.join(OUTPUT_ROOT, "mockups")
+DRAFT_IMAGES_DIR = os.path.join(OUTPUT_ROOT, "images")
+VARIATIONS_DIR = os.path.join(OUTPUT_ROOT, "variations")
+
+APP_DIR = os.path.join(REPO_ROOT, "react-flow-app")
+APP_DATA_DIR = os.path.join(APP_DIR, "src", "data")
+PUBLIC_DIR = os.path.join(APP_DIR, "public")
+PUBLIC_IMAGES_DIR = os.path.join(PUBLIC_DIR, "assets", "images")
+
+
+def public_url(path: str) -> str:
+    """URL the app uses for a file under react-flow-app/public."""
+    return "/" + os.path.relpath(path, PUBLIC_DIR).replace(os.sep, "/")
+
+
+def public_path(url: str) -> str:
+    """File path for an app URL such as /assets/images/foo.jpg."""
+    return os.path.join(PUBLIC_DIR, *url.lstrip("/").split("/"))
+
+
+def repo_relative(path: str) -> str:
+    """Path relative to the repository root, with forward slashes."""
+    return os.path.relpath(os.path.abspath(path), REPO_ROOT).replace(os.sep, "/")
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""Retries, adaptive concurrency, hedging and circuit breaking for API calls.
+
+Resilience.call() wraps each generate_content request:
+
+    breaker   after a run of server errors or timeouts, stops sending for a
+              cooldown, then lets a single probe through
+    limiter   AIMD concurrency limit: +1 per window of successes, halved
+              on a 429
+    hedge     optionally, a call that outlives the p95 of recent latencies
+              gets a duplicate; whichever answers first wins
+    retry     retryable failures back off exponentially with full jitter,
+              or for as long as the server's retry hint asks
+
+Retryable means 408, 429, 5xx, timeouts and dropped connections. Anything
+else (a 400 for a bad prompt, say) fails the job at once.
+"""
+
+import asyncio
+import collections
+import contextlib
+import random
+import re
+import time
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BACKOFF_BASE = 2.0
+DEFAULT_BACKOFF_CAP = 60.0
+
+# Consecutive outage errors that open the breaker, and how long it stays open
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN = 30.0
+
+# Successful latencies kept for the hedge threshold, and how many are needed first
+LATENCY_WINDOW = 100
+MIN_HEDGE_SAMPLES = 10
+
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def error_status(exc: Exception):
+    """HTTP status of an API error, or None."""
+    code = getattr(exc, "code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_outage(exc: Exception) -> bool:
+    """True for errors that say the service is down rather than busy or refusing."""
+    # Imported here: httpx comes with the SDK and only matters once a call failed
+    import httpx
+
+    status = error_status(exc)
+    if status is not None:
+        return status >= 500
+    return isinstance(exc, (asyncio.TimeoutError, ConnectionError, httpx.TransportError))
+
+
+def is_retryable(exc: Exception) -> bool:
+    return error_status(exc) in RETRY_STATUSES or is_outage(exc)
+
+
+def describe(exc: Exception) -> str:
+    """Short label for an error: "429 RESOURCE_EXHAUSTED", or the exception type."""
+    status = error_status(exc)
+    if status is not None:
+        return f"{status} {getattr(exc, 'status', '') or ''}".strip()
+    return type(exc).__name__
+
+
+def _seconds(value) -> float:
+    """Parse "12", "1.5s" or "27s" into seconds; None if it is neither."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)s?\s*", str(value))
+    return float(match.group(1)) if match else None
+
+
+def retry_after(exc: Exception):
+    """Seconds the server asked us to wait, from Retry-After or a RetryInfo detail."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    if headers.get("retry-after"):
+        delay = _seconds(headers["retry-after"])
+        if delay is not None:
+            return delay
+
+    details = getattr(exc, "details", None)
+    error = details.get("error", {}) if isinstance(details, dict) else {}
+    for detail in error.get("details", ()):
+        if isinstance(detail, dict) and detail.get("@type", "").endswith("RetryInfo"):
+            return _seconds(detail.get("retryDelay", ""))
+    return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: random.Random) -> float:
+    """Full-jitter exponential backoff for the given 0-based retry number."""
+    return rng.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class _LoopCondition:
+    """An asyncio.Condition per event loop, so state can outlive one asyncio.run()."""
+
+    def __init__(self):
+        self._loop = None
+        self._cond = None
+
+    def get(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._cond = asyncio.Condition()
+        return self._cond
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that grows by one per window of successes and halves on a 429.
+
+    A 429 only halves the limit if its request was admitted after the last
+    decrease, so one burst of 429s from the same wave counts once.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1):
+        self.maximum = maximum
+        self.minimum = minimum
+        self.limit = maximum
+        self.in_flight = 0
+        self._successes = 0
+        self._admitted = 0
+        self._decreased_at = 0
+        self._cond = _LoopCondition()
+
+    async def acquire(self) -> int:
+        """Wait for a free slot. Returns a ticket for on_throttle()."""
+        async with self._cond.get():
+            await self._cond.get().wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            self._admitted += 1
+            return self._admitted
+
+    async def release(self):
+        async with self._cond.get():
+            self.in_flight -= 1
+            self._cond.get().notify_all()
+
+    def on_success(self):
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.maximum:
+            self.limit += 1
+            self._successes = 0
+
+    def on_throttle(self, ticket: int):
+        if ticket > self._decreased_at:
+            self.limit = max(self.minimum, self.limit // 2)
+            self._successes = 0
+            self._decreased_at = self._admitted
+
+
+class CircuitBreaker:
+    """Closed, open for a cooldown after `threshold` consecutive outage errors, then half-open.
+
+    While half-open a single probe is let through; its outcome closes or
+    reopens the breaker. Other callers wait rather than fail.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_BREAKER_THRESHOLD, cooldown: float = DEFAULT_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._open_until = 0.0
+        self._cond = _LoopCondition()
+
+    async def before_call(self):
+        """Wait until a call may be sent."""
+        async with self._cond.get():
+            while True:
+                if self.state == CLOSED:
+                    return
+                timeout = None
+                if self.state == OPEN:
+                    timeout = self._open_until - time.monotonic()
+                    if timeout <= 0:
+                        self.state = HALF_OPEN
+                        print("  Circuit half-open: probing the API")
+                        return
+                try:
+                    await asyncio.wait_for(self._cond.get().wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def record(self, outage: bool):
+        """Report a call's outcome; `outage` for server errors and timeouts."""
+        async with self._cond.get():
+            if not outage:
+                self.state = CLOSED
+                self.failures = 0
+            else:
+                self.failures += 1
+                if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.threshold):
+                    self.state = OPEN
+                    self.opened += 1
+                    self._open_until = time.monotonic() + self.cooldown
+                    print(f"  Circuit open after {self.failures} failures: pausing {self.cooldown:.0f}s")
+            self._cond.get().notify_all()
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.samples = collections.deque(maxlen=window)
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+
+    def p95(self):
+        """95th percentile, or None until there are enough samples."""
+        if len(self.samples) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+class Resilience:
+    """Shared retry, limiter, hedge and breaker state for one run."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_cap: float = DEFAULT_BACKOFF_CAP,
+        hedge: bool = False,
+        breaker_threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        breaker_cooldown: float = DEFAULT_BREAKER_COOLDOWN,
+        seed: int = None,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.hedge = hedge
+        self.limiter = AdaptiveLimiter(max_concurrency)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_cooldown)
+        self.latency = LatencyTracker()
+        self.rng = random.Random(seed)
+
+    async def call(self, send, trace=None, acquire=None):
+        """Await send() until it succeeds, retrying and hedging as configured.
+
+        `send` is a zero-argument coroutine function and may be called more
+        than once. `acquire`, if given, is awaited before each call, to take
+        its rate-limit token; that wait is not part of the call's latency.
+        Time spent queueing goes to the trace's rate_wait phase and time
+        between retries to its backoff phase. Of a hedged pair, only the
+        call that decided the attempt adds its token wait and request time.
+        """
+        for attempt in range(self.max_attempts):
+            with _phase(trace, "rate_wait"):
+                await self.breaker.before_call()
+                ticket = await self.limiter.acquire()
+            try:
+                result = await self._hedged(send, acquire, trace)
+            except Exception as exc:
+                error = exc
+            else:
+                self.limiter.on_success()
+                await self.breaker.record(outage=False)
+                return result
+            finally:
+                await self.limiter.release()
+
+            await self.breaker.record(outage=is_outage(error))
+            if error_status(error) == 429:
+                self.limiter.on_throttle(ticket)
+            if not is_retryable(error) or attempt == self.max_attempts - 1:
+                raise error
+
+            delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap, self.rng)
+            delay = max(delay, retry_after(error) or 0.0)
+            print(f"  Retrying in {delay:.1f}s after {describe(error)} (attempt {attempt + 1}/{self.max_attempts})")
+            with _phase(trace, "backoff"):
+                await asyncio.sleep(delay)
+
+    async def _timed(self, send, acquire, spent: dict, sent: asyncio.Event):
+        """acquire() then send(), filling `spent` with the seconds each took.
+
+        Latency is measured from the send, so rate-limit waits do not feed
+        the hedge threshold. `sent` is set once the request goes out.
+        """
+        started = time.monotonic()
+        if acquire:
+            await acquire()
+        sending = time.monotonic()
+        spent["rate_wait"] = sending - started
+        sent.set()
+        try:
+            result = await send()
+        finally:
+            spent["request"] = time.monotonic() - sending
+        self.latency.add(spent["request"])
+        return result
+
+    def _start(self, send, acquire, timings: dict) -> tuple:
+        spent = {}
+        sent = asyncio.Event()
+        task = asyncio.ensure_future(self._timed(send, acquire, spent, sent))
+        timings[task] = spent
+        return task, sent
+
+    async def _hedged(self, send, acquire, trace):
+        """send(), plus a duplicate if the first outlives the recent p95."""
+        timings = {}
+        first, sent = self._start(send, acquire, timings)
+        threshold = self.latency.p95() if self.hedge else None
+        if threshold is None:
+            try:
+                return await first
+            finally:
+                _add_phases(trace, timings[first])
+
+        pending = {first}
+        try:
+            # The hedge clock starts when the first request is sent, not while it waits for a token
+            waiting = asyncio.ensure_future(sent.wait())
+            await asyncio.wait({first, waiting}, return_when=asyncio.FIRST_COMPLETED)
+            waiting.cancel()
+            done, _ = await asyncio.wait(pending, timeout=threshold)
+            if not done:
+                if trace:
+                    trace.record["hedges"] += 1
+                pending.add(self._start(send, acquire, timings)[0])
+            failed = []
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        _add_phases(trace, timings[task])
+                        return task.result()
+                    failed.append(task)
+            _add_phases(trace, timings[failed[0]])
+            raise failed[0].exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def _phase(trace, name: str):
+    return trace.phase(name) if trace else contextlib.nullcontext()
+
+
+def _add_phases(trace, spent: dict):
+    """Add one call's token wait and request time to the trace."""
+    if trace:
+        for name, seconds in spent.items():
+            trace.add_phase(name, seconds)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Content-addressed on-disk cache for generate_content responses.
+
+Entries are keyed on a hash of the model name, the fully rendered prompt and
+the GenerateContentConfig, so an unchanged prompt resolves from disk with no
+API call. Each entry is a directory holding meta.json plus one file per image
+part. The cache is capped in size and evicts least recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from image_io import CHUNK_SIZE, extension_for_mime
+from paths import CACHE_DIR
+
+DEFAULT_CACHE_DIR = os.path.join(CACHE_DIR, "responses")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+
+def cache_key(model: str, prompt: str, config) -> str:
+    """Hash the inputs that determine a response."""
+    if hasattr(config, "model_dump"):
+        config = config.model_dump(mode="json", exclude_none=True)
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "config": config},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """LRU-capped directory of cached responses."""
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key: str):
+        """Return the cached parts for `key`, or None on a miss.
+
+        Parts are dicts with either "text", or "mime_type" and "path". Image
+        bytes are left on disk for the caller to stream, not read into memory.
+        """
+        entry = self._entry_dir(key)
+        meta_path = os.path.join(entry, "meta.json")
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        parts = []
+        for part in meta["parts"]:
+            if "file" in part:
+                path = os.path.join(entry, part["file"])
+                if not os.path.exists(path):
+                    return None
+                parts.append({"mime_type": part["mime_type"], "path": path})
+            else:
+                parts.append(part)
+
+        # Touch the entry so eviction sees it as recently used
+        os.utime(meta_path)
+        return parts
+
+    def put(self, key: str, parts: list, model: str = None):
+        """Store response parts under `key`, then evict down to the size cap."""
+        entry = self._entry_dir(key)
+        tmp_entry = f"{entry}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        os.makedirs(tmp_entry)
+
+        meta_parts = []
+        for i, part in enumerate(parts):
+            if "data" in part:
+                filename = f"part-{i}{extension_for_mime(part['mime_type'])}"
+                view = memoryview(part["data"])
+                with open(os.path.join(tmp_entry, filename), "wb") as f:
+                    for offset in range(0, len(view), CHUNK_SIZE):
+                        f.write(view[offset:offset + CHUNK_SIZE])
+                meta_parts.append({"mime_type": part["mime_type"], "file": filename})
+            else:
+                meta_parts.append({"text": part["text"]})
+
+        with open(os.path.join(tmp_entry, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"model": model, "created": time.time(), "parts": meta_parts}, f, indent=2)
+
+        # Swap the finished entry into place so readers never see a partial one
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp_entry, entry)
+        self.evict()
+
+    def entries(self) -> list:
+        """List (last_used, size, path) for every entry."""
+        found = []
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                meta_path = os.path.join(entry.path, "meta.json")
+                if ".tmp-" in entry.name or not os.path.exists(meta_path):
+                    continue
+                size = sum(f.stat().st_size for f in os.scandir(entry.path))
+                found.append((os.stat(meta_path).st_mtime, size, entry.path))
+        return found
+
+    def evict(self):
+        """Remove least recently used entries until under max_bytes."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
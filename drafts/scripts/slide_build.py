@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Incremental builds of slide images from the slide sources.
+
+Every slide image is a build target with named inputs: the slide's content
+as parsed from slides.ts, its scene direction, the shared character and
+style descriptions, the prompt template and the model settings. Each input
+is hashed and the hashes together give the target's fingerprint.
+
+drafts/data/slide_images.json records which fingerprint and input hashes
+each slide's current image was built from. A target is rebuilt only when
+its fingerprint changed or its image is gone, and the plan says which
+inputs changed. New images get fingerprinted filenames under
+react-flow-app/public/assets/images, and the slide's backgroundImage in
+slides.ts is pointed at them.
+"""
+
+import hashlib
+import json
+import os
+
+from paths import DRAFTS_DIR, PUBLIC_IMAGES_DIR, public_path, public_url
+from slide_sources import set_background_image
+
+DEFAULT_RECORD_PATH = os.path.join(DRAFTS_DIR, "data", "slide_images.json")
+
+RECORD_VERSION = 1
+
+# Fingerprint characters kept in output filenames
+FILENAME_DIGITS = 12
+
+
+def input_hash(value) -> str:
+    """Stable hash of a JSON-serialisable input."""
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def make_target(slide_id: str, inputs: dict, job: dict) -> dict:
+    """A build target for one slide image.
+
+    `job` is the generation job without its name and output path; those are
+    derived from the fingerprint so each set of inputs has its own file.
+    """
+    hashes = {name: input_hash(value) for name, value in inputs.items()}
+    fingerprint = input_hash(hashes)
+    name = f"{slide_id}_{fingerprint[:FILENAME_DIGITS]}"
+    return {
+        "slide_id": slide_id,
+        "inputs": hashes,
+        "fingerprint": fingerprint,
+        "job": dict(job, name=name, output_path=os.path.join(PUBLIC_IMAGES_DIR, f"{name}.jpg")),
+    }
+
+
+class BuildRecord:
+    """What each slide's current image was built from, keyed by slide id."""
+
+    def __init__(self, path: str = DEFAULT_RECORD_PATH):
+        self.path = path
+        self.slides = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == RECORD_VERSION:
+                self.slides = data["slides"]
+        except (OSError, ValueError):
+            pass
+
+    def stale_reasons(self, target: dict, image_url: str) -> list:
+        """Why a target needs building; empty when its image is current."""
+        entry = self.slides.get(target["slide_id"])
+        if not entry:
+            return ["never built"]
+        if image_url != entry["image"]:
+            return ["backgroundImage was changed by hand"]
+        if not os.path.exists(public_path(image_url)):
+            return ["image file missing"]
+        if entry["fingerprint"] == target["fingerprint"]:
+            return []
+        names = sorted(set(entry["inputs"]) | set(target["inputs"]))
+        return [f"{name} changed" for name in names if entry["inputs"].get(name) != target["inputs"].get(name)]
+
+    def mark_built(self, target: dict, image_url: str):
+        self.slides[target["slide_id"]] = {
+            "fingerprint": target["fingerprint"],
+            "image": image_url,
+            "inputs": target["inputs"],
+        }
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": RECORD_VERSION, "slides": self.slides}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+
+def plan(targets: list, slides: list, record: BuildRecord) -> list:
+    """(target, reasons) for every target that needs building, in slide order."""
+    images = {slide["id"]: slide.get("backgroundImage") for slide in slides}
+    stale = []
+    for target in targets:
+        reasons = record.stale_reasons(target, images.get(target["slide_id"]))
+        if reasons:
+            stale.append((target, reasons))
+    return stale
+
+
+def apply_results(results: list, targets: list, record: BuildRecord, source: str) -> str:
+    """Point slides at their new images and record them. Returns the new slides.ts text."""
+    by_name = {target["job"]["name"]: target for target in targets}
+    for result in results:
+        if not result["ok"]:
+            continue
+        target = by_name[result["name"]]
+        image_url = public_url(result["output_path"])
+        source = set_background_image(source, target["slide_id"], image_url)
+        record.mark_built(target, image_url)
+    return source
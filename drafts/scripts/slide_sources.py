@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Read and edit the slide definitions in react-flow-app/src/data/slides.ts.
+
+The slides array is a plain object literal (strings, arrays, nested objects,
+comments, trailing commas), so it is converted to JSON token by token rather
+than run through a TypeScript toolchain. Edits go back into the source text
+in place, one property at a time, so the file keeps its formatting.
+"""
+
+import json
+import os
+import re
+
+from paths import APP_DATA_DIR
+
+SLIDES_TS = os.path.join(APP_DATA_DIR, "slides.ts")
+
+# Prettier's printWidth for the app; longer properties wrap their value
+PRINT_WIDTH = 80
+
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+
+
+def _skip(source: str, i: int):
+    """End index of the string or comment starting at i, or None."""
+    if source.startswith("//", i):
+        end = source.find("\n", i)
+        return len(source) if end < 0 else end
+    if source.startswith("/*", i):
+        return source.index("*/", i + 2) + 2
+    if source[i] in "\"'`":
+        quote = source[i]
+        i += 1
+        while source[i] != quote:
+            i += 2 if source[i] == "\\" else 1
+        return i + 1
+    return None
+
+
+def _read_string(source: str, i: int) -> tuple:
+    """Decode the quoted string at i. Returns (value, end index)."""
+    quote = source[i]
+    if quote == "`":
+        raise ValueError(f"template literals are not supported (offset {i})")
+    chars = []
+    i += 1
+    while source[i] != quote:
+        char = source[i]
+        if char == "\\":
+            escaped = source[i + 1]
+            if escaped == "u":
+                chars.append(chr(int(source[i + 2:i + 6], 16)))
+                i += 6
+                continue
+            if escaped != "\n":
+                chars.append(_ESCAPES.get(escaped, escaped))
+            i += 2
+            continue
+        chars.append(char)
+        i += 1
+    return "".join(chars), i + 1
+
+
+def literal_to_json(literal: str) -> str:
+    """Convert a JavaScript object/array literal to JSON text."""
+    out = []
+    i = 0
+    while i < len(literal):
+        char = literal[i]
+        if char.isspace():
+            i += 1
+        elif literal.startswith(("//", "/*"), i):
+            i = _skip(literal, i)
+        elif char in "\"'`":
+            value, i = _read_string(literal, i)
+            out.append(json.dumps(value, ensure_ascii=False))
+        elif char in "]}":
+            if out and out[-1] == ",":
+                out.pop()
+            out.append(char)
+            i += 1
+        elif char in "[{:,":
+            out.append(char)
+            i += 1
+        else:
+            match = _NUMBER.match(literal, i) or _IDENTIFIER.match(literal, i)
+            if not match:
+                raise ValueError(f"unexpected {char!r} at offset {i}")
+            token = match.group()
+            i = match.end()
+            if token[0].isdigit() or token[0] == "-" or token in ("true", "false", "null"):
+                out.append(token)
+            elif literal[i:].lstrip().startswith(":"):
+                out.append(json.dumps(token))
+            else:
+                raise ValueError(f"unsupported expression {token!r} at offset {match.start()}")
+    return "".join(out)
+
+
+def _matching(source: str, start: int) -> int:
+    """Index just past the bracket that closes the one at `start`."""
+    depth = 0
+    i = start
+    while i < len(source):
+        end = _skip(source, i)
+        if end is not None:
+            i = end
+            continue
+        if source[i] in "[{":
+            depth += 1
+        elif source[i] in "]}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise ValueError(f"unbalanced bracket at offset {start}")
+
+
+def array_span(source: str, name: str) -> tuple:
+    """(start, end) of the array literal assigned to `export const name`."""
+    match = re.search(rf"export const {re.escape(name)}\b[^=]*=\s*\[", source)
+    if not match:
+        raise ValueError(f"no exported array named {name!r}")
+    start = match.end() - 1
+    return start, _matching(source, start)
+
+
+def object_span(source: str, name: str) -> tuple:
+    """(start, end) of the object literal assigned to `const name`, exported or not."""
+    match = re.search(rf"\bconst {re.escape(name)}\b[^=]*=\s*\{{", source)
+    if not match:
+        raise ValueError(f"no object named {name!r}")
+    start = match.end() - 1
+    return start, _matching(source, start)
+
+
+def object_spans(source: str, start: int, end: int) -> list:
+    """(start, end) of each object literal directly inside the array at start..end."""
+    spans = []
+    i = start + 1
+    while i < end - 1:
+        skipped = _skip(source, i)
+        if skipped is not None:
+            i = skipped
+        elif source[i] == "{":
+            close = _matching(source, i)
+            spans.append((i, close))
+            i = close
+        else:
+            i += 1
+    return spans
+
+
+def read_source(path: str = SLIDES_TS) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def parse_array(source: str, name: str) -> list:
+    """The exported array `name` as a list of dicts."""
+    start, end = array_span(source, name)
+    return json.loads(literal_to_json(source[start:end]))
+
+
+def parse_object(source: str, name: str) -> dict:
+    """The object literal assigned to `const name` as a dict."""
+    start, end = object_span(source, name)
+    return json.loads(literal_to_json(source[start:end]))
+
+
+def parse_slides(source: str) -> list:
+    """The `slides` array as a list of dicts."""
+    return parse_array(source, "slides")
+
+
+def load_slides(path: str = SLIDES_TS) -> list:
+    return parse_slides(read_source(path))
+
+
+def _slide_object(source: str, slide_id: str) -> tuple:
+    """(start, end, indent) of the slide object with this id."""
+    for start, end in object_spans(source, *array_span(source, "slides")):
+        match = re.search(r"^([ \t]*)id:\s*([\"'])(.*?)\2", source[start:end], re.M)
+        if match and match.group(3) == slide_id:
+            return start, end, match.group(1)
+    raise KeyError(slide_id)
+
+
+def _property_pattern(indent: str, name: str):
+    return re.compile(rf"^{indent}{name}:\s*([\"'])(?:\\.|(?!\1).)*\1,\n", re.M)
+
+
+def _format_property(indent: str, name: str, value: str) -> str:
+    line = f"{indent}{name}: {json.dumps(value, ensure_ascii=False)},"
+    if len(line) <= PRINT_WIDTH:
+        return line + "\n"
+    return f"{indent}{name}:\n{indent}  {json.dumps(value, ensure_ascii=False)},\n"
+
+
+def set_background_image(source: str, slide_id: str, url: str) -> str:
+    """Point a slide's backgroundImage at `url`, adding the property if missing."""
+    start, end, indent = _slide_object(source, slide_id)
+    body = source[start:end]
+    replacement = _format_property(indent, "backgroundImage", url)
+
+    match = _property_pattern(indent, "backgroundImage").search(body)
+    if match:
+        body = body[:match.start()] + replacement + body[match.end():]
+    else:
+        # New properties go after the subtitle, or the title if there is none
+        anchor = _property_pattern(indent, "subtitle").search(body) or _property_pattern(indent, "title").search(body)
+        if not anchor:
+            raise ValueError(f"{slide_id} has no title to place backgroundImage after")
+        body = body[:anchor.end()] + replacement + body[anchor.end():]
+
+    return source[:start] + body + source[end:]
+
+
+def write_source(source: str, path: str = SLIDES_TS):
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(source)
+    os.replace(tmp_path, path)
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""SQLite-backed store for slides, image variations and their prompts.
+
+Replaces read-modify-write of drafts/data/slides.json: slides and
+variations live in indexed tables, variations are appended one row at a
+time, and prompts are stored once each, deduplicated by hash. Paths are kept
+relative to the repository root. `export` regenerates slides.json in its
+existing shape for consumers that still read it.
+
+    python slide_store.py import                # slides.json -> slides.db
+    python slide_store.py export                # slides.db -> slides.json
+    python slide_store.py variations --section "Mental Models" --unapproved
+    python slide_store.py mark mental-models-mental-models-1 2 approved
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+from paths import DRAFTS_DIR, REPO_ROOT, repo_relative
+
+DEFAULT_DB_PATH = os.path.join(DRAFTS_DIR, "data", "slides.db")
+DEFAULT_JSON_PATH = os.path.join(DRAFTS_DIR, "data", "slides.json")
+
+# Checkout directory name in paths recorded on other machines
+REPO_NAME = "ai-talk-slides"
+
+# Variation review states
+GENERATED = "generated"
+ACCEPTED = "accepted"  # good enough to keep (variation_sweep.py), not selected
+APPROVED = "approved"
+REJECTED = "rejected"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS slides (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    section_title TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    subtitle TEXT NOT NULL DEFAULT '',
+    content_preview TEXT NOT NULL DEFAULT '',
+    full_text TEXT NOT NULL DEFAULT '',
+    has_image INTEGER NOT NULL DEFAULT 0,
+    current_image TEXT NOT NULL DEFAULT '',
+    last_prompt_id INTEGER REFERENCES prompts(id),
+    selected_variation INTEGER,  -- seq of the approved variation; slides.json holds its 0-based index
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS slides_section ON slides(section_title, position);
+CREATE INDEX IF NOT EXISTS slides_status ON slides(status);
+
+CREATE TABLE IF NOT EXISTS prompts (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL UNIQUE,
+    text TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS variations (
+    id INTEGER PRIMARY KEY,
+    slide_id TEXT NOT NULL REFERENCES slides(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    style TEXT NOT NULL DEFAULT '',
+    filename TEXT NOT NULL,
+    path TEXT NOT NULL,
+    url TEXT NOT NULL DEFAULT '',
+    prompt_id INTEGER REFERENCES prompts(id),
+    status TEXT NOT NULL DEFAULT 'generated',
+    created_at TEXT NOT NULL,
+    UNIQUE (slide_id, seq)
+);
+CREATE INDEX IF NOT EXISTS variations_style ON variations(style);
+CREATE INDEX IF NOT EXISTS variations_status ON variations(status, slide_id);
+"""
+
+SLIDE_FIELDS = (
+    "section_title", "title", "subtitle", "content_preview", "full_text",
+    "has_image", "current_image", "selected_variation", "status",
+)
+
+
+def now() -> str:
+    """Timestamp in the format slides.json already uses."""
+    return datetime.now().isoformat()
+
+
+def store_path(path: str) -> str:
+    """Repo-relative form of a path, including absolute paths from another checkout.
+
+    "/Users/.../ai-talk-slides/assets/x.jpg" becomes "assets/x.jpg".
+    """
+    if not path or not os.path.isabs(path):
+        return path
+    if path.startswith(REPO_ROOT + os.sep):
+        return repo_relative(path)
+    for name in (os.path.basename(REPO_ROOT), REPO_NAME):
+        marker = f"/{name}/"
+        if marker in path:
+            return path.split(marker, 1)[1]
+    return path
+
+
+class SlideStore:
+    """Slides, variations and prompts in one SQLite file."""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def prompt_id(self, text: str):
+        """Id of a stored prompt, inserting it on first use."""
+        if text is None:
+            return None
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self.db.execute("INSERT OR IGNORE INTO prompts (hash, text) VALUES (?, ?)", (digest, text))
+        return self.db.execute("SELECT id FROM prompts WHERE hash = ?", (digest,)).fetchone()[0]
+
+    def upsert_slide(self, slide: dict):
+        """Insert a slide, or update the given fields of an existing one."""
+        with self.db:
+            existing = self.db.execute("SELECT 1 FROM slides WHERE id = ?", (slide["id"],)).fetchone()
+            fields = {k: slide[k] for k in SLIDE_FIELDS if k in slide}
+            if "current_image" in fields:
+                fields["current_image"] = store_path(fields["current_image"])
+            if "last_prompt" in slide:
+                fields["last_prompt_id"] = self.prompt_id(slide["last_prompt"])
+            fields["updated_at"] = slide.get("updated_at") or now()
+
+            if existing:
+                if "index" in slide:
+                    fields["position"] = slide["index"]
+                assignments = ", ".join(f"{k} = ?" for k in fields)
+                self.db.execute(
+                    f"UPDATE slides SET {assignments} WHERE id = ?", (*fields.values(), slide["id"])
+                )
+            else:
+                fields.update(
+                    id=slide["id"],
+                    position=slide.get("index", self._next_position()),
+                    status=slide.get("status", "needs_image"),
+                    created_at=slide.get("created_at") or fields["updated_at"],
+                )
+                columns = ", ".join(fields)
+                placeholders = ", ".join("?" for _ in fields)
+                self.db.execute(f"INSERT INTO slides ({columns}) VALUES ({placeholders})", tuple(fields.values()))
+
+    def _next_position(self) -> int:
+        return self.db.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM slides").fetchone()[0]
+
+    def append_variation(self, slide_id: str, filepath: str, style: str = "", prompt: str = None,
+                         url: str = "", status: str = GENERATED, created_at: str = None) -> int:
+        """Append a variation to a slide and return its 1-based number."""
+        with self.db:
+            seq = self.db.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM variations WHERE slide_id = ?", (slide_id,)
+            ).fetchone()[0]
+            timestamp = created_at or now()
+            self.db.execute(
+                "INSERT INTO variations (slide_id, seq, style, filename, path, url, prompt_id, status, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (slide_id, seq, style, os.path.basename(filepath), store_path(filepath), url,
+                 self.prompt_id(prompt), status, timestamp),
+            )
+            self.db.execute(
+                "UPDATE slides SET status = 'variations_ready', updated_at = ?"
+                " WHERE id = ? AND status IN ('needs_image', 'generating')",
+                (timestamp, slide_id),
+            )
+        return seq
+
+    def select_variation(self, slide_id: str, seq: int):
+        """Approve one variation of a slide; its other approved variations revert to generated.
+
+        Raises ValueError if the slide has no such variation.
+        """
+        with self.db:
+            self.db.execute(
+                "UPDATE variations SET status = ? WHERE slide_id = ? AND status = ? AND seq != ?",
+                (GENERATED, slide_id, APPROVED, seq),
+            )
+            self._set_status(slide_id, seq, APPROVED)
+            self.db.execute(
+                "UPDATE slides SET selected_variation = ?, updated_at = ? WHERE id = ?", (seq, now(), slide_id)
+            )
+
+    def set_variation_status(self, slide_id: str, seq: int, status: str):
+        """Set a variation's status without selecting it; use select_variation() to approve.
+
+        Moving the selected variation off approved clears the selection.
+        Raises ValueError if the slide has no such variation.
+        """
+        with self.db:
+            self._set_status(slide_id, seq, status)
+            if status != APPROVED:
+                self.db.execute(
+                    "UPDATE slides SET selected_variation = NULL, updated_at = ?"
+                    " WHERE id = ? AND selected_variation = ?",
+                    (now(), slide_id, seq),
+                )
+
+    def _set_status(self, slide_id: str, seq: int, status: str):
+        cursor = self.db.execute(
+            "UPDATE variations SET status = ? WHERE slide_id = ? AND seq = ?", (status, slide_id, seq)
+        )
+        if cursor.rowcount == 0:
+            raise ValueError(f"{slide_id} has no variation #{seq}")
+
+    def slides(self, section: str = None, status: str = None) -> list:
+        """Slides in presentation order, optionally filtered."""
+        where, params = self._where(("s.section_title", section), ("s.status", status))
+        return self.db.execute(
+            "SELECT s.*, p.text AS last_prompt FROM slides s"
+            f" LEFT JOIN prompts p ON p.id = s.last_prompt_id{where} ORDER BY s.position",
+            params,
+        ).fetchall()
+
+    def variations(self, slide_id: str = None, section: str = None, style: str = None,
+                   status: str = None, unapproved: bool = False) -> list:
+        """Variations joined with their slide and prompt, in slide then variation order."""
+        where, params = self._where(
+            ("v.slide_id", slide_id), ("s.section_title", section), ("v.style", style), ("v.status", status)
+        )
+        if unapproved:
+            where += (" AND" if where else " WHERE") + " v.status != ?"
+            params.append(APPROVED)
+        return self.db.execute(
+            "SELECT v.*, s.section_title, p.text AS prompt FROM variations v"
+            " JOIN slides s ON s.id = v.slide_id"
+            f" LEFT JOIN prompts p ON p.id = v.prompt_id{where}"
+            " ORDER BY s.position, v.seq",
+            params,
+        ).fetchall()
+
+    @staticmethod
+    def _where(*filters):
+        clauses = [f"{column} = ?" for column, value in filters if value is not None]
+        params = [value for _, value in filters if value is not None]
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def import_json(self, path: str = DEFAULT_JSON_PATH) -> int:
+        """Load slides.json into the store, replacing slides with the same ids."""
+        with open(path, encoding="utf-8") as f:
+            slides = json.load(f)
+        with self.db:
+            for slide in slides:
+                self.db.execute("DELETE FROM slides WHERE id = ?", (slide["id"],))
+        for slide in slides:
+            # selected_variation is set below, once the variation it points at exists
+            self.upsert_slide({k: v for k, v in slide.items() if k != "selected_variation"})
+            for variation in slide.get("variations", []):
+                self.append_variation(
+                    slide["id"], variation.get("filepath") or variation["filename"],
+                    style=variation.get("style", ""), prompt=variation.get("prompt"),
+                    url=variation.get("url", ""), created_at=slide.get("updated_at"),
+                )
+            if slide.get("selected_variation") is not None:
+                self.select_variation(slide["id"], slide["selected_variation"] + 1)
+            # Importing should not bump timestamps or advance status
+            self.upsert_slide({k: slide[k] for k in ("id", "status", "updated_at") if k in slide})
+        return len(slides)
+
+    def export_json(self, path: str = DEFAULT_JSON_PATH) -> int:
+        """Regenerate slides.json in its existing shape. Returns the slide count."""
+        variations = {}
+        for row in self.variations():
+            variations.setdefault(row["slide_id"], []).append({
+                "filepath": row["path"],
+                "filename": row["filename"],
+                "style": row["style"],
+                "prompt": row["prompt"],
+                "url": row["url"],
+            })
+
+        slides = []
+        for row in self.slides():
+            slide = {
+                "id": row["id"],
+                "index": row["position"],
+                "section_title": row["section_title"],
+                "title": row["title"],
+                "subtitle": row["subtitle"],
+                "content_preview": row["content_preview"],
+                "full_text": row["full_text"],
+                "has_image": bool(row["has_image"]),
+                "current_image": row["current_image"],
+            }
+            slide["variations"] = variations.get(row["id"], [])
+            slide.update(
+                selected_variation=None if row["selected_variation"] is None else row["selected_variation"] - 1,
+                status=row["status"],
+                created_at=row["created_at"],
+                updated_at=row["updated_at"],
+            )
+            if row["last_prompt"] is not None:
+                slide["last_prompt"] = row["last_prompt"]
+            slides.append(slide)
+
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(slides, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return len(slides)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="store location (default: drafts/data/slides.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("import", "load slides.json into the store"),
+                            ("export", "regenerate slides.json from the store")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--json", default=DEFAULT_JSON_PATH, help="slides.json location")
+
+    query = commands.add_parser("variations", help="list variations")
+    query.add_argument("--slide")
+    query.add_argument("--section")
+    query.add_argument("--style")
+    query.add_argument("--status", choices=(GENERATED, ACCEPTED, APPROVED, REJECTED))
+    query.add_argument("--unapproved", action="store_true", help="exclude approved variations")
+
+    mark = commands.add_parser("mark", help="set a variation's status")
+    mark.add_argument("slide")
+    mark.add_argument("seq", type=int, help="variation number, as listed by `variations`")
+    mark.add_argument("status", choices=(GENERATED, ACCEPTED, APPROVED, REJECTED))
+
+    args = parser.parse_args()
+    started = time.monotonic()
+
+    with SlideStore(args.db) as store:
+        if args.command == "import":
+            count = store.import_json(args.json)
+            print(f"Imported {count} slides into {repo_relative(store.path)}")
+        elif args.command == "export":
+            count = store.export_json(args.json)
+            print(f"Exported {count} slides to {repo_relative(args.json)}")
+        elif args.command == "mark":
+            try:
+                if args.status == APPROVED:
+                    store.select_variation(args.slide, args.seq)
+                else:
+                    store.set_variation_status(args.slide, args.seq, args.status)
+            except ValueError as e:
+                parser.error(str(e))
+            print(f"{args.slide} #{args.seq} marked {args.status}")
+        else:
+            rows = store.variations(args.slide, args.section, args.style, args.status, args.unapproved)
+            for row in rows:
+                print(f"{row['slide_id']} #{row['seq']} [{row['status']}] {row['style']}: {row['path']}")
+            print(f"\n{len(rows)} variations in {time.monotonic() - started:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""One entry point for the image generators and asset stages.
+
+    python talk.py generate technical --dry-run
+    python talk.py generate mockups --want 4
+    python talk.py sweep --want 2 --budget 6
+    python talk.py derive                      # every asset stage, in order
+    python talk.py derive atlases --contact-sheet ../mockups
+    python talk.py dedupe --query some.jpg
+    python talk.py bench --startup
+    python talk.py report mockups
+
+Each command runs an existing script's main() with the remaining
+arguments, so `talk.py sweep --help` lists variation_sweep.py's options.
+A script is imported only once its command is chosen, and the Gemini SDK
+only when a request is about to be sent, so dry runs, reports and the
+local asset stages need no API key. Commands that never call the API add
+at most STARTUP_BUDGET_MS to a bare interpreter's start-up (measured by
+`talk.py bench --startup`).
+
+--output-root moves everything the generators write, which otherwise goes
+under drafts/ (DRAFTS_OUTPUT_ROOT does the same from the environment).
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+# Cold-start time commands that never call the API may add to a bare
+# interpreter's, in milliseconds
+STARTUP_BUDGET_MS = 50
+
+GENERATORS = {
+    "technical": "generate_technical_slides",
+    "mockups": "generate_mockups",
+    "metro": "generate_metro_mockup",
+    "titles": "generate_title_images",
+}
+
+# Asset stages in dependency order: the preload manifest weighs derivatives
+# and lists atlases, and atlases reuse the placeholder URL scan
+STAGES = {
+    "derivatives": "build_image_derivatives",
+    "placeholders": "build_image_placeholders",
+    "atlases": "build_image_atlases",
+    "preload": "build_preload_manifest",
+}
+
+# command: (module, or a {name: module} table chosen by the next argument; help)
+COMMANDS = {
+    "generate": (GENERATORS, "generate images with Gemini"),
+    "sweep": ("variation_sweep", "slide x style x seed variation sweep"),
+    "derive": (STAGES, "build derivatives, placeholders, atlases and the preload manifest"),
+    "dedupe": ("image_index", "perceptual-hash index and duplicate report"),
+    "bench": ("bench_generation", "benchmark the engine against the fake server"),
+    "report": ("telemetry", "phase report for recorded generation runs"),
+}
+
+# Commands that may send requests to the API
+API_COMMANDS = ("generate", "sweep", "bench")
+
+
+def run_module(module_name: str, prog: str, args: list):
+    """Import a script and call its main() as if run with `args`."""
+    module = importlib.import_module(module_name)
+    saved = sys.argv
+    sys.argv = [prog, *args]
+    try:
+        module.main()
+    finally:
+        sys.argv = saved
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        epilog="commands:\n" + "\n".join(
+            f"  {name:<10}{help_text}"
+            + (f" ({', '.join(target)})" if isinstance(target, dict) else "")
+            for name, (target, help_text) in COMMANDS.items()
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--output-root", help="write generated drafts here instead of drafts/")
+    parser.add_argument("command", choices=list(COMMANDS), metavar="COMMAND", help="one of the commands below")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the command")
+    args = parser.parse_args()
+
+    if args.output_root:
+        # Read by paths.py, which no command has imported yet
+        os.environ["DRAFTS_OUTPUT_ROOT"] = os.path.abspath(args.output_root)
+
+    target, _ = COMMANDS[args.command]
+    rest = args.args
+    if not isinstance(target, dict):
+        run_module(target, f"talk.py {args.command}", rest)
+        return
+
+    if rest and rest[0] in target:
+        run_module(target[rest[0]], f"talk.py {args.command} {rest[0]}", rest[1:])
+    elif args.command == "derive" and not rest:
+        # Every stage with its defaults; options go after a stage name
+        for stage, module_name in STAGES.items():
+            print(f"\n### {stage}")
+            run_module(module_name, f"talk.py derive {stage}", [])
+    else:
+        parser.error(f"{args.command} needs one of: {', '.join(target)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""Per-request telemetry for the generation engine.
+
+Each job gets a RequestTrace that times its phases:
+
+    cache       response cache lookup and copy-out
+    rate_wait   waiting on the token bucket (quota), the concurrency limit
+                or an open circuit breaker
+    backoff     sleeping between retries
+    request     generate_content round trip: network, server-side generation
+                and the SDK's JSON/base64 decoding
+    parse       flattening the response into parts
+    save        writing the image to disk
+
+Finished traces are appended to a JSONL file, one record per job, and can be
+dumped as Prometheus text format. summarize() totals the phases so a run can
+be labelled quota-bound, latency-bound or I/O-bound.
+
+Run as a script, it reports on recorded traces: the latest run of every
+generator by default, or the named runs or trace files.
+
+    python telemetry.py
+    python telemetry.py mockups --all-runs
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+from job_manifest import DEFAULT_RUNS_DIR
+
+PHASES = ("cache", "rate_wait", "backoff", "request", "parse", "save")
+
+# Which phase dominating a run makes it bound by what
+BOUND_BY = {
+    "rate_wait": "quota-bound",
+    "backoff": "error-bound",
+    "request": "latency-bound",
+    "parse": "CPU-bound",
+    "save": "I/O-bound",
+    "cache": "I/O-bound",
+}
+
+
+def default_trace_path(run_name: str) -> str:
+    """Trace location for a named run, next to its job manifest."""
+    return os.path.join(DEFAULT_RUNS_DIR, f"{run_name}.trace.jsonl")
+
+
+class RequestTrace:
+    """Timings and outcome of one job."""
+
+    def __init__(self, name: str, model: str):
+        self.record = {
+            "name": name,
+            "model": model,
+            "started_at": time.time(),
+            "phases": {},
+            "attempts": 0,
+            "hedges": 0,
+            "response_bytes": 0,
+            "outcome": None,
+            "error": None,
+        }
+        self._started = time.monotonic()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block and add it to the named phase."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.monotonic() - started)
+
+    def add_phase(self, name: str, seconds: float):
+        """Add time measured elsewhere to the named phase."""
+        phases = self.record["phases"]
+        phases[name] = phases.get(name, 0.0) + seconds
+
+    def finish(self, outcome: str, **fields) -> dict:
+        """Close the trace with its outcome (ok, cached, skipped, failed)."""
+        self.record.update(fields, outcome=outcome, total=time.monotonic() - self._started)
+        return self.record
+
+
+class Telemetry:
+    """Collects finished traces and writes them to a JSONL trace file."""
+
+    def __init__(self, trace_path: str = None, metrics_path: str = None):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.trace_path = trace_path
+        self.metrics_path = metrics_path
+        self.records = []
+        self._trace_file = None
+        if trace_path:
+            os.makedirs(os.path.dirname(os.path.abspath(trace_path)), exist_ok=True)
+            self._trace_file = open(trace_path, "a", encoding="utf-8")
+
+    def add(self, record: dict):
+        """Keep a finished record and append it to the trace file."""
+        record = dict(record, run_id=self.run_id)
+        self.records.append(record)
+        if self._trace_file:
+            self._trace_file.write(json.dumps(record) + "\n")
+            self._trace_file.flush()
+
+    def close(self):
+        """Close the trace file and write the Prometheus dump, if configured."""
+        if self._trace_file:
+            self._trace_file.close()
+            self._trace_file = None
+        if self.metrics_path:
+            write_prometheus(self.records, self.metrics_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def summarize(records: list) -> dict:
+    """Totals per phase and outcome, and what bound the run."""
+    phase_totals = {phase: 0.0 for phase in PHASES}
+    outcomes = {}
+    for record in records:
+        outcomes[record["outcome"]] = outcomes.get(record["outcome"], 0) + 1
+        for phase, seconds in record["phases"].items():
+            phase_totals[phase] = phase_totals.get(phase, 0.0) + seconds
+
+    busy = sum(phase_totals.values())
+    dominant = max(phase_totals, key=phase_totals.get) if busy else None
+    return {
+        "requests": len(records),
+        "outcomes": outcomes,
+        "attempts": sum(r["attempts"] for r in records),
+        "hedges": sum(r.get("hedges", 0) for r in records),
+        "response_bytes": sum(r["response_bytes"] for r in records),
+        "phase_seconds": phase_totals,
+        "phase_share": {phase: (s / busy if busy else 0.0) for phase, s in phase_totals.items()},
+        "bound_by": BOUND_BY.get(dominant, "idle"),
+    }
+
+
+def print_report(records: list):
+    """Print the phase breakdown for a run."""
+    summary = summarize(records)
+    if not summary["requests"]:
+        return
+    print(f"\nTime by phase ({summary['bound_by']}):")
+    for phase in PHASES:
+        seconds = summary["phase_seconds"][phase]
+        if seconds:
+            print(f"  {phase:<10} {seconds:8.1f}s  {summary['phase_share'][phase]:6.1%}")
+    outcomes = ", ".join(f"{count} {outcome}" for outcome, count in sorted(summary["outcomes"].items()))
+    print(f"Requests: {outcomes}; {summary['attempts']} API attempts ({summary['hedges']} hedged), "
+          f"{summary['response_bytes'] / 1024 ** 2:.1f} MB received")
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def write_prometheus(records: list, path: str):
+    """Write run metrics in Prometheus text exposition format."""
+    outcomes = {}
+    phases = {}
+    bytes_by_model = {}
+    attempts = 0
+    for record in records:
+        key = (record["model"], record["outcome"])
+        outcomes[key] = outcomes.get(key, 0) + 1
+        bytes_by_model[record["model"]] = bytes_by_model.get(record["model"], 0) + record["response_bytes"]
+        attempts += record["attempts"]
+        for phase, seconds in record["phases"].items():
+            total, count = phases.get(phase, (0.0, 0))
+            phases[phase] = (total + seconds, count + 1)
+
+    lines = [
+        "# HELP gemini_generation_requests_total Jobs finished, by model and outcome.",
+        "# TYPE gemini_generation_requests_total counter",
+    ]
+    for (model, outcome), count in sorted(outcomes.items()):
+        lines.append(f'gemini_generation_requests_total{{model="{_escape(model)}",outcome="{_escape(outcome)}"}} {count}')
+
+    lines += [
+        "# HELP gemini_generation_attempts_total generate_content calls made, including retries.",
+        "# TYPE gemini_generation_attempts_total counter",
+        f"gemini_generation_attempts_total {attempts}",
+        "# HELP gemini_generation_response_bytes_total Image bytes received, by model.",
+        "# TYPE gemini_generation_response_bytes_total counter",
+    ]
+    for model, size in sorted(bytes_by_model.items()):
+        lines.append(f'gemini_generation_response_bytes_total{{model="{_escape(model)}"}} {size}')
+
+    lines += [
+        "# HELP gemini_generation_phase_seconds Time spent per job phase.",
+        "# TYPE gemini_generation_phase_seconds summary",
+    ]
+    for phase, (total, count) in sorted(phases.items()):
+        lines.append(f'gemini_generation_phase_seconds_sum{{phase="{phase}"}} {total:.6f}')
+        lines.append(f'gemini_generation_phase_seconds_count{{phase="{phase}"}} {count}')
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+
+def load_trace(path: str, all_runs: bool = False) -> list:
+    """Records from a trace file; only the last run's unless `all_runs`."""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                records.append(json.loads(line))
+    if records and not all_runs:
+        last = records[-1].get("run_id")
+        records = [r for r in records if r.get("run_id") == last]
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "traces", nargs="*", metavar="RUN",
+        help="run names (e.g. mockups) or trace files (default: every run in drafts/.cache/runs)",
+    )
+    parser.add_argument("--all-runs", action="store_true", help="include every run in each trace, not just the last")
+    parser.add_argument("--metrics", metavar="PATH", help="also write the records in Prometheus text format")
+    args = parser.parse_args()
+
+    paths = [
+        trace if os.path.exists(trace) else default_trace_path(trace) for trace in args.traces
+    ] or sorted(glob.glob(os.path.join(DEFAULT_RUNS_DIR, "*.trace.jsonl")))
+    if not paths:
+        print(f"No traces in {DEFAULT_RUNS_DIR}")
+        return
+
+    everything = []
+    for path in paths:
+        name = os.path.basename(path).removesuffix(".trace.jsonl")
+        if not os.path.exists(path):
+            print(f"{name}: no trace at {path}")
+            continue
+        records = load_trace(path, args.all_runs)
+        everything += records
+        started = min((r["started_at"] for r in records), default=None)
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(started)) if started else "never"
+        print("=" * 60)
+        print(f"{name}: {len(records)} requests, {'all runs' if args.all_runs else 'last run'} ({when})")
+        print_report(records)
+
+    if args.metrics:
+        write_prometheus(everything, args.metrics)
+
+
+if __name__ == "__main__":
+    main()
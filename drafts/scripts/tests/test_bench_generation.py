@@ -0,0 +1,13 @@
+from bench_generation import percentile
+
+
+def test_percentile_is_nearest_rank():
+    values = [5, 1, 4, 2, 3]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 80) == 4
+    assert percentile(values, 81) == 5
+    assert percentile(values, 100) == 5
+    assert percentile(values, 0) == 1
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile([7.5], 99) == 7.5
+    assert percentile([], 50) == 0.0
@@ -0,0 +1,52 @@
+import itertools
+
+import pytest
+
+from build_image_atlases import pack_shelves
+
+
+def _overlaps(a, b):
+    (ax, ay, aw, ah), (bx, by, bw, bh) = a, b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def _check(sizes, placements, page_width, page_height, padding=0):
+    assert len(placements) == len(sizes)
+    boxes = {}
+    for (width, height), (page, x, y) in zip(sizes, placements):
+        assert x + width + padding <= page_width and y + height + padding <= page_height
+        boxes.setdefault(page, []).append((x, y, width + padding, height + padding))
+    for page in boxes.values():
+        for a, b in itertools.combinations(page, 2):
+            assert not _overlaps(a, b)
+    return boxes
+
+
+def test_packs_without_overlap_tallest_first():
+    sizes = [(30, 10), (50, 40), (20, 40), (60, 25), (10, 10), (45, 30), (35, 20)]
+    placements = pack_shelves(sizes, 120, 120, padding=2)
+    boxes = _check(sizes, placements, 120, 120, padding=2)
+    assert len(boxes) == 1
+    # The tallest boxes open the first shelf
+    assert placements[1][1:] == (0, 0)
+    assert placements[2][2] == 0
+
+
+def test_spills_onto_new_pages():
+    sizes = [(60, 60)] * 5
+    placements = pack_shelves(sizes, 100, 100)
+    assert [page for page, _, _ in placements] == [0, 1, 2, 3, 4]
+    _check(sizes, placements, 100, 100)
+
+
+def test_keep_order_flows_left_to_right():
+    sizes = [(40, 30), (40, 20), (40, 10), (40, 10), (10, 40)]
+    placements = pack_shelves(sizes, 100, 100, keep_order=True)
+    # A shelf is as tall as the box that opened it; a taller box opens the next one
+    assert placements == [(0, 0, 0), (0, 40, 0), (0, 0, 30), (0, 40, 30), (0, 0, 40)]
+    _check(sizes, placements, 100, 100)
+
+
+def test_box_larger_than_a_page_is_an_error():
+    with pytest.raises(ValueError, match="does not fit"):
+        pack_shelves([(90, 10)], 100, 100, padding=20)
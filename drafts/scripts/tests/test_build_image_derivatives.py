@@ -0,0 +1,34 @@
+import os
+
+from PIL import Image
+
+from build_image_derivatives import build_all
+
+
+def _files(root):
+    return sorted(
+        os.path.relpath(os.path.join(dirpath, name), root) for dirpath, _, names in os.walk(root) for name in names
+    )
+
+
+def test_rebuild_prunes_derivatives_of_removed_sources(tmp_path):
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    for name in ("a", "b"):
+        Image.new("RGB", (128, 72), "teal").save(images_dir / f"{name}.jpg")
+    output_dir = tmp_path / "derivatives"
+    options = dict(images_dir=str(images_dir), output_dir=str(output_dir),
+                   manifest_path=str(tmp_path / "manifest.json"), widths=(64,), formats=["webp"], workers=1)
+
+    build_all(**options)
+    assert _files(output_dir) == ["a/thumb.webp", "a/w64.webp", "b/thumb.webp", "b/w64.webp"]
+
+    os.remove(images_dir / "b.jpg")
+    (output_dir / "a" / "w9999.webp").write_bytes(b"stale")
+    summary = build_all(**options)
+    assert summary["pruned"] == 3
+    assert _files(output_dir) == ["a/thumb.webp", "a/w64.webp"]
+
+    (output_dir / "a" / "w9999.webp").write_bytes(b"stale")
+    build_all(**options, prune=False)
+    assert "a/w9999.webp" in _files(output_dir)
@@ -0,0 +1,36 @@
+from build_preload_manifest import ahead_of, next_links
+
+SECTIONS = [{"id": "intro"}, {"id": "core"}, {"id": "end"}]
+SLIDES = [
+    {"id": "a1", "sectionId": "intro"},
+    {"id": "a2", "sectionId": "intro"},
+    {"id": "b1", "sectionId": "core"},
+    {"id": "b2", "sectionId": "core"},
+    {"id": "c1", "sectionId": "end"},
+    {"id": "x1", "sectionId": "unlisted"},
+]
+CONNECTIONS = {"intro": {"next": ["core", "end"]}, "core": {"next": ["end"]}}
+
+
+def test_next_follows_sections_then_primary_successor():
+    links = next_links(SECTIONS, SLIDES, CONNECTIONS)
+    assert links == {"a1": "a2", "a2": "b1", "b1": "b2", "b2": "c1", "c1": None}
+
+
+def test_section_without_slides_ends_the_track():
+    links = next_links(SECTIONS, SLIDES, {"intro": {"next": ["empty"]}})
+    assert links["a2"] is None
+
+
+def test_ahead_of_walks_the_links():
+    links = next_links(SECTIONS, SLIDES, CONNECTIONS)
+    assert ahead_of("a1", links, 3) == ["a2", "b1", "b2"]
+    assert ahead_of("b2", links, 3) == ["c1"]
+    assert ahead_of("c1", links, 3) == []
+    assert ahead_of("missing", links, 3) == []
+
+
+def test_ahead_of_stops_at_a_cycle():
+    links = {"a": "b", "b": "c", "c": "a"}
+    assert ahead_of("a", links, 5) == ["b", "c"]
+    assert ahead_of("a", {"a": "b", "b": "b"}, 5) == ["b"]
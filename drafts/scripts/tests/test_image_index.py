@@ -0,0 +1,20 @@
+from PIL import Image
+
+from image_index import ImageIndex
+from paths import repo_relative
+
+
+def test_update_skips_unreadable_images(tmp_path, capsys):
+    good = tmp_path / "good.jpg"
+    Image.new("RGB", (64, 36), "teal").save(good)
+    broken = tmp_path / "broken.jpg"
+    broken.write_bytes(b"not a jpeg")
+    index = ImageIndex(str(tmp_path / "index.json"))
+
+    hashed = index.update([str(good), str(broken), str(tmp_path / "gone.jpg")], workers=1)
+
+    assert hashed == 1
+    assert list(index.images) == [repo_relative(str(good))]
+    out = capsys.readouterr().out
+    assert "unreadable image" in out and "broken.jpg" in out
+    assert "gone.jpg" in out
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from resilience import CLOSED, HALF_OPEN, OPEN, AdaptiveLimiter, CircuitBreaker, Resilience, retry_after
+from telemetry import RequestTrace
+
+
+def test_throttles_from_one_wave_halve_the_limit_once():
+    limiter = AdaptiveLimiter(8)
+
+    async def admit(count):
+        tickets = [await limiter.acquire() for _ in range(count)]
+        for _ in tickets:
+            await limiter.release()
+        return tickets
+
+    first_wave = asyncio.run(admit(3))
+    limiter.on_throttle(first_wave[0])
+    assert limiter.limit == 4
+    # Admitted before the decrease: same burst, no further cut
+    limiter.on_throttle(first_wave[2])
+    assert limiter.limit == 4
+
+    (later,) = asyncio.run(admit(1))
+    limiter.on_throttle(later)
+    assert limiter.limit == 2
+    limiter.on_throttle(asyncio.run(admit(1))[0])
+    limiter.on_throttle(asyncio.run(admit(1))[0])
+    assert limiter.limit == 1
+
+
+def test_limit_grows_by_one_per_window_of_successes():
+    limiter = AdaptiveLimiter(4)
+    limiter.limit = 2
+    limiter.on_success()
+    assert limiter.limit == 2
+    limiter.on_success()
+    assert limiter.limit == 3
+    for _ in range(3):
+        limiter.on_success()
+    assert limiter.limit == 4
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.limit == 4
+
+
+def test_breaker_opens_probes_and_closes():
+    breaker = CircuitBreaker(threshold=2, cooldown=0.05)
+
+    async def scenario():
+        await breaker.record(outage=True)
+        assert breaker.state == CLOSED
+        await breaker.record(outage=True)
+        assert breaker.state == OPEN
+
+        started = time.monotonic()
+        await breaker.before_call()
+        assert breaker.state == HALF_OPEN
+        assert time.monotonic() - started >= 0.04
+
+        # A failed probe reopens at once
+        await breaker.record(outage=True)
+        assert breaker.state == OPEN
+        assert breaker.opened == 2
+
+        await breaker.before_call()
+        await breaker.record(outage=False)
+        assert breaker.state == CLOSED
+        assert breaker.failures == 0
+
+    asyncio.run(scenario())
+
+
+def _api_error(headers=None, details=None):
+    return SimpleNamespace(response=SimpleNamespace(headers=headers or {}), details=details)
+
+
+def test_retry_after_reads_header_then_retry_info():
+    assert retry_after(_api_error({"retry-after": "7"})) == 7.0
+    assert retry_after(_api_error({"retry-after": "1.5s"})) == 1.5
+    retry_info = {"error": {"details": [
+        {"@type": "type.googleapis.com/google.rpc.ErrorInfo"},
+        {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "27s"},
+    ]}}
+    assert retry_after(_api_error(details=retry_info)) == 27.0
+    # An unparseable header falls through to the body
+    assert retry_after(_api_error({"retry-after": "Wed, 21 Oct 2026 07:28:00 GMT"}, retry_info)) == 27.0
+    assert retry_after(_api_error()) is None
+    assert retry_after(ValueError("no response")) is None
+
+
+def test_hedged_pair_records_only_the_winner():
+    resilience = Resilience(4, hedge=True)
+    for _ in range(10):
+        resilience.latency.add(0.01)
+    calls = []
+
+    async def send():
+        calls.append(len(calls))
+        # The first call stalls; its hedge answers quickly
+        await asyncio.sleep(0.5 if len(calls) == 1 else 0.02)
+        return len(calls)
+
+    trace = RequestTrace("job", "model")
+    result = asyncio.run(resilience.call(send, trace))
+
+    assert result == 2
+    assert trace.record["hedges"] == 1
+    # The loser's cancelled request time is not added
+    assert 0.02 <= trace.record["phases"]["request"] < 0.3
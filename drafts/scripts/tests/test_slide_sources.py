@@ -0,0 +1,75 @@
+import pytest
+
+from slide_sources import object_span, parse_array, parse_object, set_background_image
+
+SOURCE = """import { Slide } from "./types";
+
+export const sections: Section[] = [
+  { id: "intro", title: 'Intro: "quoted" {braces}' },
+  /* block comment ] with a bracket */
+  { id: "core", title: "Core", color: "#fff", order: -1.5e2, },
+];
+
+export const slides = [
+  {
+    id: "a1",
+    sectionId: "intro",
+    title: "It's [not] a {bracket}",
+    subtitle: 'Line\\nbreak \\u00e9 \\'single\\'',
+    tags: ["x", 'y',],
+    hidden: false,
+    image: null,
+  },
+];
+
+const sectionConnections: Record<string, Connection> = {
+  intro: { next: ["core"], label: "go // not a comment" },
+  core: { next: [] },
+};
+"""
+
+
+def test_parse_array_handles_strings_comments_and_trailing_commas():
+    sections = parse_array(SOURCE, "sections")
+    assert sections == [
+        {"id": "intro", "title": 'Intro: "quoted" {braces}'},
+        {"id": "core", "title": "Core", "color": "#fff", "order": -150.0},
+    ]
+    (slide,) = parse_array(SOURCE, "slides")
+    assert slide["title"] == "It's [not] a {bracket}"
+    assert slide["subtitle"] == "Line\nbreak é 'single'"
+    assert slide["tags"] == ["x", "y"]
+    assert slide["hidden"] is False and slide["image"] is None
+
+
+def test_parse_object_finds_unexported_consts():
+    connections = parse_object(SOURCE, "sectionConnections")
+    assert connections == {"intro": {"next": ["core"], "label": "go // not a comment"}, "core": {"next": []}}
+
+
+def test_object_span_covers_the_whole_literal():
+    start, end = object_span(SOURCE, "sectionConnections")
+    assert SOURCE[start] == "{" and SOURCE[end - 1] == "}"
+    assert SOURCE[end:] == ";\n"
+
+
+def test_missing_names_and_expressions_are_errors():
+    with pytest.raises(ValueError, match="no exported array"):
+        parse_array(SOURCE, "resources")
+    with pytest.raises(ValueError, match="no object"):
+        parse_object(SOURCE, "missing")
+    with pytest.raises(ValueError, match="unsupported expression"):
+        parse_array("export const xs = [{ id: someVariable }];", "xs")
+    with pytest.raises(ValueError, match="template literals"):
+        parse_array("export const xs = [{ id: `a${b}` }];", "xs")
+
+
+def test_set_background_image_adds_then_replaces():
+    updated = set_background_image(SOURCE, "a1", "/assets/images/a1.jpg")
+    assert '    backgroundImage: "/assets/images/a1.jpg",\n    tags:' in updated
+    assert parse_array(updated, "slides")[0]["backgroundImage"] == "/assets/images/a1.jpg"
+
+    again = set_background_image(updated, "a1", "/assets/images/other.jpg")
+    assert again.count("backgroundImage") == 1
+    assert parse_array(again, "slides")[0]["backgroundImage"] == "/assets/images/other.jpg"
+    assert parse_array(again, "sections") == parse_array(SOURCE, "sections")
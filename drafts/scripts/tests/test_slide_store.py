@@ -0,0 +1,94 @@
+import json
+import sys
+
+import pytest
+
+import slide_store
+from slide_store import APPROVED, DEFAULT_JSON_PATH, REJECTED, SlideStore
+
+
+def test_round_trip_keeps_slides_json(tmp_path):
+    with SlideStore(str(tmp_path / "slides.db")) as store:
+        store.import_json(DEFAULT_JSON_PATH)
+        store.export_json(str(tmp_path / "slides.json"))
+
+    with open(DEFAULT_JSON_PATH, encoding="utf-8") as f:
+        original = json.load(f)
+    with open(tmp_path / "slides.json", encoding="utf-8") as f:
+        assert json.load(f) == original
+
+
+def test_selected_variation_is_a_zero_based_index(tmp_path):
+    with open(DEFAULT_JSON_PATH, encoding="utf-8") as f:
+        slides = [slide for slide in json.load(f) if slide.get("selected_variation") is not None]
+    assert slides
+
+    with SlideStore(str(tmp_path / "slides.db")) as store:
+        store.import_json(DEFAULT_JSON_PATH)
+        for slide in slides:
+            approved = store.variations(slide["id"], status=APPROVED)
+            assert len(approved) == 1
+            assert approved[0]["filename"] == slide["variations"][slide["selected_variation"]]["filename"]
+
+
+def test_index_zero_is_imported(tmp_path):
+    source = tmp_path / "slides.json"
+    source.write_text(json.dumps([{
+        "id": "s1", "index": 0, "title": "One", "status": "approved",
+        "variations": [{"filename": "a.jpg", "style": "A"}, {"filename": "b.jpg", "style": "B"}],
+        "selected_variation": 0,
+    }]))
+
+    with SlideStore(str(tmp_path / "slides.db")) as store:
+        store.import_json(str(source))
+        assert [row["filename"] for row in store.variations("s1", status=APPROVED)] == ["a.jpg"]
+        store.export_json(str(tmp_path / "out.json"))
+
+    assert json.loads((tmp_path / "out.json").read_text())[0]["selected_variation"] == 0
+
+
+def _store_with_variations(tmp_path, count: int = 3) -> SlideStore:
+    store = SlideStore(str(tmp_path / "slides.db"))
+    store.upsert_slide({"id": "s1", "index": 0, "title": "One"})
+    for i in range(count):
+        store.append_variation("s1", f"v{i}.jpg", style=f"Style {i}")
+    return store
+
+
+def test_mark_approved_selects_the_variation(tmp_path, monkeypatch):
+    db = str(tmp_path / "slides.db")
+    with _store_with_variations(tmp_path) as store:
+        store.select_variation("s1", 1)
+
+    monkeypatch.setattr(sys, "argv", ["slide_store.py", "--db", db, "mark", "s1", "3", "approved"])
+    slide_store.main()
+
+    with SlideStore(db) as store:
+        assert [row["seq"] for row in store.variations("s1", status=APPROVED)] == [3]
+        assert store.slides()[0]["selected_variation"] == 3
+        store.export_json(str(tmp_path / "out.json"))
+    assert json.loads((tmp_path / "out.json").read_text())[0]["selected_variation"] == 2
+
+
+def test_unselecting_clears_the_selection(tmp_path):
+    with _store_with_variations(tmp_path) as store:
+        store.select_variation("s1", 2)
+        store.set_variation_status("s1", 2, REJECTED)
+        assert store.slides()[0]["selected_variation"] is None
+
+
+def test_missing_variation_is_an_error(tmp_path, monkeypatch, capsys):
+    db = str(tmp_path / "slides.db")
+    with _store_with_variations(tmp_path) as store:
+        store.select_variation("s1", 1)
+        with pytest.raises(ValueError):
+            store.select_variation("s1", 9)
+        with pytest.raises(ValueError):
+            store.set_variation_status("s1", 9, REJECTED)
+        # A failed selection leaves the current one alone
+        assert [row["seq"] for row in store.variations("s1", status=APPROVED)] == [1]
+
+    monkeypatch.setattr(sys, "argv", ["slide_store.py", "--db", db, "mark", "s1", "9", "approved"])
+    with pytest.raises(SystemExit):
+        slide_store.main()
+    assert "no variation #9" in capsys.readouterr().err
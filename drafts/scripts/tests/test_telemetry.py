@@ -0,0 +1,54 @@
+from telemetry import summarize, write_prometheus
+
+
+def _record(outcome, phases, model="m", attempts=1, hedges=0, size=0):
+    return {"name": "job", "model": model, "outcome": outcome, "phases": phases,
+            "attempts": attempts, "hedges": hedges, "response_bytes": size}
+
+
+def test_summarize_totals_phases_and_names_the_bound():
+    records = [
+        _record("ok", {"rate_wait": 3.0, "request": 1.0}, attempts=2, hedges=1, size=100),
+        _record("ok", {"rate_wait": 2.0, "request": 1.5, "save": 0.5}, size=50),
+        _record("failed", {"backoff": 2.0}, attempts=4),
+    ]
+    summary = summarize(records)
+    assert summary["requests"] == 3
+    assert summary["outcomes"] == {"ok": 2, "failed": 1}
+    assert summary["attempts"] == 7
+    assert summary["hedges"] == 1
+    assert summary["response_bytes"] == 150
+    assert summary["phase_seconds"]["rate_wait"] == 5.0
+    assert summary["phase_seconds"]["cache"] == 0.0
+    assert summary["phase_share"]["rate_wait"] == 0.5
+    assert summary["bound_by"] == "quota-bound"
+
+
+def test_summarize_without_time_is_idle():
+    summary = summarize([_record("skipped", {})])
+    assert summary["bound_by"] == "idle"
+    assert summary["phase_share"]["request"] == 0.0
+    assert summarize([])["requests"] == 0
+
+
+def test_write_prometheus(tmp_path):
+    path = tmp_path / "metrics" / "run.prom"
+    write_prometheus([
+        _record("ok", {"request": 1.25}, model="gemini", size=2048),
+        _record("ok", {"request": 0.75, "save": 0.1}, model="gemini", attempts=3, size=1024),
+        _record("failed", {}, model='odd "model"'),
+    ], str(path))
+
+    lines = path.read_text().splitlines()
+    assert 'gemini_generation_requests_total{model="gemini",outcome="ok"} 2' in lines
+    assert 'gemini_generation_requests_total{model="odd \\"model\\"",outcome="failed"} 1' in lines
+    assert "gemini_generation_attempts_total 5" in lines
+    assert 'gemini_generation_response_bytes_total{model="gemini"} 3072' in lines
+    assert 'gemini_generation_phase_seconds_sum{phase="request"} 2.000000' in lines
+    assert 'gemini_generation_phase_seconds_count{phase="request"} 2' in lines
+    assert 'gemini_generation_phase_seconds_count{phase="save"} 1' in lines
+    # Every sample has HELP and TYPE lines for its metric
+    types = {line.split()[2] for line in lines if line.startswith("# TYPE")}
+    samples = {line.split("{")[0].split()[0] for line in lines if not line.startswith("#")}
+    assert {name.removesuffix("_sum").removesuffix("_count") for name in samples} <= types
+    assert not list(path.parent.glob("*.tmp-*"))
@@ -0,0 +1,61 @@
+from collections import Counter
+
+from variation_sweep import run_sweep
+
+
+def _candidates(groups, per_group, pulled):
+    """Candidates round-robin over groups, recording each one as it is pulled."""
+    for index in range(per_group):
+        for group in groups:
+            pulled.append((group, index))
+            yield {"group": group, "job": {"name": f"{group}/{index}"}}
+
+
+def _run(jobs):
+    return [{"name": job["name"], "ok": True} for job in jobs]
+
+
+def test_stops_each_group_at_want():
+    pulled = []
+    history = run_sweep(_candidates("ab", 10, pulled), _run, lambda item, result: True,
+                        want=2, budget=6, wave=4)
+    assert Counter(item["group"] for item, _, ok in history if ok) == {"a": 2, "b": 2}
+    assert len(history) == 4
+
+
+def test_counts_from_earlier_runs():
+    pulled = []
+    history = run_sweep(_candidates("ab", 10, pulled), _run, lambda item, result: True,
+                        want=2, budget=6, wave=4, spent={"a": 2}, accepted={"a": 2})
+    assert {item["group"] for item, _, _ in history} == {"b"}
+
+
+def test_one_group_does_not_expand_the_whole_matrix():
+    pulled = []
+    sent = []
+
+    def run(jobs):
+        sent.extend(jobs)
+        # Never more than a wave held back beyond what has been sent
+        assert len(pulled) <= len(sent) + 2
+        return _run(jobs)
+
+    history = run_sweep(_candidates("a", 1000, pulled), run, lambda item, result: False,
+                        want=1, budget=50, wave=2)
+    assert len(history) == 50
+
+
+def test_accept_sees_each_wave_before_the_next_runs():
+    events = []
+
+    def run(jobs):
+        events.append(("run", len(jobs)))
+        return _run(jobs)
+
+    def accept(item, result):
+        events.append(("accept", item["group"]))
+        return True
+
+    run_sweep(_candidates("ab", 10, []), run, accept, want=2, budget=6, wave=2)
+    assert events == [("run", 2), ("accept", "a"), ("accept", "b"),
+                      ("run", 2), ("accept", "a"), ("accept", "b")]
@@ -0,0 +1,80 @@
+import os
+import time
+
+import pytest
+
+from fake_gemini_server import FakeGemini, start_server
+from work_queue import DONE, LEASED, PENDING, WorkQueue, key_id, run_queued
+
+SETTINGS = {
+    "concurrency": 2,
+    "rpm": 6000,
+    "burst": 10,
+    "attempts": 2,
+    "hedge": False,
+    "breaker_threshold": 5,
+    "breaker_cooldown": 1.0,
+    "cache_dir": None,
+    "cache_max_bytes": 0,
+    "refresh": False,
+}
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeGemini(latency_median=0.02, latency_distribution="fixed", payload_kb=20, seed=1)
+    server, base_url = start_server(fake)
+    # Spawned workers inherit the environment
+    monkeypatch.setenv("GEMINI_BASE_URL", base_url)
+    monkeypatch.setenv("GEMINI_API_KEYS", "key-one,key-two")
+    yield fake
+    server.shutdown()
+
+
+def _jobs(tmp_path, count):
+    return [
+        {"name": f"job-{i}", "prompt": f"slide {i}", "output_path": str(tmp_path / "out" / f"job-{i}.jpg")}
+        for i in range(count)
+    ]
+
+
+def test_two_workers_two_keys_finish_each_job_once(tmp_path, fake):
+    path = str(tmp_path / "queue.db")
+    jobs = _jobs(tmp_path, 12)
+
+    results = run_queued(jobs, path, workers=2, settings=SETTINGS)
+
+    assert [r["name"] for r in results] == [job["name"] for job in jobs]
+    assert all(r["ok"] for r in results)
+    assert all(os.path.exists(job["output_path"]) for job in jobs)
+    queue = WorkQueue(path)
+    assert queue.counts() == {DONE: 12}
+    rows = queue.db.execute("SELECT attempts FROM jobs").fetchall()
+    assert [row["attempts"] for row in rows] == [1] * 12
+    # One request per job, spread over both keys
+    assert fake.stats["requests"] == 12
+    assert sorted(fake.stats["keys"]) == ["key-one", "key-two"]
+    assert sum(usage["requests"] for usage in queue.key_usage()) == 12
+
+
+def test_expired_lease_is_reclaimed(tmp_path, fake):
+    path = str(tmp_path / "queue.db")
+    jobs = _jobs(tmp_path, 3)
+    queue = WorkQueue(path)
+    queue.enqueue(jobs)
+    queue.register_keys([key_id("key-one"), key_id("key-two")], SETTINGS["rpm"], SETTINGS["burst"])
+    # A worker that died holding a lease
+    job, _ = queue.claim("dead-worker", [key_id("key-one")], lease=0.01)
+    assert queue.counts() == {PENDING: 2, LEASED: 1}
+    time.sleep(0.05)
+
+    results = run_queued(jobs, path, workers=2, settings=SETTINGS)
+
+    assert all(r["ok"] for r in results)
+    row = queue.db.execute("SELECT * FROM jobs WHERE name = ?", (job["name"],)).fetchone()
+    assert row["state"] == DONE
+    assert row["attempts"] == 2
+    assert row["worker"] != "dead-worker"
+    # The dead worker's late result is refused
+    assert not queue.complete(job["name"], "dead-worker", dict(results[0], ok=False))
+    assert queue.counts() == {DONE: 3}
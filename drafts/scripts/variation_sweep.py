@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Slide x style x seed variation sweeps that stop once each slide has enough.
+
+The candidate matrix is expanded lazily, in priority order: the first seed
+of every style before any second seed, and styles with the best acceptance
+rate so far (from the slide store) first. Candidates run in waves through
+the engine. A slide stops taking new candidates once it has --want accepted
+variations or has used its --budget of variations, and a wave never
+schedules more candidates for a slide than it still needs. A sweep over a
+large matrix therefore makes only a fraction of its calls.
+
+Accepted means "accepted" or "approved" in drafts/data/slides.db: a slide
+can have several accepted variations but only one approved (selected) one.
+Mark variations with `slide_store.py mark` between runs. Each wave is
+recorded in the store as soon as it finishes, so a rerun picks up where the
+last one stopped. With --auto-accept, every new image that is not a
+near-duplicate (by pHash) of one already accepted for its slide is marked
+accepted on the spot.
+
+    python variation_sweep.py --want 2 --budget 6 --seeds 2
+    python variation_sweep.py --section "Mental Models" --auto-accept --dry-run
+"""
+
+import argparse
+import os
+from collections import Counter, deque
+
+from gemini_engine import add_engine_arguments, engine_options, print_summary, run_jobs
+from paths import REPO_ROOT, VARIATIONS_DIR
+from slide_store import ACCEPTED, APPROVED, DEFAULT_DB_PATH, SlideStore
+
+DEFAULT_WANT = 2
+DEFAULT_BUDGET = 6
+DEFAULT_SEEDS = 2
+
+# Where the app serves variations from, as recorded in existing slides.json entries
+VARIATIONS_URL = "/assets/variations"
+
+# Style templates in default priority order; {subject} is "Title - Subtitle"
+STYLES = {
+    "Minimalist Tech": """A minimalist, tech-forward visualization of {subject}.
+Clean white or dark gradient background with precise subject placement.
+Subtle ambient occlusion shadows grounding the elements.
+Restrained palette with a single accent color; generous negative space.""",
+    "Retro Futurism": """A retro-futuristic interpretation of {subject}.
+1960s space-age optimism meets mid-century modern design.
+Bold primary colors, chrome accents, and atomic-age motifs.
+Clean illustrated forms with a slightly worn print texture.""",
+    "Cinematic Photorealistic": """A cinematic, photorealistic {subject}.
+Shot with a 35mm anamorphic lens creating subtle lens flares.
+Dramatic three-point lighting with strong key light and soft fill.
+Film grain and a teal-and-orange grade.""",
+    "Documentary Authentic": """An authentic, documentary-style photograph of {subject}.
+Natural available light, capturing a genuine moment.
+Shot on 50mm prime lens at eye level, intimate perspective.
+Warm, slightly muted tones.""",
+    "Abstract Conceptual": """An abstract, conceptual visualization of {subject}.
+Metaphorical representation using symbolic imagery and visual metaphors.
+Flowing organic forms mixed with precise geometric elements.
+Limited palette with strong contrast.""",
+}
+
+
+def slug(text: str) -> str:
+    return "".join(c if c.isalnum() else "-" for c in text.lower()).strip("-")
+
+
+def style_priority(store: SlideStore, styles: list) -> list:
+    """Styles ordered by acceptance rate so far, smoothed so untried styles sit mid-table."""
+    generated = Counter()
+    accepted = Counter()
+    for row in store.variations():
+        generated[row["style"]] += 1
+        accepted[row["style"]] += row["status"] in (ACCEPTED, APPROVED)
+    rate = {style: (accepted[style] + 1) / (generated[style] + 2) for style in styles}
+    return sorted(styles, key=lambda style: -rate[style])
+
+
+def expand(slides: list, styles: list, seeds: int):
+    """Lazily yield (slide, style, seed) in priority order: seed, then style, then slide."""
+    for seed in range(seeds):
+        for style in styles:
+            for slide in slides:
+                yield slide, style, seed
+
+
+def candidate(slide, style: str, seed: int, output_dir: str = VARIATIONS_DIR) -> dict:
+    """A sweep candidate: the slide it belongs to and its generation job."""
+    subject = " - ".join(part for part in (slide["title"], slide["subtitle"]) if part)
+    filename = f"sweep_{slug(style)}_s{seed}.jpg"
+    return {
+        "group": slide["id"],
+        "style": style,
+        "filename": filename,
+        "job": {
+            "name": f"{slide['id']}/{filename}",
+            "prompt": STYLES[style].format(subject=subject),
+            "output_path": os.path.join(output_dir, slide["id"], filename),
+            "aspect_ratio": "16:9",
+            "seed": seed,
+        },
+    }
+
+
+def run_sweep(candidates, run, accept, want: int, budget: int, wave: int,
+              spent: Counter = None, accepted: Counter = None) -> list:
+    """Run candidates in waves until every group is settled or the matrix is exhausted.
+
+    `candidates` is an iterable of dicts with "group" and "job", in priority
+    order; it is only consumed as far as needed, and at most about a wave
+    of it is held back for groups that already have enough in flight.
+    `run(jobs)` returns engine results, and `accept(candidate, result)`
+    decides whether a successful one counts towards its group's `want`; it
+    is called as each wave finishes. `spent` and `accepted` carry counts
+    from earlier runs. Returns (candidate, result, accepted) triples.
+    """
+    spent = Counter(spent)
+    accepted = Counter(accepted)
+    pending = iter(candidates)
+    # Candidates held back because their group had enough in flight
+    deferred = deque()
+    history = []
+
+    def settled(group):
+        return accepted[group] >= want or spent[group] >= budget
+
+    while True:
+        batch = []
+        in_flight = Counter()
+        held = deque()
+        for source in (deferred, pending):
+            while len(batch) < wave:
+                if source is deferred:
+                    if not deferred:
+                        break
+                    item = deferred.popleft()
+                else:
+                    # Enough held back already; pulling more would expand the matrix for nothing
+                    if len(held) >= wave:
+                        break
+                    item = next(pending, None)
+                    if item is None:
+                        break
+                group = item["group"]
+                if settled(group):
+                    continue
+                if (accepted[group] + in_flight[group] >= want
+                        or spent[group] + in_flight[group] >= budget):
+                    held.append(item)
+                    continue
+                batch.append(item)
+                in_flight[group] += 1
+        deferred.extendleft(reversed(held))
+        if not batch:
+            return history
+
+        results = {r["name"]: r for r in run([item["job"] for item in batch])}
+        for item in batch:
+            result = results[item["job"]["name"]]
+            spent[item["group"]] += 1
+            ok = result["ok"] and accept(item, result)
+            accepted[item["group"]] += ok
+            history.append((item, result, ok))
+
+
+def near_duplicate_filter(distance: int):
+    """accept() for --auto-accept: rejects images within `distance` pHash bits of an accepted one."""
+    from image_index import hamming, perceptual_hashes
+
+    kept = {}
+
+    def accept(item, result):
+        try:
+            phash = int(perceptual_hashes(result["output_path"])["phash"], 16)
+        except OSError as e:  # includes PIL's UnidentifiedImageError and truncated files
+            print(f"  ✗ {item['job']['name']} could not be read, not accepted: {e}")
+            return False
+        if any(hamming(phash, other) <= distance for other in kept.get(item["group"], ())):
+            print(f"  ✗ {item['job']['name']} is a near-duplicate of an accepted variation")
+            return False
+        kept.setdefault(item["group"], []).append(phash)
+        return True
+
+    return accept, kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--want", type=int, default=DEFAULT_WANT,
+                        help=f"accepted variations per slide before it stops (default: {DEFAULT_WANT})")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET,
+                        help=f"most variations per slide, counting earlier ones (default: {DEFAULT_BUDGET})")
+    parser.add_argument("--seeds", type=int, default=DEFAULT_SEEDS,
+                        help=f"seeds per slide and style (default: {DEFAULT_SEEDS})")
+    parser.add_argument("--styles", nargs="+", choices=list(STYLES), metavar="STYLE",
+                        help="styles to sweep (default: all)")
+    parser.add_argument("--section", help="only slides in this section")
+    parser.add_argument("--slide", nargs="+", metavar="SLIDE_ID", help="only these slides")
+    parser.add_argument("--wave", type=int, help="candidates per wave (default: --concurrency)")
+    parser.add_argument("--auto-accept", action="store_true",
+                        help="accept each new variation that is not a near-duplicate of an accepted one")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="show the waves a sweep would run if every candidate were accepted")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="slide store (default: drafts/data/slides.db)")
+    parser.add_argument("--output-dir", default=VARIATIONS_DIR,
+                        help="where variations go, one folder per slide (default: drafts/variations)")
+    add_engine_arguments(parser, "variation_sweep")
+    args = parser.parse_args()
+
+    with SlideStore(args.db) as store:
+        slides = [s for s in store.slides(section=args.section) if not args.slide or s["id"] in args.slide]
+        styles = style_priority(store, args.styles or list(STYLES))
+
+        spent = Counter()
+        accepted = Counter()
+        done = set()
+        for row in store.variations():
+            spent[row["slide_id"]] += 1
+            accepted[row["slide_id"]] += row["status"] in (ACCEPTED, APPROVED)
+            done.add((row["slide_id"], row["filename"]))
+
+        candidates = (
+            c for c in (candidate(*cell, args.output_dir) for cell in expand(slides, styles, args.seeds))
+            if (c["group"], c["filename"]) not in done
+        )
+        matrix = len(slides) * len(styles) * args.seeds
+        wave = args.wave or args.concurrency
+        print(f"Sweeping {len(slides)} slides x {len(styles)} styles x {args.seeds} seeds = {matrix} cells; "
+              f"want {args.want} per slide, budget {args.budget}, waves of {wave}")
+        print(f"Style priority: {', '.join(styles)}")
+
+        if args.dry_run:
+            # Best case: every candidate succeeds and is accepted
+            def run(jobs):
+                print(f"  wave: {', '.join(job['name'] for job in jobs)}")
+                return [{"name": job["name"], "ok": True} for job in jobs]
+
+            history = run_sweep(candidates, run, lambda item, result: True,
+                                args.want, args.budget, wave, spent, accepted)
+            print(f"At best {len(history)} of {matrix} cells are generated")
+            return
+
+        def accept(item, result):
+            return False
+
+        if args.auto_accept:
+            from image_index import DEFAULT_DISTANCE, perceptual_hashes
+
+            accept, kept = near_duplicate_filter(DEFAULT_DISTANCE)
+            for row in store.variations():
+                if row["status"] not in (ACCEPTED, APPROVED):
+                    continue
+                path = os.path.join(REPO_ROOT, row["path"])
+                if not os.path.exists(path):
+                    continue
+                try:
+                    kept.setdefault(row["slide_id"], []).append(int(perceptual_hashes(path)["phash"], 16))
+                except OSError as e:
+                    print(f"  Skipping unreadable accepted variation {row['path']}: {e}")
+
+        options = engine_options(args)
+        all_results = []
+
+        def run(jobs):
+            results = run_jobs(jobs, **options)
+            all_results.extend(results)
+            return results
+
+        def record(item, result):
+            # Called for each successful result as its wave finishes, so an
+            # interrupted sweep keeps everything generated before the interruption
+            seq = store.append_variation(
+                item["group"], result["output_path"], style=item["style"], prompt=item["job"]["prompt"],
+                url=f"{VARIATIONS_URL}/{item['group']}/{item['filename']}",
+            )
+            ok = accept(item, result)
+            if ok:
+                store.set_variation_status(item["group"], seq, ACCEPTED)
+            return ok
+
+        # One trace file and metrics dump for all waves
+        with options["telemetry"]:
+            history = run_sweep(candidates, run, record, args.want, args.budget, wave, spent, accepted)
+
+        print_summary(all_results, len(all_results))
+        accepted_now = Counter(item["group"] for item, _, ok in history if ok)
+        print(f"\nGenerated {len(history)} of {matrix} cells ({matrix - len(history)} never sent)")
+        for slide in slides:
+            total = accepted[slide["id"]] + accepted_now[slide["id"]]
+            print(f"  {slide['id']}: {total}/{args.want} accepted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""Shared SQLite work queue for draining generation jobs with several processes and API keys.
+
+Jobs are enqueued into a SQLite database (WAL mode, one short IMMEDIATE
+transaction per claim), and any number of worker processes on this machine
+lease them one at a time. A lease that is not completed in time (the worker
+died) goes back to pending. WAL relies on shared memory between processes on
+one host, so keep the queue on a local disk, not on an NFS or SMB share.
+
+API keys come from GEMINI_API_KEYS (comma-separated) or GEMINI_API_KEY. Only
+a hash of each key is written to the database. Each key has its own token
+bucket in the database, so its requests-per-minute budget holds across all
+workers. A claimed job is assigned to the key with the most spare budget and
+the fewest jobs in flight, so work spreads evenly and another key adds its
+full quota to the pool.
+
+    python generate_title_images.py --queue drafts/.cache/queue.db --workers 4
+    python work_queue.py work --queue drafts/.cache/queue.db   # extra worker
+    python work_queue.py status --queue drafts/.cache/queue.db
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from paths import CACHE_DIR
+
+DEFAULT_QUEUE_PATH = os.path.join(CACHE_DIR, "queue.db")
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+# Seconds a worker may hold a job before it is handed to someone else
+DEFAULT_LEASE = 900
+
+# Seconds between claims when every remaining job is leased to someone else
+POLL_INTERVAL = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    name TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    payload_hash TEXT NOT NULL,
+    state TEXT NOT NULL,
+    key_id TEXT,
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    output_path TEXT,
+    error TEXT,
+    result TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state, seq);
+
+CREATE TABLE IF NOT EXISTS api_keys (
+    key_id TEXT PRIMARY KEY,
+    rpm REAL NOT NULL,
+    burst REAL NOT NULL,
+    tokens REAL NOT NULL,
+    refilled_at REAL NOT NULL,
+    requests INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def load_keys() -> list:
+    """API keys from GEMINI_API_KEYS, or the single GEMINI_API_KEY."""
+    keys = [k.strip() for k in os.environ.get("GEMINI_API_KEYS", "").split(",") if k.strip()]
+    return keys or [os.environ["GEMINI_API_KEY"]]
+
+
+def key_id(key: str) -> str:
+    """Identifier for a key that is safe to store and print."""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:10]
+
+
+def _payload_hash(job: dict) -> str:
+    return hashlib.sha256(json.dumps(job, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class WorkQueue:
+    """Jobs, leases and per-key token buckets in one SQLite file."""
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Autocommit; writes that must be atomic take an IMMEDIATE transaction.
+        # Workers call in from worker threads, so one lock serializes the connection.
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+
+    def enqueue(self, jobs: list, refresh=False) -> set:
+        """Add or reset jobs. Returns the names already done with the same payload.
+
+        Those stay done unless `refresh` (True, or a collection of names)
+        asks for them again.
+        """
+        now = time.time()
+        done = set()
+        with self._transaction():
+            seq = self.db.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM jobs").fetchone()[0]
+            for job in jobs:
+                digest = _payload_hash(job)
+                row = self.db.execute(
+                    "SELECT state, payload_hash, output_path FROM jobs WHERE name = ?", (job["name"],)
+                ).fetchone()
+                rerun = refresh is True or (bool(refresh) and job["name"] in refresh)
+                if (row and not rerun and row["state"] == DONE and row["payload_hash"] == digest
+                        and row["output_path"] and os.path.exists(row["output_path"])):
+                    done.add(job["name"])
+                    continue
+                self.db.execute(
+                    "INSERT INTO jobs (name, seq, payload, payload_hash, state, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(name) DO UPDATE SET "
+                    "seq = excluded.seq, payload = excluded.payload, payload_hash = excluded.payload_hash, "
+                    "state = excluded.state, key_id = NULL, worker = NULL, lease_until = NULL, "
+                    "error = NULL, result = NULL, updated_at = excluded.updated_at",
+                    (job["name"], seq, json.dumps(job), digest, PENDING, now),
+                )
+                seq += 1
+        return done
+
+    def register_keys(self, key_ids, rpm: float, burst: float):
+        """Create buckets for these keys, or update their budget."""
+        now = time.time()
+        with self._transaction():
+            for kid in key_ids:
+                self.db.execute(
+                    "INSERT INTO api_keys (key_id, rpm, burst, tokens, refilled_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key_id) DO UPDATE SET rpm = excluded.rpm, burst = excluded.burst",
+                    (kid, rpm, burst, burst, now),
+                )
+
+    def _refilled(self, row, now: float) -> float:
+        return min(row["burst"], row["tokens"] + (now - row["refilled_at"]) * row["rpm"] / 60)
+
+    def take_token(self, kid: str) -> float:
+        """Spend one request from a key's budget. Returns 0, or seconds to wait before trying again."""
+        now = time.time()
+        with self._transaction():
+            row = self.db.execute("SELECT * FROM api_keys WHERE key_id = ?", (kid,)).fetchone()
+            tokens = self._refilled(row, now)
+            if tokens >= 1:
+                self.db.execute(
+                    "UPDATE api_keys SET tokens = ?, refilled_at = ?, requests = requests + 1 WHERE key_id = ?",
+                    (tokens - 1, now, kid),
+                )
+                return 0.0
+            self.db.execute("UPDATE api_keys SET tokens = ?, refilled_at = ? WHERE key_id = ?", (tokens, now, kid))
+            return (1 - tokens) * 60 / row["rpm"]
+
+    def claim(self, worker: str, key_ids, lease: float = DEFAULT_LEASE):
+        """Lease the oldest pending job to `worker`. Returns (job, key id) or None.
+
+        The job gets the key, of those this worker holds, with the most spare
+        tokens once its jobs in flight are counted against it.
+        """
+        now = time.time()
+        with self._transaction():
+            # Leases of dead workers go back in the queue
+            self.db.execute(
+                "UPDATE jobs SET state = ?, worker = NULL, key_id = NULL WHERE state = ? AND lease_until < ?",
+                (PENDING, LEASED, now),
+            )
+            row = self.db.execute(
+                "SELECT name, payload FROM jobs WHERE state = ? ORDER BY seq LIMIT 1", (PENDING,)
+            ).fetchone()
+            if not row:
+                return None
+
+            placeholders = ", ".join("?" * len(key_ids))
+            keys = self.db.execute(
+                f"SELECT k.*, (SELECT COUNT(*) FROM jobs j WHERE j.state = ? AND j.key_id = k.key_id) AS active "
+                f"FROM api_keys k WHERE k.key_id IN ({placeholders})",
+                (LEASED, *key_ids),
+            ).fetchall()
+            best = max(keys, key=lambda k: (self._refilled(k, now) - k["active"], -k["requests"]))
+
+            self.db.execute(
+                "UPDATE jobs SET state = ?, key_id = ?, worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE name = ?",
+                (LEASED, best["key_id"], worker, now + lease, now, row["name"]),
+            )
+        return json.loads(row["payload"]), best["key_id"]
+
+    def complete(self, name: str, worker: str, result: dict) -> bool:
+        """Record a job's result and release its lease.
+
+        Returns False, recording nothing, when `worker` no longer holds an
+        unexpired lease on the job: it was handed to another worker, whose
+        result counts instead.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self.db.execute(
+                "UPDATE jobs SET state = ?, output_path = ?, error = ?, result = ?, lease_until = NULL, "
+                "updated_at = ? WHERE name = ? AND state = ? AND worker = ? AND lease_until > ?",
+                (DONE if result["ok"] else FAILED, result["output_path"], result["error"],
+                 json.dumps(result), now, name, LEASED, worker, now),
+            )
+            return cursor.rowcount == 1
+
+    def counts(self) -> dict:
+        """Number of jobs in each state."""
+        with self._lock:
+            return dict(self.db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+
+    def drained(self) -> bool:
+        """True when no job is pending or leased."""
+        counts = self.counts()
+        return not counts.get(PENDING) and not counts.get(LEASED)
+
+    def results(self, names: list) -> list:
+        """Stored result dicts for these jobs, in the given order."""
+        rows = {
+            row["name"]: row
+            for row in self.db.execute("SELECT name, state, output_path, error, result FROM jobs")
+        }
+        results = []
+        for name in names:
+            row = rows.get(name)
+            if row and row["result"]:
+                results.append(json.loads(row["result"]))
+            else:
+                results.append({
+                    "name": name, "ok": False, "output_path": None, "text": [],
+                    "error": row["error"] if row else "not in queue", "cached": False, "skipped": False,
+                })
+        return results
+
+    def key_usage(self) -> list:
+        return [dict(row) for row in self.db.execute("SELECT key_id, rpm, requests FROM api_keys ORDER BY key_id")]
+
+
+class KeyBucket:
+    """TokenBucket stand-in that spends from a key's shared budget in the queue."""
+
+    def __init__(self, queue: WorkQueue, kid: str):
+        self.queue = queue
+        self.kid = kid
+
+    async def acquire(self):
+        while True:
+            # A write transaction can wait up to 30 s on the database lock; keep it off the event loop
+            wait = await asyncio.to_thread(self.queue.take_token, self.kid)
+            if not wait:
+                return
+            await asyncio.sleep(min(wait, 1.0))
+
+
+async def work_async(path: str, worker: str, settings: dict) -> int:
+    """Drain the queue with `concurrency` jobs in flight. Returns the number of jobs run."""
+    from gemini_engine import generate_job, make_client
+    from resilience import Resilience
+    from response_cache import ResponseCache
+
+    queue = WorkQueue(path)
+    keys = {key_id(key): key for key in load_keys()}
+    queue.register_keys(keys, settings["rpm"], settings["burst"])
+    clients = {kid: make_client(api_key=key) for kid, key in keys.items()}
+    buckets = {kid: KeyBucket(queue, kid) for kid in keys}
+    cache = ResponseCache(settings["cache_dir"], settings["cache_max_bytes"]) if settings.get("cache_dir") else None
+    refresh = settings.get("refresh") or False
+    refresh = set(refresh) if isinstance(refresh, list) else refresh
+    # Per key, so one key's 429s or outage throttle and trip only that key
+    resilience = {
+        kid: Resilience(
+            settings["concurrency"],
+            max_attempts=settings["attempts"],
+            hedge=settings["hedge"],
+            breaker_threshold=settings["breaker_threshold"],
+            breaker_cooldown=settings["breaker_cooldown"],
+        )
+        for kid in keys
+    }
+    ran = 0
+
+    async def slot(index: int):
+        nonlocal ran
+        # Each slot leases under its own name, so a job reclaimed by a sibling slot is told apart
+        holder = f"{worker}/{index}"
+        while True:
+            claimed = await asyncio.to_thread(queue.claim, holder, list(keys))
+            if claimed is None:
+                if await asyncio.to_thread(queue.drained):
+                    return
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+            job, kid = claimed
+            result = await generate_job(
+                clients[kid], job, buckets[kid], cache, refresh, resilience=resilience[kid]
+            )
+            result = dict(result, key_id=kid, worker=holder)
+            if not await asyncio.to_thread(queue.complete, job["name"], holder, result):
+                print(f"  ✗ Lease on {job['name']} expired before it finished; result discarded")
+                continue
+            ran += 1
+
+    await asyncio.gather(*(slot(i) for i in range(settings["concurrency"])))
+    return ran
+
+
+def work(path: str, worker: str, settings: dict) -> int:
+    """Worker process entry point."""
+    return asyncio.run(work_async(path, worker, settings))
+
+
+def worker_name(index: int = 0) -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{index}"
+
+
+def run_queued(jobs: list, path: str, workers: int, settings: dict, telemetry=None, restart: bool = False) -> list:
+    """Enqueue jobs, drain them with `workers` local processes, and return their results.
+
+    With workers=0 nothing is started here; this waits for workers started
+    elsewhere (`python work_queue.py work`) to drain the queue. `restart`
+    runs jobs again even if the queue has them done.
+    """
+    queue = WorkQueue(path)
+    done = queue.enqueue(jobs, restart or settings.get("refresh") or False)
+    keys = load_keys()
+    print(f"Queue {path}: {len(jobs) - len(done)} jobs to run, {len(done)} already done; "
+          f"{workers} workers x {settings['concurrency']} in flight, "
+          f"{len(keys)} keys at {settings['rpm']:g} rpm each")
+
+    spawn = multiprocessing.get_context("spawn")
+    processes = [
+        spawn.Process(target=work, args=(path, worker_name(i), settings), daemon=True)
+        for i in range(workers if len(done) < len(jobs) else 0)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    # Without local workers, wait for ones started with `work_queue.py work`
+    while not workers and not queue.drained():
+        time.sleep(POLL_INTERVAL)
+
+    results = queue.results([job["name"] for job in jobs])
+    for result in results:
+        if result["name"] in done:
+            # Nothing was sent this run; the stored trace belongs to the run that made it
+            result.pop("trace", None)
+            result.update(skipped=True)
+        elif telemetry and "trace" in result:
+            telemetry.add(result["trace"])
+
+    for usage in queue.key_usage():
+        print(f"  key {usage['key_id']}: {usage['requests']} requests")
+    return results
+
+
+def main():
+    from gemini_engine import add_engine_arguments, queue_settings
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("work", "status"))
+    add_engine_arguments(parser, "work_queue")
+    args = parser.parse_args()
+    path = args.queue or DEFAULT_QUEUE_PATH
+
+    if args.command == "status":
+        queue = WorkQueue(path)
+        print(", ".join(f"{count} {state}" for state, count in sorted(queue.counts().items())) or "empty")
+        for usage in queue.key_usage():
+            print(f"  key {usage['key_id']}: {usage['rpm']:g} rpm, {usage['requests']} requests")
+        return
+
+    ran = work(path, worker_name(), queue_settings(args))
+    print(f"Worker done: {ran} jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,25 @@ import {
   savePersistedPositions,
   clearPersistedPositions,
 } from "../utils/persistence";
+import {
+  getImageDerivatives,
+  pickVariant,
+  selectImageSources,
+} from "../utils/responsiveImages";
+import type { ImageDerivatives } from "../utils/responsiveImages";
+import {
+  decodeBlurhash,
+  getImagePlaceholder,
+  placeholderStyle,
+} from "../utils/imagePlaceholders";
+import {
+  atlasCovers,
+  getAtlasImage,
+  spriteStyle,
+} from "../utils/imageAtlases";
+import type { ImageAtlasManifest } from "../utils/imageAtlases";
+import { createPreloader, getPreloadPlan } from "../utils/assetPreloader";
+import type { PreloadManifest } from "../utils/assetPreloader";
 import type { Section, SlideContent, Resource } from "../types/presentation";
 import { NODE_DIMENSIONS } from "../types/presentation";
 
@@ -561,3 +580,186 @@ describe("US-038 - Persistence utility", () => {
     });
   });
 });
+
+// ============================================================================
+// Responsive image derivative selection Tests
+// ============================================================================
+describe("Responsive image selection", () => {
+  const entry: ImageDerivatives = {
+    width: 1376,
+    height: 768,
+    thumb: "/assets/derivatives/slide/thumb.webp",
+    formats: {
+      avif: [
+        { width: 320, url: "/assets/derivatives/slide/w320.avif" },
+        { width: 640, url: "/assets/derivatives/slide/w640.avif" },
+        { width: 1376, url: "/assets/derivatives/slide/w1376.avif" },
+      ],
+      webp: [
+        { width: 320, url: "/assets/derivatives/slide/w320.webp" },
+        { width: 640, url: "/assets/derivatives/slide/w640.webp" },
+        { width: 1376, url: "/assets/derivatives/slide/w1376.webp" },
+      ],
+    },
+  };
+
+  it("picks the narrowest variant covering the target width", () => {
+    expect(pickVariant(entry.formats.webp!, 300)?.width).toBe(320);
+    expect(pickVariant(entry.formats.webp!, 321)?.width).toBe(640);
+  });
+
+  it("falls back to the widest variant when none is large enough", () => {
+    expect(pickVariant(entry.formats.webp!, 4000)?.width).toBe(1376);
+  });
+
+  it("returns sources in format preference order", () => {
+    const sources = selectImageSources(entry, 500);
+
+    expect(sources.map((source) => source.type)).toEqual([
+      "image/avif",
+      "image/webp",
+    ]);
+    expect(sources[1].url).toBe("/assets/derivatives/slide/w640.webp");
+  });
+
+  it("returns no sources for images without derivatives", () => {
+    expect(selectImageSources(undefined, 500)).toEqual([]);
+    expect(getImageDerivatives("/assets/images/missing.jpg", {})).toBe(
+      undefined,
+    );
+  });
+});
+
+// ============================================================================
+// Image placeholder Tests
+// ============================================================================
+describe("Image placeholders", () => {
+  it("decodes a blurhash into opaque RGBA pixels", () => {
+    // Solid mid-grey: DC #808080, no AC components
+    const pixels = decodeBlurhash("00Eyb[", 4, 3);
+
+    expect(pixels.length).toBe(4 * 3 * 4);
+    expect(Array.from(pixels.slice(0, 4))).toEqual([128, 128, 128, 255]);
+  });
+
+  it("returns no placeholder for remote or unknown images", () => {
+    expect(getImagePlaceholder("https://example.com/image.png")).toBe(
+      undefined,
+    );
+    expect(getImagePlaceholder(undefined)).toBe(undefined);
+  });
+
+  it("paints nothing for images without a colour", () => {
+    expect(placeholderStyle({ width: 100, height: 100 })).toBe(undefined);
+    expect(
+      placeholderStyle({ width: 100, height: 100, color: "#123456" })
+        ?.backgroundColor,
+    ).toBe("#123456");
+  });
+});
+
+// ============================================================================
+// Image atlas Tests
+// ============================================================================
+describe("Image atlases", () => {
+  const manifest: ImageAtlasManifest = {
+    atlases: [
+      { url: "/assets/atlases/atlas-0.webp", width: 1000, height: 500 },
+    ],
+    sprites: {
+      "/assets/images/slide.jpg": {
+        atlas: 0,
+        x: 500,
+        y: 100,
+        width: 250,
+        height: 100,
+      },
+    },
+  };
+
+  it("looks up a sprite with its atlas", () => {
+    const image = getAtlasImage("/assets/images/slide.jpg", manifest);
+
+    expect(image?.atlas.url).toBe("/assets/atlases/atlas-0.webp");
+    expect(image?.sprite.x).toBe(500);
+    expect(getAtlasImage("/assets/images/missing.jpg", manifest)).toBe(
+      undefined,
+    );
+    expect(getAtlasImage(undefined, manifest)).toBe(undefined);
+  });
+
+  it("covers only targets no wider than the sprite", () => {
+    const image = getAtlasImage("/assets/images/slide.jpg", manifest);
+
+    expect(atlasCovers(image, 250)).toBe(true);
+    expect(atlasCovers(image, 251)).toBe(false);
+    expect(atlasCovers(undefined, 100)).toBe(false);
+  });
+
+  it("scales and positions the atlas in percentages", () => {
+    const style = spriteStyle(
+      getAtlasImage("/assets/images/slide.jpg", manifest)!,
+    );
+
+    expect(style.aspectRatio).toBe("250 / 100");
+    expect(style.backgroundSize).toBe("400% 500%");
+    // x: 500 / (1000 - 250), y: 100 / (500 - 100)
+    expect(style.backgroundPosition).toBe("66.66666666666666% 25%");
+  });
+});
+
+// ============================================================================
+// Asset preloading Tests
+// ============================================================================
+describe("Asset preloading", () => {
+  const slide = (next: string[], urls: string[]) => ({
+    next,
+    bytes: 0,
+    windowBytes: 0,
+    overBudget: false,
+    assets: urls.map((url) => ({ url, bytes: 100 })),
+  });
+  const manifest: PreloadManifest = {
+    ahead: 2,
+    budget: 1000,
+    viewWidth: 1100,
+    overview: ["/atlas.webp"],
+    slides: {
+      a: slide(["b", "c"], ["/a.jpg"]),
+      b: slide(["c"], ["/b.jpg", "/shared.png"]),
+      c: slide([], ["/c.jpg", "/shared.png"]),
+    },
+  };
+
+  it("plans the atlases, the slide, then the slides ahead", () => {
+    expect(getPreloadPlan("a", false, manifest)).toEqual([
+      "/atlas.webp",
+      "/a.jpg",
+      "/b.jpg",
+      "/shared.png",
+      "/c.jpg",
+    ]);
+  });
+
+  it("plans only the atlases in overview mode or for unknown slides", () => {
+    expect(getPreloadPlan("a", true, manifest)).toEqual(["/atlas.webp"]);
+    expect(getPreloadPlan("missing", false, manifest)).toEqual([
+      "/atlas.webp",
+    ]);
+    expect(getPreloadPlan(null, false, manifest)).toEqual(["/atlas.webp"]);
+  });
+
+  it("drops waiting urls when a new plan is scheduled", async () => {
+    const loaded: string[] = [];
+    const resolvers: (() => void)[] = [];
+    const preloader = createPreloader((url) => {
+      loaded.push(url);
+      return new Promise<void>((resolve) => resolvers.push(resolve));
+    }, 1);
+
+    preloader.schedule(["/a.jpg", "/b.jpg", "/c.jpg"]);
+    preloader.schedule(["/a.jpg", "/c.jpg"]);
+    resolvers[0]();
+    await vi.waitFor(() => expect(loaded).toEqual(["/a.jpg", "/c.jpg"]));
+  });
+});
@@ -24,6 +24,7 @@ import NavigationControls from "./panels/NavigationControls";
 import { EDIT_MODE } from "../config";
 import MetroLegend from "./panels/MetroLegend";
 import { useKeyboardNavigation } from "../hooks/useKeyboardNavigation";
+import { useAssetPreloader } from "../hooks/useAssetPreloader";
 import { generateMetroLayout } from "../utils/generateMetroLayout";
 import { buildNavigationGraph } from "../utils/navigationGraph";
 import {
@@ -118,6 +119,9 @@ function MetroCanvas() {
     setActiveSlide,
   } = useKeyboardNavigation({ sections, slides });
 
+  // Prefetch the current slide's images and those of the slides ahead
+  useAssetPreloader(currentSlideId, isOverviewMode);
+
   // Find closest metro stop to viewport center
   const findClosestSlide = useCallback(() => {
     const viewport = getViewport();
@@ -0,0 +1,116 @@
+import { memo, useCallback, useMemo } from "react";
+import type { ImgHTMLAttributes } from "react";
+import { useStore } from "@xyflow/react";
+import {
+  atlasCovers,
+  getAtlasImage,
+  spriteStyle,
+} from "../utils/imageAtlases";
+import {
+  getImagePlaceholder,
+  placeholderStyle,
+} from "../utils/imagePlaceholders";
+import {
+  getImageDerivatives,
+  pickVariant,
+  selectImageSources,
+  targetPixelWidth,
+} from "../utils/responsiveImages";
+
+interface ResponsiveImageProps extends Omit<
+  ImgHTMLAttributes<HTMLImageElement>,
+  "src" | "width"
+> {
+  src: string;
+  /** Layout width of the image in CSS pixels, before canvas zoom */
+  width: number;
+  /** Multiply by the canvas zoom (false for overlays rendered outside the canvas) */
+  followZoom?: boolean;
+}
+
+/** Selector result meaning "draw the atlas thumbnail" */
+const USE_ATLAS = -1;
+
+/**
+ * Image that loads the smallest derivative covering its on-screen width.
+ *
+ * Inside the canvas, the on-screen width is the layout width times the
+ * current zoom. The store selector returns the chosen variant width, so the
+ * component only re-renders when zooming crosses into a different size.
+ * Images without derivatives render the original URL unchanged.
+ *
+ * While the on-screen width fits within the image's atlas thumbnail, the
+ * thumbnail is painted from the shared atlas instead, letterboxed like
+ * object-fit: contain, so a zoomed-out canvas makes no per-image requests.
+ *
+ * When the image has a generated placeholder, its intrinsic size is set on
+ * the <img> to reserve layout and its blurred preview is painted behind it.
+ */
+function ResponsiveImage({
+  src,
+  width,
+  followZoom = true,
+  style,
+  ...rest
+}: ResponsiveImageProps) {
+  const entry = getImageDerivatives(src);
+  const atlasImage = useMemo(() => getAtlasImage(src), [src]);
+  const placeholder = getImagePlaceholder(src);
+  const imgProps = {
+    width: placeholder?.width,
+    height: placeholder?.height,
+    decoding: "async" as const,
+    ...rest,
+    style: { ...placeholderStyle(placeholder), ...style },
+  };
+
+  const variantWidthSelector = useCallback(
+    (state: { transform: [number, number, number] }) => {
+      const zoom = followZoom ? state.transform[2] : 1;
+      const target = targetPixelWidth(width, zoom);
+      if (atlasCovers(atlasImage, target)) return USE_ATLAS;
+      if (!entry) return 0;
+      const variants = Object.values(entry.formats)[0] ?? [];
+      return pickVariant(variants, target)?.width ?? 0;
+    },
+    [entry, atlasImage, width, followZoom],
+  );
+  const variantWidth = useStore(variantWidthSelector);
+
+  if (variantWidth === USE_ATLAS && atlasImage) {
+    const sprite = spriteStyle(atlasImage);
+    return (
+      <span
+        role="img"
+        aria-label={rest.alt}
+        className={rest.className}
+        style={{
+          display: "flex",
+          alignItems: "center",
+          justifyContent: "center",
+          aspectRatio: sprite.aspectRatio,
+          ...style,
+        }}
+      >
+        <span style={{ height: "100%", maxWidth: "100%", ...sprite }} />
+      </span>
+    );
+  }
+
+  const sources = selectImageSources(entry, variantWidth);
+  if (sources.length === 0) {
+    return <img src={src} {...imgProps} />;
+  }
+
+  const fallback = sources[sources.length - 1];
+  return (
+    <picture style={{ display: "contents" }}>
+      {sources.slice(0, -1).map((source) => (
+        <source key={source.type} type={source.type} srcSet={source.url} />
+      ))}
+      <img src={fallback.url} {...imgProps} />
+    </picture>
+  );
+}
+
+export default memo(ResponsiveImage);
@@ -5,8 +5,12 @@ import {
   loadPersistedPositions,
   savePersistedPositions,
 } from "../../utils/persistence";
+import ResponsiveImage from "../ResponsiveImage";
 import "./LandmarkNode.css";
 
+// Layout width of .landmark-node__image, before the node's own scale
+const LANDMARK_IMAGE_WIDTH = 500;
+
 export interface LandmarkNodeData {
   [key: string]: unknown;
   image?: string; // Optional - for PNG landmarks
@@ -153,8 +157,9 @@ function LandmarkNode({ id, data }: NodeProps<LandmarkNode>) {
     // Default: render image
     if (data.image) {
       return (
-        <img
+        <ResponsiveImage
           src={data.image}
+          width={LANDMARK_IMAGE_WIDTH * scale}
           alt={data.label}
           className="landmark-node__image"
           draggable={false}
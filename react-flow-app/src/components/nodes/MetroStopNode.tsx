@@ -2,8 +2,14 @@ import { memo, useState, useMemo } from "react";
 import { createPortal } from "react-dom";
 import { Handle, Position, useStore } from "@xyflow/react";
 import type { MetroStopNodeProps } from "../../types/presentation";
+import ResponsiveImage from "../ResponsiveImage";
 import "./MetroStopNode.css";
 
+// Layout widths of the image containers in MetroStopNode.css
+const INLINE_IMAGE_WIDTH = 200;
+const TOOLTIP_IMAGE_WIDTH = 400;
+const FULL_SLIDE_IMAGE_WIDTH = 1100;
+
 // Zoom level thresholds
 const ZOOM_MIN = 0.3; // Below this: thumbnails hidden
 const ZOOM_FULL = 0.9; // Above this: full slide content (active only)
@@ -118,7 +124,12 @@ function MetroStopNode({ data }: MetroStopNodeProps) {
               ×
             </button>
             {slide.backgroundImage && (
-              <img src={slide.backgroundImage} alt={slide.title} />
+              <ResponsiveImage
+                src={slide.backgroundImage}
+                width={FULL_SLIDE_IMAGE_WIDTH}
+                followZoom={false}
+                alt={slide.title}
+              />
             )}
             <div className="metro-stop__full-content">
               <h3>{slide.title}</h3>
@@ -168,7 +179,11 @@ function MetroStopNode({ data }: MetroStopNodeProps) {
             opacity: thumbnailScale,
           }}
         >
-          <img src={slide.backgroundImage} alt={slide.title} />
+          <ResponsiveImage
+            src={slide.backgroundImage!}
+            width={INLINE_IMAGE_WIDTH * thumbnailScale}
+            alt={slide.title}
+          />
           <div className="metro-stop__inline-title">{slide.title}</div>
         </div>
       )}
@@ -184,7 +199,11 @@ function MetroStopNode({ data }: MetroStopNodeProps) {
         <div className="metro-stop__tooltip">
           {slide.backgroundImage && (
             <div className="metro-stop__tooltip-image">
-              <img src={slide.backgroundImage} alt={slide.title} />
+              <ResponsiveImage
+                src={slide.backgroundImage}
+                width={TOOLTIP_IMAGE_WIDTH}
+                alt={slide.title}
+              />
             </div>
           )}
           <h4 className="metro-stop__tooltip-title">{slide.title}</h4>
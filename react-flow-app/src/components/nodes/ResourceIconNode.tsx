@@ -1,8 +1,12 @@
 import { memo } from "react";
 import type { NodeProps, Node } from "@xyflow/react";
 import type { Resource } from "../../types/presentation";
+import ResponsiveImage from "../ResponsiveImage";
 import "./ResourceIconNode.css";
 
+// Layout width of .resource-icon__image
+const ICON_IMAGE_WIDTH = 16;
+
 interface ResourceIconNodeData {
   [key: string]: unknown;
   resource: Resource;
@@ -35,8 +39,9 @@ function ResourceIconNode({ data }: NodeProps<ResourceIconNodeType>) {
   return (
     <div className="resource-icon" onClick={handleClick} title={resource.title}>
       {resource.image ? (
-        <img
+        <ResponsiveImage
           src={resource.image}
+          width={ICON_IMAGE_WIDTH}
           alt={resource.title}
           className="resource-icon__image"
         />
@@ -3,6 +3,7 @@ import type { ReactElement } from "react";
 import { Handle, Position } from "@xyflow/react";
 import type { ResourceNodeProps, ResourceType } from "../../types/presentation";
 import { NODE_DIMENSIONS } from "../../types/presentation";
+import ResponsiveImage from "../ResponsiveImage";
 import "./ResourceNode.css";
 
 // Icon components for each resource type
@@ -73,8 +74,9 @@ function ResourceNode({ data }: ResourceNodeProps) {
       />
       {hasImage ? (
         <div className="resource-node__thumbnail">
-          <img
-            src={resource.image}
+          <ResponsiveImage
+            src={resource.image!}
+            width={width}
             alt={resource.title}
             className="resource-node__thumbnail-image"
             loading="lazy"
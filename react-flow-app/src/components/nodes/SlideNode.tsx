@@ -2,6 +2,7 @@ import { memo } from "react";
 import { Handle, Position } from "@xyflow/react";
 import type { SlideNodeProps } from "../../types/presentation";
 import { NODE_DIMENSIONS, TRACK_COLORS } from "../../types/presentation";
+import ResponsiveImage from "../ResponsiveImage";
 import "./SlideNode.css";
 
 function SlideNode({ data }: SlideNodeProps) {
@@ -105,8 +106,9 @@ function SlideNode({ data }: SlideNodeProps) {
       {/* Hero image area - 60% height */}
       <div className="slide-node__hero">
         {slide.backgroundImage && (
-          <img
+          <ResponsiveImage
             src={slide.backgroundImage}
+            width={width}
             alt={slide.title}
             loading="lazy"
             className="slide-node__hero-image"
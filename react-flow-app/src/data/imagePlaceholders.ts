@@ -0,0 +1,40 @@
+// Generated by drafts/scripts/build_image_placeholders.py - do not edit.
+// Rerun the script after adding or changing images.
+
+import type { ImagePlaceholder } from "../utils/imagePlaceholders";
+
+export const IMAGE_PLACEHOLDERS: Record<string, ImagePlaceholder> = {
+  "/assets/images/landmarks/doomtown.png": { width: 1024, height: 1024 },
+  "/assets/images/landmarks/empowerment-city.png": { width: 1024, height: 1024 },
+  "/assets/images/landmarks/port-curiosity.png": { width: 1024, height: 1024 },
+  "/assets/images/landmarks/port-necessity.png": { width: 1024, height: 1024 },
+  "/assets/images/landmarks/port-no-fear.png": { width: 1024, height: 1024 },
+  "/assets/images/landmarks/slop-factory.png": { width: 1024, height: 1024 },
+  "/assets/images/slide-01_billboard_v2_20260123_110517.jpg": { width: 1344, height: 768, blurhash: "LHJRa8?FL~M{~VW=g3niDNIqx[%1", color: "#9ea091" },
+  "/assets/images/slide-02_billboard_v4_20260123_110517.jpg": { width: 1344, height: 768, blurhash: "LPKel?xvWa.8?vt7NLW;4TjERPD*", color: "#abbcc5" },
+  "/assets/images/slide-03_billboard_v1_20260123_110517.jpg": { width: 1344, height: 768, blurhash: "LWFiV?t74TawRPoKW;R+D%WCx]s.", color: "#737673" },
+  "/assets/images/slide-04_billboard_v3_20260123_110517.jpg": { width: 1344, height: 768, blurhash: "LJF=s[~VVCIo%hxtV?xYH=$$.7-:", color: "#7d756b" },
+  "/assets/images/slide-05_billboard_v2_20260123_110517.jpg": { width: 1344, height: 768, blurhash: "LSFY_fxu00RjyDW=nis:4:R*?G%M", color: "#71797b" },
+  "/assets/images/slide-06_billboard_v1_20260123_110517.jpg": { width: 1344, height: 768, blurhash: "LJGb;h~pmQ_2AKRjRPWUvLIVXnNG", color: "#7f8983" },
+  "/assets/images/slide-07_billboard_v1_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LhIrBEWW01xGt8t7WAe.NHWBV?WB", color: "#959698" },
+  "/assets/images/slide-08_billboard_v1_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LYL5B*xXafV[?wRlbct6r;RjW;xt", color: "#b1bec1" },
+  "/assets/images/slide-09_billboard_v2_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LWHVVY-q4Tx]_3tQM_xaDiW.xur?", color: "#818a8d" },
+  "/assets/images/slide-10_billboard_v1_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LLH2o=^bMx?a_M%KxZ-pVWo~?a%2", color: "#868d7e" },
+  "/assets/images/slide-11_billboard_v2_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LHG[=,O[rE=s_NEBwdXj0ev}bWE+", color: "#808680" },
+  "/assets/images/slide-12_billboard_v1_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LFJ8Ia-o4Usp^*Ipx]s+Q,xW.8NL", color: "#9a988a" },
+  "/assets/images/slide-13_billboard_v1_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LIDJYFo#8wxCXToJRQR.Din~%MR.", color: "#696b61" },
+  "/assets/images/slide-14_billboard_v3_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LMD07K-o4nIo%LWCkBoI4TIo.8xZ", color: "#5a5850" },
+  "/assets/images/slide-15_billboard_v1_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LOGST1n%8^x]r?oKNGR+RPt7ogRP", color: "#838a8a" },
+  "/assets/images/slide-15b_billboard_v2_20260123_123045.jpg": { width: 1344, height: 768, blurhash: "LbFjA_jFa0WU?wV@M{k9R5M_Rjs,", color: "#7a939b" },
+  "/assets/images/slide-16_billboard_v2_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LFG9Nyu6VswG?bt6WBjY}5e7NxyE", color: "#7e8b89" },
+  "/assets/images/slide-18_billboard_v2_20260123_123045.jpg": { width: 1344, height: 768, blurhash: "LSIO^N%hE3tm?wtTN{t7D+Iqofnh", color: "#95a1a4" },
+  "/assets/images/slide-19_billboard_v2_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LeHB[4of00NGxvt6V@jsrqWBX9s:", color: "#7e7c7d" },
+  "/assets/images/slide-20_billboard_v1_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LJJREaEmD#9G~pM|x@IV8w4.x^Rj", color: "#999283" },
+  "/assets/images/slide-20b_billboard_v2_20260123_123045.jpg": { width: 1344, height: 768, blurhash: "LQFi0}$y0JIna0Sjowj]Mdobtmxa", color: "#746f6f" },
+  "/assets/images/slide-21_billboard_v1_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LHFFpg4TMd%gt,D%xtR*8_X8tlIA", color: "#787670" },
+  "/assets/images/slide-22_billboard_v1_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LGG8_$v|vf59~VI;adnNmPT0Ffiw", color: "#7e7f76" },
+  "/assets/images/slide-23_billboard_v1_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LLG+U6%L4UMe_1WFjFs+HXM}kqxt", color: "#848274" },
+  "/assets/images/slide-24_billboard_v3_20260123_124346.jpg": { width: 1344, height: 768, blurhash: "LPE{kN-O4TI_%MWGNGt18_JCx]xA", color: "#6c6f6f" },
+  "/assets/images/slide-25_billboard_v2_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LfEDn}RknObX*0V@nNfhM|aKoHR+", color: "#708897" },
+  "/assets/images/slide-26_billboard_v1_20260123_114739.jpg": { width: 1344, height: 768, blurhash: "LPH.1U8{02JW?]IAwHEPt8oct3EL", color: "#8b8569" },
+};
@@ -0,0 +1,25 @@
+import { useEffect } from "react";
+import {
+  createPreloader,
+  getPreloadPlan,
+  preloadImage,
+} from "../utils/assetPreloader";
+
+/** Shared across mounts, so remounting never downloads an image twice */
+const preloader = createPreloader(preloadImage);
+
+/**
+ * Custom hook that preloads the images the presenter will need next.
+ *
+ * Re-plans whenever the active slide or overview mode changes: the current
+ * slide and the next few along its track are queued in order, and anything
+ * still waiting from the previous plan is dropped.
+ */
+export function useAssetPreloader(
+  currentSlideId: string | null,
+  isOverviewMode: boolean,
+): void {
+  useEffect(() => {
+    preloader.schedule(getPreloadPlan(currentSlideId, isOverviewMode));
+  }, [currentSlideId, isOverviewMode]);
+}
@@ -0,0 +1,139 @@
+/**
+ * Navigation-ordered preloading of slide images.
+ *
+ * drafts/scripts/build_preload_manifest.py records, for every slide, the
+ * images it shows (weighed by the bytes the full-slide view fetches) and the
+ * next few slides along its track, in src/data/preloadManifest.json. When the
+ * active slide changes, the app queues the canvas atlases, the slide's own
+ * images and then those of the slides ahead, so a transition finds its image
+ * already in the HTTP cache.
+ */
+
+import preloadManifest from "../data/preloadManifest.json";
+import {
+  getImageDerivatives,
+  selectImageSources,
+  targetPixelWidth,
+} from "./responsiveImages";
+
+/** One image a slide shows; bytes is null for remote images */
+export interface PreloadAsset {
+  url: string;
+  bytes: number | null;
+  overBudget?: boolean;
+}
+
+/** Preload data for a single slide */
+export interface SlidePreload {
+  next: string[];
+  bytes: number;
+  windowBytes: number;
+  overBudget: boolean;
+  assets: PreloadAsset[];
+}
+
+export interface PreloadManifest {
+  ahead: number;
+  budget: number;
+  viewWidth: number;
+  overview: string[];
+  slides: Record<string, SlidePreload>;
+}
+
+const manifest = preloadManifest as PreloadManifest;
+
+/** Images downloading at once; the rest wait so the nearest slide comes first */
+export const MAX_IN_FLIGHT = 2;
+
+/**
+ * URLs to preload while `slideId` is active, most urgent first: the overview
+ * atlases, the slide's own images, then each slide ahead in track order.
+ * Zoomed out to the overview, only the atlases are needed.
+ */
+export function getPreloadPlan(
+  slideId: string | null,
+  isOverview: boolean = false,
+  source: PreloadManifest = manifest,
+): string[] {
+  const urls = [...source.overview];
+  const entry = slideId ? source.slides[slideId] : undefined;
+  if (slideId && entry && !isOverview) {
+    for (const id of [slideId, ...entry.next]) {
+      for (const asset of source.slides[id]?.assets ?? []) {
+        urls.push(asset.url);
+      }
+    }
+  }
+  return [...new Set(urls)];
+}
+
+/**
+ * A download queue that only keeps the latest plan.
+ * schedule() replaces whatever is still waiting, so images for slides the
+ * presenter has moved past are never started. URLs are loaded once; a
+ * failed one may be retried by a later plan.
+ */
+export function createPreloader(
+  load: (url: string) => Promise<unknown>,
+  maxInFlight: number = MAX_IN_FLIGHT,
+) {
+  let waiting: string[] = [];
+  const started = new Set<string>();
+  let inFlight = 0;
+
+  const pump = () => {
+    while (inFlight < maxInFlight && waiting.length > 0) {
+      const url = waiting.shift()!;
+      started.add(url);
+      inFlight++;
+      load(url)
+        .catch(() => started.delete(url))
+        .finally(() => {
+          inFlight--;
+          pump();
+        });
+    }
+  };
+
+  return {
+    schedule(urls: string[]) {
+      waiting = urls.filter((url) => !started.has(url));
+      pump();
+    },
+  };
+}
+
+/**
+ * Download and decode an image ahead of display.
+ * Images with derivatives go through a detached <picture>, so the browser
+ * picks the same format and width the full-slide view will request.
+ */
+export function preloadImage(
+  url: string,
+  viewWidth: number = manifest.viewWidth,
+): Promise<void> {
+  return new Promise((resolve, reject) => {
+    const img = new Image();
+    img.decoding = "async";
+    img.onload = () => resolve();
+    img.onerror = () => reject(new Error(`Failed to preload ${url}`));
+
+    const sources = selectImageSources(
+      getImageDerivatives(url),
+      targetPixelWidth(viewWidth),
+    );
+    if (sources.length === 0) {
+      img.src = url;
+      return;
+    }
+    const picture = document.createElement("picture");
+    for (const source of sources.slice(0, -1)) {
+      const element = document.createElement("source");
+      element.type = source.type;
+      element.srcset = source.url;
+      picture.appendChild(element);
+    }
+    picture.appendChild(img);
+    img.src = sources[sources.length - 1].url;
+  });
+}
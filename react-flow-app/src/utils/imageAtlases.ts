@@ -0,0 +1,81 @@
+/**
+ * Texture atlas lookups for zoomed-out thumbnails.
+ *
+ * drafts/scripts/build_image_atlases.py downsizes every local slide,
+ * landmark and resource image and packs the thumbnails into a few atlas
+ * files, recording each thumbnail's rectangle in src/data/imageAtlases.json
+ * keyed by the original URL. While an image is shown no wider than its
+ * thumbnail, nodes paint that rectangle of the shared atlas instead of
+ * requesting the image itself.
+ */
+
+import type { CSSProperties } from "react";
+import atlasManifest from "../data/imageAtlases.json";
+
+/** One packed atlas file */
+export interface ImageAtlas {
+  url: string;
+  width: number;
+  height: number;
+  bytes?: number;
+}
+
+/** Where a thumbnail sits in its atlas, in atlas pixels */
+export interface AtlasSprite {
+  atlas: number;
+  x: number;
+  y: number;
+  width: number;
+  height: number;
+}
+
+export interface ImageAtlasManifest {
+  atlases: ImageAtlas[];
+  sprites: Record<string, AtlasSprite>;
+}
+
+const atlases = atlasManifest as ImageAtlasManifest;
+
+/** A sprite together with the atlas it lives in */
+export interface AtlasImage {
+  atlas: ImageAtlas;
+  sprite: AtlasSprite;
+}
+
+/**
+ * Look up the atlas thumbnail for an image URL.
+ * @returns The sprite and its atlas, or undefined if the image is not packed
+ */
+export function getAtlasImage(
+  url: string | undefined,
+  manifest: ImageAtlasManifest = atlases,
+): AtlasImage | undefined {
+  const sprite = url ? manifest.sprites[url] : undefined;
+  const atlas = sprite ? manifest.atlases[sprite.atlas] : undefined;
+  return sprite && atlas ? { atlas, sprite } : undefined;
+}
+
+/** True when the thumbnail is sharp enough for `targetWidth` device pixels */
+export function atlasCovers(
+  image: AtlasImage | undefined,
+  targetWidth: number,
+): boolean {
+  return !!image && targetWidth > 0 && targetWidth <= image.sprite.width;
+}
+
+/**
+ * Inline styles that paint a sprite over the whole element box.
+ * Size and position are percentages, so the sprite follows the element's
+ * layout size; the aspect ratio gives the element the thumbnail's shape.
+ */
+export function spriteStyle({ atlas, sprite }: AtlasImage): CSSProperties {
+  const offset = (position: number, atlasSize: number, size: number) =>
+    atlasSize === size ? 0 : (position / (atlasSize - size)) * 100;
+  return {
+    aspectRatio: `${sprite.width} / ${sprite.height}`,
+    backgroundImage: `url(${atlas.url})`,
+    backgroundRepeat: "no-repeat",
+    backgroundSize: `${(atlas.width / sprite.width) * 100}% ${(atlas.height / sprite.height) * 100}%`,
+    backgroundPosition: `${offset(sprite.x, atlas.width, sprite.width)}% ${offset(sprite.y, atlas.height, sprite.height)}%`,
+  };
+}
@@ -0,0 +1,165 @@
+/**
+ * Instant placeholders for slide, landmark and resource images.
+ *
+ * drafts/scripts/build_image_placeholders.py records each referenced image's
+ * intrinsic size, a blurhash and its average colour in
+ * src/data/imagePlaceholders.ts. Nodes use the size to reserve layout and
+ * paint the decoded blurhash (or the flat colour) until the real file loads.
+ */
+
+import type { CSSProperties } from "react";
+import { IMAGE_PLACEHOLDERS } from "../data/imagePlaceholders";
+
+/** Generated placeholder data for one image */
+export interface ImagePlaceholder {
+  width: number;
+  height: number;
+  blurhash?: string;
+  color?: string;
+}
+
+/** Pixels per side of the decoded preview; the browser scales it up smoothly */
+const PREVIEW_SIZE = 32;
+
+const BASE83 =
+  "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~";
+
+/** Decoded previews, by blurhash */
+const previewCache = new Map<string, string | undefined>();
+
+/**
+ * Look up the placeholder for an image URL.
+ * @returns The generated entry, or undefined for unknown or remote images
+ */
+export function getImagePlaceholder(
+  url: string | undefined,
+): ImagePlaceholder | undefined {
+  return url ? IMAGE_PLACEHOLDERS[url] : undefined;
+}
+
+function decodeBase83(value: string): number {
+  let result = 0;
+  for (const char of value) {
+    result = result * 83 + BASE83.indexOf(char);
+  }
+  return result;
+}
+
+function sRGBToLinear(value: number): number {
+  const v = value / 255;
+  return v <= 0.04045 ? v / 12.92 : Math.pow((v + 0.055) / 1.055, 2.4);
+}
+
+function linearToSRGB(value: number): number {
+  const v = Math.max(0, Math.min(1, value));
+  return v <= 0.0031308
+    ? Math.round(v * 12.92 * 255)
+    : Math.round((1.055 * Math.pow(v, 1 / 2.4) - 0.055) * 255);
+}
+
+/**
+ * Decode a blurhash into RGBA pixels.
+ * @returns width * height * 4 bytes, row-major
+ */
+export function decodeBlurhash(
+  hash: string,
+  width: number,
+  height: number,
+): Uint8ClampedArray {
+  const sizeFlag = decodeBase83(hash[0]);
+  const numX = (sizeFlag % 9) + 1;
+  const numY = Math.floor(sizeFlag / 9) + 1;
+  const maxValue = (decodeBase83(hash[1]) + 1) / 166;
+
+  const colors: [number, number, number][] = [];
+  const dc = decodeBase83(hash.slice(2, 6));
+  colors.push([
+    sRGBToLinear(dc >> 16),
+    sRGBToLinear((dc >> 8) & 255),
+    sRGBToLinear(dc & 255),
+  ]);
+  for (let i = 1; i < numX * numY; i++) {
+    const ac = decodeBase83(hash.slice(4 + i * 2, 6 + i * 2));
+    const component = (q: number) => {
+      const v = (q - 9) / 9;
+      return Math.sign(v) * v * v * maxValue;
+    };
+    colors.push([
+      component(Math.floor(ac / (19 * 19))),
+      component(Math.floor(ac / 19) % 19),
+      component(ac % 19),
+    ]);
+  }
+
+  const pixels = new Uint8ClampedArray(width * height * 4);
+  for (let y = 0; y < height; y++) {
+    for (let x = 0; x < width; x++) {
+      let r = 0;
+      let g = 0;
+      let b = 0;
+      for (let j = 0; j < numY; j++) {
+        const basisY = Math.cos((Math.PI * y * j) / height);
+        for (let i = 0; i < numX; i++) {
+          const basis = Math.cos((Math.PI * x * i) / width) * basisY;
+          const color = colors[i + j * numX];
+          r += color[0] * basis;
+          g += color[1] * basis;
+          b += color[2] * basis;
+        }
+      }
+      const offset = 4 * (x + y * width);
+      pixels[offset] = linearToSRGB(r);
+      pixels[offset + 1] = linearToSRGB(g);
+      pixels[offset + 2] = linearToSRGB(b);
+      pixels[offset + 3] = 255;
+    }
+  }
+  return pixels;
+}
+
+/**
+ * Render a blurhash to a data URL, once per hash.
+ * @returns undefined where canvas is unavailable (e.g. in tests)
+ */
+function blurhashDataUrl(hash: string): string | undefined {
+  if (previewCache.has(hash)) return previewCache.get(hash);
+
+  let url: string | undefined;
+  try {
+    const canvas = document.createElement("canvas");
+    canvas.width = PREVIEW_SIZE;
+    canvas.height = PREVIEW_SIZE;
+    const context = canvas.getContext("2d");
+    if (context) {
+      const image = context.createImageData(PREVIEW_SIZE, PREVIEW_SIZE);
+      image.data.set(decodeBlurhash(hash, PREVIEW_SIZE, PREVIEW_SIZE));
+      context.putImageData(image, 0, 0);
+      url = canvas.toDataURL();
+    }
+  } catch {
+    url = undefined;
+  }
+  previewCache.set(hash, url);
+  return url;
+}
+
+/**
+ * Inline styles that paint an image's placeholder behind it.
+ * The preview is stretched over the element box, so it shows through until
+ * the image has loaded and covers it.
+ */
+export function placeholderStyle(
+  placeholder: ImagePlaceholder | undefined,
+): CSSProperties | undefined {
+  if (!placeholder?.color) return undefined;
+  const preview = placeholder.blurhash
+    ? blurhashDataUrl(placeholder.blurhash)
+    : undefined;
+  return {
+    backgroundColor: placeholder.color,
+    ...(preview && {
+      backgroundImage: `url(${preview})`,
+      backgroundSize: "100% 100%",
+    }),
+  };
+}
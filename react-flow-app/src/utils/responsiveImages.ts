@@ -0,0 +1,108 @@
+/**
+ * Responsive image selection backed by the derivative manifest.
+ *
+ * drafts/scripts/build_image_derivatives.py encodes every image under
+ * public/assets/images into AVIF/WebP files at several widths and records them
+ * in src/data/imageDerivatives.json, keyed by the original URL. Canvas nodes
+ * use these helpers to request the smallest file that covers their on-screen
+ * size at the current zoom level instead of the full-size JPEG.
+ */
+
+import derivativeManifest from "../data/imageDerivatives.json";
+
+/** One encoded width of an image */
+export interface ImageVariant {
+  width: number;
+  url: string;
+  bytes?: number;
+}
+
+/** Derivatives recorded for a single source image */
+export interface ImageDerivatives {
+  width: number;
+  height: number;
+  thumb?: string;
+  formats: Partial<Record<ImageFormat, ImageVariant[]>>;
+}
+
+/** Encoded formats, in order of preference */
+export type ImageFormat = "avif" | "webp";
+export const IMAGE_FORMATS: ImageFormat[] = ["avif", "webp"];
+
+export const IMAGE_MIME_TYPES: Record<ImageFormat, string> = {
+  avif: "image/avif",
+  webp: "image/webp",
+};
+
+const derivatives = (
+  derivativeManifest as { images: Record<string, ImageDerivatives> }
+).images;
+
+/**
+ * Look up the derivatives for an image URL.
+ * @returns The manifest entry, or undefined if the image has not been processed
+ */
+export function getImageDerivatives(
+  url: string | undefined,
+  manifest: Record<string, ImageDerivatives> = derivatives,
+): ImageDerivatives | undefined {
+  return url ? manifest[url] : undefined;
+}
+
+/**
+ * Pick the narrowest variant at least `targetWidth` pixels wide.
+ * Falls back to the widest variant when none is large enough.
+ */
+export function pickVariant(
+  variants: ImageVariant[],
+  targetWidth: number,
+): ImageVariant | undefined {
+  let widest: ImageVariant | undefined;
+  let best: ImageVariant | undefined;
+  for (const variant of variants) {
+    if (!widest || variant.width > widest.width) widest = variant;
+    if (
+      variant.width >= targetWidth &&
+      (!best || variant.width < best.width)
+    ) {
+      best = variant;
+    }
+  }
+  return best ?? widest;
+}
+
+/**
+ * Pixel width to request for an element `cssWidth` wide at `zoom`.
+ * Accounts for the device pixel ratio (capped at 2x).
+ */
+export function targetPixelWidth(cssWidth: number, zoom: number = 1): number {
+  const dpr =
+    typeof window !== "undefined" && window.devicePixelRatio
+      ? Math.min(window.devicePixelRatio, 2)
+      : 1;
+  return Math.ceil(cssWidth * zoom * dpr);
+}
+
+/**
+ * Choose one URL per available format for an image displayed at `targetWidth`
+ * device pixels.
+ * @returns Sources in preference order; empty when the image has no derivatives
+ */
+export function selectImageSources(
+  entry: ImageDerivatives | undefined,
+  targetWidth: number,
+): { type: string; url: string; width: number }[] {
+  if (!entry) return [];
+  const sources = [];
+  for (const format of IMAGE_FORMATS) {
+    const variant = pickVariant(entry.formats[format] ?? [], targetWidth);
+    if (variant) {
+      sources.push({
+        type: IMAGE_MIME_TYPES[format],
+        url: variant.url,
+        width: variant.width,
+      });
+    }
+  }
+  return sources;
+}